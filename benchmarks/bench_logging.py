@@ -0,0 +1,111 @@
+"""
+Benchmark: per-file logging overhead with debug mode off and on.
+
+Compares the previous setup (root logger at DEBUG, synchronous FileHandler
+that drops records in a filter, f-string messages) with the current
+``configure_logging`` (level gating, lazy %-style messages, QueueListener
+writer with rotation). Reports the cost of one "Moving file" log call on
+the calling thread and the per-file time of a real rename run.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 200000 --files 20000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.config import OrganizerConfig  # noqa: E402
+from utils.executor import execute_plan  # noqa: E402
+from utils.file_types import FILE_TYPES  # noqa: E402
+from utils.log_filter import ErrorOrDebugFilter  # noqa: E402
+from utils.logger import configure_logging, flush_logging  # noqa: E402
+from utils.planner import build_plan  # noqa: E402
+
+
+def legacy_logging(debug_mode: bool, log_file: str) -> None:
+    """The synchronous setup used before the queue-based pipeline."""
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(logging.DEBUG)
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+    file_handler.addFilter(ErrorOrDebugFilter(debug_mode))
+    root_logger.addHandler(file_handler)
+    if debug_mode:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+        console_handler.addFilter(ErrorOrDebugFilter(debug_mode))
+        root_logger.addHandler(console_handler)
+
+
+def time_calls(logger: logging.Logger, calls: int, lazy: bool) -> float:
+    """Seconds per log call on the calling thread."""
+    name, folder, new_name = "holiday_photo.jpg", "/data/organized/images", "2024-05-01-holiday_photo.jpg"
+    start = time.perf_counter()
+    if lazy:
+        for _ in range(calls):
+            logger.info("Moving file: %s -> %s as %s", name, folder, new_name)
+    else:
+        for _ in range(calls):
+            logger.info(f"Moving file: {name} -> {folder} as {new_name}")
+    return (time.perf_counter() - start) / calls
+
+
+def time_run(root: str, files: int, logger: logging.Logger) -> float:
+    """Seconds per file for a same-device run (plan + execute)."""
+    source = tempfile.mkdtemp(dir=root)
+    for i in range(files):
+        open(os.path.join(source, f"file_{i}.txt"), 'wb').close()
+    config = OrganizerConfig(source, os.path.join(source, 'organized'), os.path.join(source, 'unorganized'),
+                             FILE_TYPES, logger, workers=1, journal=False)
+    start = time.perf_counter()
+    execute_plan(build_plan(config), config)
+    return (time.perf_counter() - start) / files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--files', type=int, default=20000)
+    args = parser.parse_args()
+
+    logger = logging.getLogger('bench')
+    # Debug mode also logs to stdout; keep the table readable
+    out, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    rows = []
+    with tempfile.TemporaryDirectory() as root:
+        log_file = os.path.join(root, 'logs', 'bench.log')
+        os.makedirs(os.path.dirname(log_file))
+        for debug_mode in (False, True):
+            legacy_logging(debug_mode, log_file)
+            call = time_calls(logger, args.calls, lazy=False)
+            run = time_run(root, args.files, logger)
+            rows.append(f"{'sync FileHandler + filter':<32} {str(debug_mode):>6} "
+                        f"{call * 1e6:9.2f} us {run * 1e6:9.2f} us")
+
+            configure_logging(debug_mode, log_file)
+            call = time_calls(logger, args.calls, lazy=True)
+            flush_logging()
+            run = time_run(root, args.files, logger)
+            start = time.perf_counter()
+            flush_logging()
+            drain = time.perf_counter() - start
+            rows.append(f"{'queue + level gate + lazy args':<32} {str(debug_mode):>6} "
+                        f"{call * 1e6:9.2f} us {run * 1e6:9.2f} us  (writer drained in {drain:.2f}s)")
+
+        configure_logging(False, log_file)
+        rotated = sorted(name for name in os.listdir(os.path.dirname(log_file)) if name != 'bench.log')
+
+    sys.stdout = out
+    print(f"{'setup':<32} {'debug':>6} {'log call':>12} {'per file':>12}")
+    print("\n".join(rows))
+    print(f"rotated log files: {', '.join(rotated) or 'none'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: shutil.move based move_file vs. same-device rename_file.
+
+Creates N small files and moves them into a destination folder on the
+same device with both strategies.
+
+Usage:
+    python benchmarks/bench_move.py --files 100000
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils.file_operations import move_file, rename_file, resolve_collision  # noqa: E402
+
+
+def build_files(root: str, files: int) -> list:
+    paths = []
+    for i in range(files):
+        path = os.path.join(root, f"file_{i}.bin")
+        with open(path, 'wb') as f:
+            f.write(b'x' * 128)
+        paths.append(path)
+    return paths
+
+
+def run(name: str, mover, files: int, parent: str) -> None:
+    logger = logging.getLogger('bench')
+    root = tempfile.mkdtemp(prefix='fo-bench-move-', dir=parent)
+    try:
+        source = os.path.join(root, 'source')
+        destination = os.path.join(root, 'organized', 'misc')
+        os.makedirs(source)
+        paths = build_files(source, files)
+
+        start = time.perf_counter()
+        for path in paths:
+            target = resolve_collision(os.path.join(destination, os.path.basename(path)))
+            mover(path, target, logger)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} files={files:<8} {elapsed:8.2f}s  {files / elapsed:10.0f} files/s")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--dir', default=None, help="Parent dir for the synthetic tree")
+    args = parser.parse_args()
+
+    run('shutil.move', move_file, args.files, args.dir)
+    run('rename', rename_file, args.files, args.dir)
+
+
+if __name__ == '__main__':
+    main()
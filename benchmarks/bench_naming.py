@@ -0,0 +1,111 @@
+"""
+Benchmark: date-prefixed file names, previous implementation vs. naming templates.
+
+Generates N file names (seeded, see ``tree_generator``) whose dates fall on
+a limited number of days and builds the new names with:
+
+    legacy   the previous ``create_dated_filename`` (re.sub with pattern
+             strings, strptime and strftime for every file)
+    single   ``FilenameProcessor.create_dated_filename`` per name
+    batch    ``FilenameProcessor.create_dated_filenames`` for all names
+
+The default template must produce exactly the legacy names; this is
+checked before timing. A custom template is timed as well.
+
+Usage:
+    python benchmarks/bench_naming.py --names 100000 --days 30
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from tree_generator import make_name  # noqa: E402
+from utils.filename_utils import FilenameProcessor  # noqa: E402
+
+
+def legacy_sanitize(filename: str) -> str:
+    clean_name = re.sub(r'[<>:"/\\|?*]', '', filename)
+    clean_name = clean_name.replace(' ', '-').replace('_', '-')
+    clean_name = re.sub(r'-+', '-', clean_name)
+    return clean_name.strip('-')
+
+
+def legacy_parse(filename: str):
+    if not filename[:4].isdigit():
+        return False, None
+    try:
+        date_obj = datetime.strptime(filename[:10], "%Y-%m-%d")
+        return filename[10] == "-", date_obj
+    except (ValueError, IndexError):
+        return False, None
+
+
+def legacy_create(original_filename: str, file_date: datetime) -> str:
+    date_prefix = file_date.strftime("%Y-%m-%d-")
+    clean_name = legacy_sanitize(original_filename)
+    has_date, _ = legacy_parse(clean_name)
+    if has_date:
+        clean_name = clean_name[11:]
+    return f"{date_prefix}{clean_name}"
+
+
+def build_items(names: int, days: int, seed: int) -> list:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    extensions = ['.jpg', '.pdf', '.docx', '.zip', '.mp4', '.png', '.txt']
+    items = []
+    for i in range(names):
+        date = start + timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))
+        name = make_name(rng, i) + rng.choice(extensions)
+        if rng.random() < 0.1:
+            name = f"{date:%Y-%m-%d}_{name}"  # Already dated, prefix is replaced
+        items.append((name, date))
+    return items
+
+
+def best_of(repeat: int, func) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=30, help="Distinct file dates")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    items = build_items(args.names, args.days, args.seed)
+    expected = [legacy_create(name, date) for name, date in items]
+    assert FilenameProcessor.create_dated_filenames(items) == expected, "default template differs from legacy"
+
+    template = "{date:%Y}/{date:%m}/{stem}{ext}"
+    timings = [
+        ('legacy', lambda: [legacy_create(n, d) for n, d in items]),
+        ('single', lambda: [FilenameProcessor.create_dated_filename(n, d) for n, d in items]),
+        ('batch', lambda: FilenameProcessor.create_dated_filenames(items)),
+        ('batch, ' + template, lambda: FilenameProcessor.create_dated_filenames(items, template)),
+    ]
+
+    print(f"{args.names} names, {args.days} distinct days, best of {args.repeat}")
+    legacy = None
+    for label, func in timings:
+        seconds = best_of(args.repeat, func)
+        legacy = legacy or seconds
+        print(f"  {label:<40} {seconds:8.3f}s  {seconds / args.names * 1e6:6.2f} us/name"
+              f"  {legacy / seconds:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
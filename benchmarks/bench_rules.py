@@ -0,0 +1,82 @@
+"""
+Benchmark: importing extension mappings one row at a time vs. bulk import.
+
+Generates N mappings, imports them into an empty database with
+``add_file_type`` per row (what the file type dialog does) and with
+``core.rules_io.import_rules`` (executemany in one transaction), then
+re-imports a modified set to measure a replace with diff.
+
+Usage:
+    python benchmarks/bench_rules.py --mappings 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import utils  # noqa: E402,F401  (import order: utils before core.database)
+from core.database import DatabaseManager  # noqa: E402
+from core.rules_io import export_rules, import_rules  # noqa: E402
+
+
+def build_rules(mappings: int, folders: int = 50) -> dict:
+    file_types = {}
+    for i in range(mappings):
+        file_types.setdefault(f"Folder{i % folders:03d}", []).append(f".ext{i}")
+    return {'file_types': file_types}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mappings', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        rules = build_rules(args.mappings)
+        rules_path = os.path.join(root, 'rules.json')
+        with open(rules_path, 'w', encoding='utf-8') as f:
+            json.dump(rules, f)
+
+        db = DatabaseManager(os.path.join(root, 'rows.db'))
+        db.initialize_database()
+        start = time.perf_counter()
+        for folder_name, extensions in rules['file_types'].items():
+            for ext in extensions:
+                db.add_file_type(folder_name, ext)
+        per_row = time.perf_counter() - start
+
+        bulk_db = os.path.join(root, 'bulk.db')
+        start = time.perf_counter()
+        diff = import_rules(rules_path, db_path=bulk_db)
+        bulk = time.perf_counter() - start
+        assert len(diff.added) == args.mappings
+
+        # Replace: drop every tenth mapping and add as many new ones
+        changed = build_rules(args.mappings)
+        for i, extensions in enumerate(changed['file_types'].values()):
+            del extensions[::10]
+            extensions.extend(f".new{i}_{j}" for j in range(len(extensions) // 9))
+        with open(rules_path, 'w', encoding='utf-8') as f:
+            json.dump(changed, f)
+        start = time.perf_counter()
+        diff = import_rules(rules_path, db_path=bulk_db)
+        replace = time.perf_counter() - start
+
+        start = time.perf_counter()
+        export_rules(os.path.join(root, 'export.toml'), db_path=bulk_db)
+        export = time.perf_counter() - start
+
+    print(f"{args.mappings} mappings")
+    print(f"  per-row add_file_type : {per_row * 1000:9.1f} ms")
+    print(f"  bulk import           : {bulk * 1000:9.1f} ms  ({per_row / bulk:.0f}x)")
+    print(f"  replace with diff     : {replace * 1000:9.1f} ms  "
+          f"(+{len(diff.added)} / -{len(diff.removed)})")
+    print(f"  export (TOML)         : {export * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: legacy listdir/isfile/isdir/getmtime scan vs. scandir-based scan.
+
+Builds a synthetic flat source folder and runs both scan variants over it,
+reporting wall time and the number of filesystem calls per variant.
+
+Usage:
+    python benchmarks/bench_scan.py --files 200000 --dirs 2000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils.date_utils import get_file_date  # noqa: E402
+from utils.scanner import ScanEntry, scan_directory  # noqa: E402
+
+EXTENSIONS = ['.jpg', '.pdf', '.mp3', '.zip', '.mkv', '.txt', '.iso', '.unknown']
+
+
+def build_tree(root: str, files: int, dirs: int) -> None:
+    """Creates ``files`` empty files and ``dirs`` folders in ``root``."""
+    for i in range(files):
+        with open(os.path.join(root, f"file_{i}{EXTENSIONS[i % len(EXTENSIONS)]}"), 'wb'):
+            pass
+    for i in range(dirs):
+        os.mkdir(os.path.join(root, f"folder_{i}"))
+
+
+@contextmanager
+def count_calls(counter: Counter):
+    """Counts calls of the os functions that end up in a syscall."""
+    originals = {
+        'stat': os.stat,
+        'listdir': os.listdir,
+        'scandir': os.scandir,
+    }
+
+    def wrap(name, func):
+        def wrapper(*args, **kwargs):
+            counter[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    from_dir_entry = ScanEntry.from_dir_entry.__func__
+
+    def counted_from_dir_entry(cls, entry):
+        # DirEntry.stat() is one stat syscall on POSIX (free on Windows)
+        counter['stat'] += 1
+        return from_dir_entry(cls, entry)
+
+    for name, func in originals.items():
+        setattr(os, name, wrap(name, func))
+    ScanEntry.from_dir_entry = classmethod(counted_from_dir_entry)
+    try:
+        yield counter
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+        ScanEntry.from_dir_entry = classmethod(from_dir_entry)
+
+
+def legacy_scan(folder: str) -> int:
+    """Scan as done by process_directory before the scanner layer."""
+    seen = 0
+    for item_name in os.listdir(folder):
+        item_path = os.path.join(folder, item_name)
+        if os.path.isfile(item_path):
+            get_file_date(item_path)
+            seen += 1
+        elif os.path.isdir(item_path):
+            get_file_date(item_path)
+            seen += 1
+    return seen
+
+
+def scandir_scan(folder: str) -> int:
+    """Scan through the scandir-based scanner."""
+    seen = 0
+    for entry in scan_directory(folder):
+        if entry.is_file or entry.is_dir:
+            get_file_date(entry)
+            seen += 1
+    return seen
+
+
+def run(name: str, func, folder: str, repeat: int) -> None:
+    counter = Counter()
+    with count_calls(counter):
+        func(folder)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        seen = func(folder)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    calls = sum(counter.values())
+    print(f"{name:<10} entries={seen:<8} best={best * 1000:9.1f} ms  "
+          f"fs calls={calls:<8} ({calls / max(seen, 1):.2f}/entry)  {dict(counter)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--dirs', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dir', default=None, help="Parent dir for the synthetic tree")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='fo-bench-scan-', dir=args.dir)
+    try:
+        build_tree(root, args.files, args.dirs)
+        run('legacy', legacy_scan, root, args.repeat)
+        run('scandir', scandir_scan, root, args.repeat)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
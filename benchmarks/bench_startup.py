@@ -0,0 +1,72 @@
+"""
+Benchmark: cold start of the headless CLI.
+
+Runs ``python -X importtime -m cli --help`` in fresh interpreters, reports
+the wall time and the slowest imports, and fails if Qt was imported. With
+``--gui`` the GUI modules are measured as well (needs PySide6).
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def run_importtime(args: list) -> tuple:
+    """Returns (wall seconds, {module: cumulative microseconds})."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=SRC,
+                          capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return wall, modules
+
+
+def report(label: str, args: list, runs: int, top: int) -> dict:
+    walls, modules = [], {}
+    for _ in range(runs):
+        wall, modules = run_importtime(args)
+        walls.append(wall)
+
+    qt = sorted(name for name in modules if name.startswith('PySide6'))
+    print(f"{label}: median {statistics.median(walls) * 1000:.1f} ms, "
+          f"min {min(walls) * 1000:.1f} ms over {runs} runs, {len(modules)} modules imported")
+    for name, us in sorted(modules.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    if qt:
+        print(f"  Qt modules imported: {', '.join(qt[:5])}")
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument('--gui', action='store_true', help="Also measure importing the GUI")
+    args = parser.parse_args()
+
+    report("interpreter only", ['-c', 'pass'], args.runs, 0)
+    modules = report("python -m cli --help", ['-m', 'cli', '--help'], args.runs, args.top)
+    report("import engine (cli + main)", ['-c', 'import cli, main'], args.runs, args.top)
+    if args.gui:
+        report("import GUI", ['-c', 'import gui.main_window'], args.runs, args.top)
+
+    if any(name.startswith('PySide6') for name in modules):
+        sys.exit("The CLI imported PySide6")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""
+Benchmark suite with regression check.
+
+Generates seeded synthetic source folders (see ``tree_generator``) on tmpfs
+and on disk and times, per scale:
+
+    scan         scan_directory over the source folder
+    filename     FilenameProcessor.parse_date_prefix / create_dated_filename
+    destination  get_destination_folder for every file name
+    database     DatabaseManager: populate, 200 file type reads, scan index write/read
+    end_to_end   organize_files_by_type on a fresh tree
+
+Each timing is the best of ``--repeat`` runs (end_to_end runs once per
+fresh tree). Results are written as JSON. With ``--baseline`` every timing
+is compared with the saved baseline and the script exits with status 1 if
+one is slower by more than ``--threshold``.
+
+Usage:
+    python benchmarks/run_suite.py --scales 1000,100000 --output results.json
+    python benchmarks/run_suite.py --save-baseline baseline.json
+    python benchmarks/run_suite.py --baseline baseline.json --threshold 0.2
+    python benchmarks/run_suite.py --scales 1000000 --storage tmpfs
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from tree_generator import generate_tree  # noqa: E402
+from core.config import OrganizerConfig  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+from utils.file_types import FILE_TYPES  # noqa: E402
+from utils.file_utils import organize_files_by_type  # noqa: E402
+from utils.filename_utils import FilenameProcessor  # noqa: E402
+from utils.path_utils import get_destination_folder  # noqa: E402
+from utils.scanner import scan_directory  # noqa: E402
+
+STORAGE_ROOTS = {'tmpfs': '/dev/shm', 'disk': tempfile.gettempdir()}
+
+
+def best_of(repeat: int, func: Callable[[], None]) -> float:
+    # Like timeit: no garbage collection pauses inside the timed section
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(times)
+
+
+def bench_filenames(names: List[str]) -> None:
+    date = datetime(2024, 1, 1)
+    for name in names:
+        has_date, _ = FilenameProcessor.parse_date_prefix(name)
+        if not has_date:
+            FilenameProcessor.create_dated_filename(name, date)
+
+
+def bench_destinations(names: List[str]) -> None:
+    for name in names:
+        get_destination_folder(os.path.splitext(name)[1], '/organized', FILE_TYPES)
+
+
+def bench_database(root: str, keys: List[tuple]) -> None:
+    db_path = os.path.join(root, 'bench.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    db = DatabaseManager(db_path)
+    db.initialize_database()
+    db.populate_default_file_types(FILE_TYPES)
+    for _ in range(200):
+        db.get_file_types()
+    db.replace_scan_index('bench', keys)
+    db.get_scan_index('bench')
+    DatabaseManager.close_all_connections()
+
+
+def bench_end_to_end(work: str, files: int, seed: int) -> float:
+    source = os.path.join(work, 'e2e')
+    shutil.rmtree(source, ignore_errors=True)
+    generate_tree(os.path.join(source, 'in'), files, seed)
+    config = OrganizerConfig(
+        source_folder=os.path.join(source, 'in'),
+        organized_folder=os.path.join(source, 'organized'),
+        unorganized_folder=os.path.join(source, 'unorganized'),
+        file_types=FILE_TYPES,
+        logger=logging.getLogger('bench'),
+        report_output=os.path.join(source, 'report.json'),
+        db_path=os.path.join(work, 'e2e.db'),  # Journal and scan index stay out of the user's database
+    )
+    start = time.perf_counter()
+    organize_files_by_type(config)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(source, ignore_errors=True)
+    return elapsed
+
+
+def run_scale(storage: str, files: int, args: argparse.Namespace) -> Dict[str, float]:
+    work = tempfile.mkdtemp(prefix='fo-bench-', dir=STORAGE_ROOTS[storage])
+    try:
+        source = os.path.join(work, 'source')
+        generated = generate_tree(source, files, args.seed)
+        print(f"[{storage} {files}] generated {generated['files']} files, "
+              f"{generated['folders']} folders in {generated['seconds']:.1f}s", flush=True)
+
+        entries = list(scan_directory(source))
+        names = [entry.name for entry in entries if entry.is_file]
+        keys = [(entry.dev, entry.ino, entry.size, entry.mtime_ns) for entry in entries]
+
+        results = {
+            'scan': best_of(args.repeat, lambda: list(scan_directory(source))),
+            'filename': best_of(args.repeat, lambda: bench_filenames(names)),
+            'destination': best_of(args.repeat, lambda: bench_destinations(names)),
+            'database': best_of(args.repeat, lambda: bench_database(work, keys)),
+        }
+        shutil.rmtree(source)
+        results['end_to_end'] = bench_end_to_end(work, files, args.seed)
+        return results
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float,
+            min_time: float) -> List[str]:
+    """Returns a line per regressed timing."""
+    regressions = []
+    print(f"\n{'benchmark':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key, current in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"{key:<32} {'-':>10} {current:9.4f}s {'new':>8}")
+            continue
+        change = (current - previous) / previous if previous > 0 else 0.0
+        flag = ''
+        # Timings below min_time are dominated by noise
+        if change > threshold and max(current, previous) >= min_time:
+            flag = '  REGRESSION'
+            regressions.append(f"{key}: {previous:.4f}s -> {current:.4f}s ({change:+.0%})")
+        print(f"{key:<32} {previous:9.4f}s {current:9.4f}s {change:+8.0%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1000,100000',
+                        help="Comma-separated file counts (e.g. 1000,100000,1000000)")
+    parser.add_argument('--storage', default='tmpfs,disk', help="tmpfs, disk or both")
+    parser.add_argument('--disk-root', help="Folder on disk for the disk runs (default: system temp)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help="Compare with this results file")
+    parser.add_argument('--save-baseline', metavar='FILE', help="Also store the results as baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    parser.add_argument('--min-time', type=float, default=0.005,
+                        help="Ignore regressions of timings below this many seconds")
+    args = parser.parse_args()
+    # Keep the output to the result table (e.g. no rule conflict warnings)
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.disk_root:
+        STORAGE_ROOTS['disk'] = args.disk_root
+    storages = [s.strip() for s in args.storage.split(',') if s.strip()]
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+
+    results: Dict[str, float] = {}
+    for storage in storages:
+        if storage not in STORAGE_ROOTS:
+            parser.error(f"unknown storage '{storage}'")
+        if not os.path.isdir(STORAGE_ROOTS[storage]):
+            print(f"Skipping {storage}: {STORAGE_ROOTS[storage]} does not exist")
+            continue
+        for files in scales:
+            for name, seconds in run_scale(storage, files, args).items():
+                results[f"{storage}/{files}/{name}"] = round(seconds, 6)
+
+    document = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.min_time)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == '__main__':
+    main()
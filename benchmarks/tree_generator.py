@@ -0,0 +1,134 @@
+"""
+Seeded generator for synthetic source folders.
+
+Creates N items that look like a real downloads folder: extensions drawn
+from ``FILE_TYPES`` (weighted towards common categories, plus unknown
+extensions), mixed naming styles, date-prefixed and undated names,
+log-normally distributed sizes (sparse files, so no disk space is used),
+modification times spread over five years, and nested folders. The same
+seed always produces the same tree.
+
+Usage:
+    python benchmarks/tree_generator.py /dev/shm/tree --files 100000 --seed 42
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils.file_types import FILE_TYPES  # noqa: E402
+
+# Relative weight of a category (others: 1.0); roughly a typical downloads folder
+CATEGORY_WEIGHTS = {
+    'images': 8.0, 'documents': 6.0, 'archives': 3.0, 'videos': 2.0, 'music': 2.0,
+    'executables': 1.5, 'spreadsheets': 1.5, 'code': 1.0,
+}
+UNKNOWN_EXTENSIONS = ['.part', '.crdownload', '.dat', '.bak1', '']
+UNKNOWN_SHARE = 0.08
+DATED_SHARE = 0.3
+FOLDER_SHARE = 0.02
+
+WORDS = ['invoice', 'holiday', 'report', 'scan', 'photo', 'meeting', 'notes', 'draft', 'final',
+         'budget', 'project', 'screenshot', 'export', 'backup', 'setup', 'contract', 'summary',
+         'Rechnung', 'Übersicht', 'résumé', 'data', 'video', 'track', 'album', 'release']
+
+
+def extension_mix(file_types: Dict[str, List[str]]) -> Tuple[List[str], List[float]]:
+    """Returns (extensions, weights) for ``random.choices``."""
+    extensions, weights = [], []
+    for category, exts in file_types.items():
+        weight = CATEGORY_WEIGHTS.get(category, 1.0) / len(exts)
+        for ext in exts:
+            extensions.append(ext)
+            weights.append(weight)
+    return extensions, weights
+
+
+def make_name(rng: random.Random, index: int) -> str:
+    """Returns a file name stem in one of several common styles."""
+    style = rng.random()
+    if style < 0.25:
+        return f"IMG_{rng.randint(1000, 9999)}_{index}"
+    words = rng.sample(WORDS, rng.randint(1, 3))
+    if style < 0.5:
+        stem = ' '.join(words)
+    elif style < 0.75:
+        stem = '_'.join(words)
+    else:
+        stem = '-'.join(w.lower() for w in words)
+    return f"{stem} ({index})" if rng.random() < 0.3 else f"{stem}{index}"
+
+
+def generate_tree(root: str, files: int, seed: int = 42, file_types: Dict[str, List[str]] = None) -> Dict:
+    """
+    Creates the synthetic tree in ``root`` (which must be empty or missing).
+
+    Returns
+    -------
+    Dict
+        Summary (files, folders, unknown, dated, logical bytes, seconds)
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    extensions, weights = extension_mix(file_types or FILE_TYPES)
+    now = datetime(2024, 6, 1)
+    os.makedirs(root, exist_ok=True)
+
+    summary = {'files': 0, 'folders': 0, 'unknown': 0, 'dated': 0, 'bytes': 0}
+    ext_choices = rng.choices(extensions, weights, k=files)
+    for i in range(files):
+        mtime = now - timedelta(seconds=rng.randint(0, 5 * 365 * 86400))
+        stem = make_name(rng, i)
+        if rng.random() < DATED_SHARE:
+            stem = f"{mtime:%Y-%m-%d}-{stem}"
+            summary['dated'] += 1
+
+        if rng.random() < FOLDER_SHARE:
+            # Nested folder with a few files, up to three levels deep
+            path = os.path.join(root, stem)
+            for depth in range(rng.randint(1, 3)):
+                path = os.path.join(path, f"sub{depth}")
+            os.makedirs(path)
+            for j in range(rng.randint(1, 5)):
+                open(os.path.join(path, f"part{j}.txt"), 'wb').close()
+            summary['folders'] += 1
+            continue
+
+        if rng.random() < UNKNOWN_SHARE:
+            ext = rng.choice(UNKNOWN_EXTENSIONS)
+            summary['unknown'] += 1
+        else:
+            ext = ext_choices[i]
+            if rng.random() < 0.1:
+                ext = ext.upper()
+
+        # Log-normal sizes: median ~100 KB, long tail into the GB range
+        size = min(int(rng.lognormvariate(11.5, 2.5)), 8 * 1024 ** 3)
+        path = os.path.join(root, stem + ext)
+        with open(path, 'wb') as f:
+            f.truncate(size)  # Sparse: correct st_size without using space
+        timestamp = mtime.timestamp()
+        os.utime(path, (timestamp, timestamp))
+        summary['files'] += 1
+        summary['bytes'] += size
+
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('root')
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    print(generate_tree(args.root, args.files, args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Headless command line interface of the File Organizer.
+
+Runs the engine without the GUI (Qt is never imported) and prints a JSON
+document to stdout. Settings are read from the database like in the GUI;
+command line flags override them.
+
+Usage (from the ``src`` folder):
+    python -m cli run [--source DIR] [--dry-run] [--workers N] [--profile] ...
+    python -m cli watch [--debounce SECONDS]
+    python -m cli dedupe [--action skip|hardlink|move]
+    python -m cli undo [RUN_ID] [--list]
+    python -m cli export-rules rules.toml
+    python -m cli import-rules rules.toml [--merge] [--dry-run]
+
+Exit codes:
+    0  success
+    1  the run finished but some items could not be moved
+    2  invalid command line
+    3  invalid configuration (missing folders, unreadable rules file)
+    4  the run failed
+"""
+import argparse
+import dataclasses
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+EXIT_OK = 0
+EXIT_MOVE_ERRORS = 1
+EXIT_USAGE = 2
+EXIT_CONFIG = 3
+EXIT_FAILED = 4
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Creates the argument parser with all subcommands."""
+    parser = argparse.ArgumentParser(prog='python -m cli', description="Organize files without the GUI.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    organize = argparse.ArgumentParser(add_help=False)
+    organize.add_argument('--source', help="Source folder (default: from the database)")
+    organize.add_argument('--organized', help="Folder for sorted files (default: from the database)")
+    organize.add_argument('--unorganized', help="Folder for moved folders (default: from the database)")
+    organize.add_argument('--use-creation-date', action=argparse.BooleanOptionalAction, default=None,
+                          help="Use the creation instead of the modification date")
+    organize.add_argument('--force-date', action=argparse.BooleanOptionalAction, default=None,
+                          help="Replace existing date prefixes")
+    organize.add_argument('--date-folders', action=argparse.BooleanOptionalAction, default=None,
+                          help="Add a date prefix to moved folders")
+    organize.add_argument('--naming-template', metavar='TEMPLATE',
+                          help="Name of dated items, e.g. '{date:%%Y}/{date:%%m}/{name}' "
+                               "(default: from the database)")
+    organize.add_argument('--workers', type=int, help="Concurrent moves (default: 4)")
+    organize.add_argument('--verify', action='store_true', help="Checksum cross-device copies")
+    organize.add_argument('--incremental', action='store_true',
+                          help="Skip unchanged entries left over by the last run")
+    organize.add_argument('--stability', type=float, metavar='SECONDS',
+                          help="Hold back items that changed within this interval")
+    organize.add_argument('--no-journal', action='store_true',
+                          help="Do not record moves in the journal (no crash recovery)")
+    organize.add_argument('--recovery', choices=('forward', 'back'),
+                          help="Finish (forward, default) or undo (back) runs that were interrupted")
+    organize.add_argument('--no-resume', action='store_true',
+                          help="Scan again instead of continuing an unfinished run")
+    organize.add_argument('--debug', action='store_true', help="Log debug output to stdout and the log file")
+
+    run = commands.add_parser('run', parents=[organize], help="Organize the source folder once")
+    run.add_argument('--dry-run', action='store_true', help="Only output the move plan")
+    run.add_argument('--plan-output', metavar='FILE', help="Write the dry-run plan to FILE")
+    run.add_argument('--report', metavar='FILE', help="Write the run report to FILE (default: logs/reports/)")
+    run.add_argument('--profile', action='store_true',
+                     help="Profile the run (cProfile, memory, filesystem calls); output goes to logs/")
+
+    watch = commands.add_parser('watch', parents=[organize], help="Organize new items as they arrive")
+    watch.add_argument('--debounce', type=float, default=0.3, metavar='SECONDS')
+    watch.add_argument('--max-delay', type=float, default=2.0, metavar='SECONDS')
+
+    dedupe = commands.add_parser('dedupe', help="Find duplicate files in the organized folder")
+    dedupe.add_argument('--organized', help="Folder to search (default: from the database)")
+    dedupe.add_argument('--unorganized', help="Target of --action move (default: from the database)")
+    dedupe.add_argument('--action', choices=('skip', 'hardlink', 'move'), default='skip',
+                        help="skip: only report; hardlink: replace duplicates by hardlinks; "
+                             "move: move duplicates to <unorganized>/duplicates")
+    dedupe.add_argument('--min-size', type=int, default=1, metavar='BYTES', help="Ignore smaller files")
+    dedupe.add_argument('--workers', type=int, help="Concurrent hashing threads (default: 4)")
+    dedupe.add_argument('--no-cache', action='store_true', help="Do not use or update the hash cache")
+    dedupe.add_argument('--debug', action='store_true', help="Log debug output to stdout and the log file")
+
+    undo = commands.add_parser('undo', help="Move the items of a previous run back")
+    undo.add_argument('run_id', nargs='?', help="Run to undo (default: the most recent one)")
+    undo.add_argument('--list', action='store_true', help="Only list the journaled runs")
+    undo.add_argument('--workers', type=int, help="Concurrent moves (default: 4)")
+    undo.add_argument('--debug', action='store_true', help="Log debug output to stdout and the log file")
+
+    export = commands.add_parser('export-rules', help="Export file types and settings (JSON/TOML)")
+    export.add_argument('path')
+    export.add_argument('--no-config', action='store_true', help="Only export the file types")
+
+    import_ = commands.add_parser('import-rules', help="Import file types and settings (JSON/TOML)")
+    import_.add_argument('path')
+    import_.add_argument('--merge', action='store_true', help="Add to the existing rules instead of replacing them")
+    import_.add_argument('--dry-run', action='store_true', help="Only report the changes")
+
+    return parser
+
+
+def config_from_args(args: argparse.Namespace):
+    """Builds the OrganizerConfig from the database settings and the flags."""
+    from main import create_config
+
+    config = create_config()
+    overrides = {
+        'source_folder': args.source,
+        'organized_folder': args.organized,
+        'unorganized_folder': args.unorganized,
+        'use_creation_date': args.use_creation_date,
+        'force_date': args.force_date,
+        'date_folders': args.date_folders,
+        'naming_template': args.naming_template,
+        'workers': args.workers,
+        'stability_interval': args.stability,
+        'dry_run': getattr(args, 'dry_run', None),
+        'plan_output': getattr(args, 'plan_output', None),
+        'report_output': getattr(args, 'report', None),
+        'journal_recovery': args.recovery,
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            setattr(config, name, value)
+    config.verify_copies = config.verify_copies or args.verify
+    config.incremental = config.incremental or args.incremental
+    config.profile = getattr(args, 'profile', False)
+    config.journal = config.journal and not args.no_journal
+    config.resume = config.resume and not args.no_resume
+    return config
+
+
+def _config_error(config) -> Optional[str]:
+    """Returns why ``config`` cannot be used for a run (None if it can)."""
+    from utils.filename_utils import NamingTemplate, NamingTemplateError
+
+    missing = [name for name in ('source_folder', 'organized_folder', 'unorganized_folder')
+               if not getattr(config, name)]
+    if missing:
+        return f"Not configured: {', '.join(missing)}"
+    try:
+        NamingTemplate.compile(config.naming_template)
+    except NamingTemplateError as e:
+        return str(e)
+    return None
+
+
+def _emit(result: Dict) -> None:
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+def _run(args: argparse.Namespace) -> int:
+    from utils.file_utils import SourceFolderNotFoundError, organize_files_by_type
+
+    config = config_from_args(args)
+    error = _config_error(config)
+    if error:
+        _emit({'status': 'error', 'error': error})
+        return EXIT_CONFIG
+
+    try:
+        report = organize_files_by_type(config)
+    except SourceFolderNotFoundError as e:
+        _emit({'status': 'error', 'error': str(e)})
+        return EXIT_CONFIG
+
+    if report is None:
+        # Dry run: without --plan-output the plan itself was printed
+        if config.plan_output:
+            _emit({'status': 'ok', 'dry_run': True, 'plan': config.plan_output})
+        return EXIT_OK
+
+    result = report.to_dict()
+    result['status'] = 'errors' if report.errors else 'cancelled' if report.cancelled else 'ok'
+    _emit(result)
+    return EXIT_MOVE_ERRORS if report.errors else EXIT_OK
+
+
+def _watch(args: argparse.Namespace) -> int:
+    from utils.file_utils import SourceFolderNotFoundError
+    from utils.watcher import WatchError, watch_directory
+
+    config = config_from_args(args)
+    error = _config_error(config)
+    if error:
+        _emit({'status': 'error', 'error': error})
+        return EXIT_CONFIG
+
+    try:
+        watch_directory(config, debounce=args.debounce, max_delay=args.max_delay)
+    except (SourceFolderNotFoundError, WatchError) as e:
+        _emit({'status': 'error', 'error': str(e)})
+        return EXIT_CONFIG
+    except KeyboardInterrupt:
+        pass
+    _emit({'status': 'stopped'})
+    return EXIT_OK
+
+
+def _dedupe(args: argparse.Namespace) -> int:
+    from main import create_config
+    from utils.dedupe import DedupeAction, dedupe_tree
+
+    config = create_config()
+    config.organized_folder = args.organized or config.organized_folder
+    config.unorganized_folder = args.unorganized or config.unorganized_folder
+    config.workers = args.workers or config.workers
+    if not config.organized_folder or not os.path.isdir(config.organized_folder):
+        _emit({'status': 'error', 'error': f"Organized folder not found: {config.organized_folder}"})
+        return EXIT_CONFIG
+    if args.action == DedupeAction.MOVE and not config.unorganized_folder:
+        _emit({'status': 'error', 'error': "Not configured: unorganized_folder"})
+        return EXIT_CONFIG
+
+    report = dedupe_tree(config, args.action, args.min_size, use_cache=not args.no_cache)
+    result = report.to_dict()
+    result['status'] = 'errors' if report.errors else 'cancelled' if report.cancelled else 'ok'
+    _emit(result)
+    return EXIT_MOVE_ERRORS if report.errors else EXIT_OK
+
+
+def _undo(args: argparse.Namespace) -> int:
+    from main import create_config
+    from utils.undo import UndoError, list_runs, undo_run
+
+    config = create_config()
+    config.workers = args.workers or config.workers
+    if args.list:
+        _emit({'status': 'ok', 'runs': list_runs(config)})
+        return EXIT_OK
+
+    try:
+        report = undo_run(config, args.run_id)
+    except UndoError as e:
+        _emit({'status': 'error', 'error': str(e)})
+        return EXIT_CONFIG
+    result = report.to_dict()
+    result['status'] = 'errors' if report.errors else 'cancelled' if report.cancelled else 'ok'
+    _emit(result)
+    return EXIT_MOVE_ERRORS if report.errors else EXIT_OK
+
+
+def _export_rules(args: argparse.Namespace) -> int:
+    from core.rules_io import RulesFormatError, export_rules
+    from utils.file_types import get_file_types
+
+    get_file_types()  # Creates and populates the database on first use
+    try:
+        count = export_rules(args.path, include_config=not args.no_config)
+    except (RulesFormatError, OSError) as e:
+        _emit({'status': 'error', 'error': str(e)})
+        return EXIT_CONFIG
+    _emit({'status': 'ok', 'path': args.path, 'mappings': count})
+    return EXIT_OK
+
+
+def _import_rules(args: argparse.Namespace) -> int:
+    from core.rules_io import RulesFormatError, import_rules
+
+    try:
+        diff = import_rules(args.path, merge=args.merge, dry_run=args.dry_run)
+    except RulesFormatError as e:
+        _emit({'status': 'error', 'error': str(e)})
+        return EXIT_CONFIG
+
+    result = dataclasses.asdict(diff)
+    result.update(status='ok', dry_run=args.dry_run)
+    _emit(result)
+    return EXIT_OK
+
+
+COMMANDS = {
+    'run': _run,
+    'watch': _watch,
+    'dedupe': _dedupe,
+    'undo': _undo,
+    'export-rules': _export_rules,
+    'import-rules': _import_rules,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point; returns the process exit code."""
+    args = build_parser().parse_args(argv)
+
+    from core.database import DatabaseManager
+    from utils.logger import configure_logging
+
+    configure_logging(debug_mode=getattr(args, 'debug', False))
+    try:
+        return COMMANDS[args.command](args)
+    except Exception as e:
+        _emit({'status': 'error', 'error': str(e)})
+        return EXIT_FAILED
+    finally:
+        DatabaseManager.close_all_connections()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,7 +6,7 @@ die für die Konfiguration und Basisoperationen benötigt werden.
 """
 
 from .config import Config, OrganizerConfig
-from .constants import DATE_FORMAT, LOG_FORMAT, DATE_FMT
+from .constants import DATE_FORMAT, LOG_FORMAT, DATE_FMT, NAMING_TEMPLATE
 from .translation import Translation
 
 __all__ = [
@@ -15,5 +15,6 @@ __all__ = [
     'DATE_FORMAT',
     'LOG_FORMAT',
     'DATE_FMT',
+    'NAMING_TEMPLATE',
     'Translation'
 ]
@@ -1,6 +1,10 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 import logging
+from .constants import NAMING_TEMPLATE
+
+if TYPE_CHECKING:
+    from utils.run_control import CancellationToken, RunProgressCallback
 
 @dataclass
 class Config:
@@ -21,3 +25,18 @@ class OrganizerConfig:
     use_creation_date: bool = False
     force_date: bool = False
     date_folders: bool = False  # New setting
+    naming_template: str = NAMING_TEMPLATE  # New name of dated items (see utils.filename_utils.NamingTemplate)
+    dry_run: bool = False  # Only build and export the move plan
+    plan_output: Optional[str] = None  # JSON file for the dry-run plan
+    workers: int = 4  # Concurrent moves (one destination folder per worker)
+    verify_copies: bool = False  # Checksum cross-device copies before deleting the source
+    incremental: bool = False  # Skip entries left unorganized by the last run if unchanged
+    db_path: Optional[str] = None  # Database file (default: fileorganizer.db in the app dir)
+    stability_interval: float = 0.0  # Seconds an item must stay unchanged before it is moved
+    report_output: Optional[str] = None  # JSON file for the run report (default: logs/reports/)
+    cancel_token: Optional["CancellationToken"] = None  # Cancels/pauses the run between items
+    on_progress: Optional["RunProgressCallback"] = None  # Throttled progress reports (any thread)
+    profile: bool = False  # Profile the run (cProfile, tracemalloc, fs calls) into logs/
+    journal: bool = True  # Record every move in the database journal (crash recovery)
+    journal_recovery: str = 'forward'  # Interrupted runs: 'forward' (finish) or 'back' (undo)
+    resume: bool = True  # Continue an unfinished run with the same plan fingerprint instead of scanning
@@ -0,0 +1,57 @@
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from .database import DatabaseManager
+
+
+class _Snapshot(NamedTuple):
+    key: Tuple[int, int]
+    config: Dict[str, str]
+    file_types: Dict[str, List[str]]
+
+
+class ConfigCache:
+    """
+    In-process snapshot of the ``config`` and ``file_types`` tables.
+
+    Reads are served from memory. Before each read the snapshot is validated
+    with two cheap checks: ``DatabaseManager.revision`` (config or file type
+    changes in this process) and the stored rules revision (changes by other
+    processes, e.g. a watch daemon or a second GUI). Only if one of them
+    changed are the tables read again; writes to other tables (journal, scan
+    index, hash cache) keep the snapshot.
+
+    The returned ``file_types`` mapping is shared and must not be modified.
+    """
+
+    _lock = threading.Lock()
+    _snapshots: Dict[str, _Snapshot] = {}
+
+    @classmethod
+    def _snapshot(cls, db_path: Optional[str] = None) -> _Snapshot:
+        db_manager = DatabaseManager(db_path)
+        key = (DatabaseManager.revision, db_manager.rules_revision())
+
+        snapshot = cls._snapshots.get(db_manager.db_path)
+        if snapshot is not None and snapshot.key == key:
+            return snapshot
+
+        with cls._lock:
+            snapshot = _Snapshot(key, db_manager.get_config(), db_manager.get_file_types())
+            cls._snapshots[db_manager.db_path] = snapshot
+        return snapshot
+
+    @classmethod
+    def get_config(cls, db_path: Optional[str] = None) -> Dict[str, str]:
+        """Returns the configuration values (a copy the caller may modify)."""
+        return dict(cls._snapshot(db_path).config)
+
+    @classmethod
+    def get_file_types(cls, db_path: Optional[str] = None) -> Dict[str, List[str]]:
+        """Returns the file types mapping (shared, read-only)."""
+        return cls._snapshot(db_path).file_types
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drops all snapshots."""
+        with cls._lock:
+            cls._snapshots.clear()
@@ -1,5 +1,7 @@
 from typing import Final
 
 DATE_FORMAT: Final = "%Y-%m-%d-"
+# Default naming template for dated files and folders (see utils.filename_utils.NamingTemplate)
+NAMING_TEMPLATE: Final = "{date:%Y-%m-%d}-{name}"
 LOG_FORMAT: Final = "%(asctime)s | %(message)s"
 DATE_FMT: Final = "%Y-%m-%d %H:%M:%S"
\ No newline at end of file
@@ -1,15 +1,130 @@
 import os
 import sqlite3
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple, Iterable
 from pathlib import Path
-from utils.logger import get_logger
+
+
+class _ConnectionPool:
+    """
+    Long-lived SQLite connections, one per (thread, database file).
+
+    sqlite3 connections must not be shared between threads, so every thread
+    gets its own connection that is opened once and reused for all later
+    calls. Connections of threads that have ended (e.g. pool workers of a
+    finished run) are closed when the next connection is opened, so
+    long-running processes do not accumulate them. All connections use WAL mode, so readers never block the writer
+    and the GUI, a CLI run and a watch daemon can use the file concurrently.
+    """
+
+    BUSY_TIMEOUT = 10.0  # Seconds to wait for a lock held by another process
+    CACHED_STATEMENTS = 256
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+
+    def get(self, db_path: str) -> sqlite3.Connection:
+        """Returns this thread's connection to ``db_path``."""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(db_path)
+        if conn is None:
+            self._close_orphans()
+            conn = self._open(db_path)
+            connections[db_path] = conn
+            with self._lock:
+                self._all.append((threading.current_thread(), conn))
+        return conn
+
+    def _close_orphans(self) -> None:
+        """Closes the connections of threads that are no longer alive."""
+        with self._lock:
+            orphans = [conn for thread, conn in self._all if not thread.is_alive()]
+            if not orphans:
+                return
+            self._all = [(thread, conn) for thread, conn in self._all if thread.is_alive()]
+        for conn in orphans:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _open(self, db_path: str) -> sqlite3.Connection:
+        # Only the owning thread uses a connection; check_same_thread is off
+        # so that connections of ended threads can be closed from another one
+        conn = sqlite3.connect(db_path, timeout=self.BUSY_TIMEOUT,
+                               cached_statements=self.CACHED_STATEMENTS,
+                               isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.BUSY_TIMEOUT * 1000)}")
+        return conn
+
+    def depth(self, conn: sqlite3.Connection) -> int:
+        """Current transaction nesting depth of a connection (this thread)."""
+        return getattr(self._local, 'depth', {}).get(id(conn), 0)
+
+    def set_depth(self, conn: sqlite3.Connection, depth: int) -> None:
+        depths = getattr(self._local, 'depth', None)
+        if depths is None:
+            depths = self._local.depth = {}
+        depths[id(conn)] = depth
+
+    def mark_rules_changed(self, conn: sqlite3.Connection) -> None:
+        """Notes that the open transaction of ``conn`` changes config or file types."""
+        marks = getattr(self._local, 'rules_changed', None)
+        if marks is None:
+            marks = self._local.rules_changed = set()
+        marks.add(id(conn))
+
+    def take_rules_changed(self, conn: sqlite3.Connection) -> bool:
+        """Returns and clears the mark of ``conn`` (at commit or rollback)."""
+        marks = getattr(self._local, 'rules_changed', None)
+        if not marks or id(conn) not in marks:
+            return False
+        marks.discard(id(conn))
+        return True
+
+    def close_all(self) -> None:
+        """Closes every pooled connection (e.g. at application exit)."""
+        with self._lock:
+            connections, self._all = self._all, []
+        for _, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+_pool = _ConnectionPool()
+
 
 class DatabaseManager:
     """Manages database operations for configuration and file types."""
 
     DB_FILE = "fileorganizer.db"
 
+    # Bumped after every committed change of config or file types in this
+    # process; together with the stored rules revision (changes by other
+    # processes) it tells ConfigCache when to reload. Other tables (journal,
+    # scan index, hash cache) never bump it.
+    revision = 0
+    _revision_lock = threading.Lock()
+
+    # Keys per hash cache lookup query (4 parameters each)
+    HASH_LOOKUP_BATCH = 200
+    # Compact the file after pruning at least this many hash cache rows
+    VACUUM_MIN_ROWS = 10000
+    # Finished journal runs that are kept (older ones are dropped)
+    JOURNAL_KEEP_RUNS = 20
+
     def __init__(self, db_path: Optional[str] = None):
         """Initialize database connection."""
         # Use specified path or default to app directory
@@ -21,47 +136,193 @@ class DatabaseManager:
             self.db_path = os.path.join(app_dir, self.DB_FILE)
 
         self.conn = None
-        self.logger = get_logger(__name__)
+        self.logger = logging.getLogger(__name__)
 
     def connect(self) -> None:
-        """Connect to the database."""
+        """Connect to the database (reuses this thread's pooled connection)."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = _pool.get(self.db_path)
         except sqlite3.Error as e:
             self.logger.error(f"Database connection error: {e}")
             raise
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Release the database connection (it stays open in the pool)."""
+        self.conn = None
+
+    @staticmethod
+    def close_all_connections() -> None:
+        """Close all pooled connections of all DatabaseManager instances."""
+        _pool.close_all()
+
+    def cursor(self) -> sqlite3.Cursor:
+        """Returns a cursor on the pooled connection."""
+        self.connect()
+        return self.conn.cursor()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Groups writes into one transaction.
+
+        Commits on success and rolls back on error. Nested use joins the
+        outer transaction, so methods that open their own transaction can
+        be combined into one atomic unit by the caller.
+        """
+        self.connect()
+        conn = self.conn
+        depth = _pool.depth(conn)
+        if depth == 0:
+            # Take the write lock up front instead of failing on upgrade
+            conn.execute("BEGIN IMMEDIATE")
+        _pool.set_depth(conn, depth + 1)
+        try:
+            yield conn.cursor()
+        except BaseException:
+            _pool.set_depth(conn, depth)
+            if depth == 0:
+                conn.execute("ROLLBACK")
+                _pool.take_rules_changed(conn)
+            raise
+        _pool.set_depth(conn, depth)
+        if depth == 0:
+            conn.execute("COMMIT")
+            if _pool.take_rules_changed(conn):
+                self._bump_revision()
+
+    @classmethod
+    def _bump_revision(cls) -> None:
+        with cls._revision_lock:
+            cls.revision += 1
+
+    def _rules_changed(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Records a change of config or file types in the open transaction.
+
+        Increments the stored rules revision (seen by other processes) in
+        the same transaction; ``revision`` is bumped once the outermost
+        transaction commits, never on rollback.
+        """
+        cursor.execute(
+            "INSERT INTO meta (key, value) VALUES ('rules_revision', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+        _pool.mark_rules_changed(self.conn)
+
+    def rules_revision(self) -> int:
+        """Returns the stored revision of config and file types (0 if unknown)."""
+        try:
+            row = self.cursor().execute("SELECT value FROM meta WHERE key = 'rules_revision'").fetchone()
+            return row[0] if row else 0
+        except sqlite3.Error:
+            return 0
+        finally:
+            self.close()
 
     def initialize_database(self) -> None:
         """Create database tables if they don't exist."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
+            with self.transaction() as cursor:
+                # Create config table
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS config (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                ''')
 
-            # Create config table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS config (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-            ''')
-
-            # Create file_types table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS file_types (
-                folder_name TEXT NOT NULL,
-                extension TEXT NOT NULL,
-                PRIMARY KEY (folder_name, extension)
-            )
-            ''')
+                # Create meta table (revision counters)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+                ''')
+
+                # Create file_types table
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_types (
+                    folder_name TEXT NOT NULL,
+                    extension TEXT NOT NULL,
+                    PRIMARY KEY (folder_name, extension)
+                )
+                ''')
+
+                # Create incremental scan index (entries left unorganized by the
+                # last run, valid for one file_types revision)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scan_index (
+                    dev INTEGER NOT NULL,
+                    ino INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    rules_hash TEXT NOT NULL,
+                    PRIMARY KEY (dev, ino, size, mtime_ns)
+                )
+                ''')
+
+                # Create content hash cache (partial/full digests per file version)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS hash_cache (
+                    dev INTEGER NOT NULL,
+                    ino INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    partial TEXT,
+                    full TEXT,
+                    seen_at INTEGER NOT NULL,
+                    PRIMARY KEY (dev, ino, size, mtime_ns, algorithm)
+                ) WITHOUT ROWID
+                ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS hash_cache_path ON hash_cache (path)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS hash_cache_seen ON hash_cache (seen_at)")
+
+                # Create move journal (runs, their planned moves and created folders)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS journal_runs (
+                    run_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    host TEXT,
+                    pid INTEGER,
+                    source_folder TEXT,
+                    organized_folder TEXT,
+                    unorganized_folder TEXT,
+                    fingerprint TEXT,
+                    undo_of TEXT
+                )
+                ''')
+                # Journals of older versions lack the plan fingerprint (resumable runs)
+                # and the link of an undo to the run it reverses
+                cursor.execute("PRAGMA table_info(journal_runs)")
+                columns = {row[1] for row in cursor.fetchall()}
+                if 'fingerprint' not in columns:
+                    cursor.execute("ALTER TABLE journal_runs ADD COLUMN fingerprint TEXT")
+                if 'undo_of' not in columns:
+                    cursor.execute("ALTER TABLE journal_runs ADD COLUMN undo_of TEXT")
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS journal_moves (
+                    run_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    destination TEXT NOT NULL,
+                    final TEXT,
+                    size INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    PRIMARY KEY (run_id, seq)
+                ) WITHOUT ROWID
+                ''')
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS journal_dirs (
+                    run_id TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    PRIMARY KEY (run_id, path)
+                ) WITHOUT ROWID
+                ''')
 
-            self.conn.commit()
             self.logger.debug("Database initialized successfully")
         except sqlite3.Error as e:
             self.logger.error(f"Database initialization error: {e}")
@@ -72,21 +333,18 @@ class DatabaseManager:
     def populate_default_config(self, default_config: Dict[str, str]) -> None:
         """Populate the config table with default values if empty."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-
-            # Check if config table is empty
-            cursor.execute("SELECT COUNT(*) FROM config")
-            count = cursor.fetchone()[0]
+            with self.transaction() as cursor:
+                # Check if config table is empty
+                cursor.execute("SELECT COUNT(*) FROM config")
+                count = cursor.fetchone()[0]
 
-            if count == 0:
-                for key, value in default_config.items():
-                    cursor.execute(
+                if count == 0:
+                    cursor.executemany(
                         "INSERT INTO config (key, value) VALUES (?, ?)",
-                        (key, value)
+                        default_config.items()
                     )
-                self.conn.commit()
-                self.logger.debug("Default configuration populated")
+                    self._rules_changed(cursor)
+                    self.logger.debug("Default configuration populated")
         except sqlite3.Error as e:
             self.logger.error(f"Error populating default config: {e}")
             raise
@@ -96,22 +354,19 @@ class DatabaseManager:
     def populate_default_file_types(self, file_types: Dict[str, List[str]]) -> None:
         """Populate the file_types table with default values if empty."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-
-            # Check if file_types table is empty
-            cursor.execute("SELECT COUNT(*) FROM file_types")
-            count = cursor.fetchone()[0]
-
-            if count == 0:
-                for folder_name, extensions in file_types.items():
-                    for ext in extensions:
-                        cursor.execute(
-                            "INSERT INTO file_types (folder_name, extension) VALUES (?, ?)",
-                            (folder_name, ext)
-                        )
-                self.conn.commit()
-                self.logger.debug("Default file types populated")
+            with self.transaction() as cursor:
+                # Check if file_types table is empty
+                cursor.execute("SELECT COUNT(*) FROM file_types")
+                count = cursor.fetchone()[0]
+
+                if count == 0:
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO file_types (folder_name, extension) VALUES (?, ?)",
+                        ((folder_name, ext) for folder_name, extensions in file_types.items()
+                         for ext in extensions)
+                    )
+                    self._rules_changed(cursor)
+                    self.logger.debug("Default file types populated")
         except sqlite3.Error as e:
             self.logger.error(f"Error populating default file types: {e}")
             raise
@@ -121,8 +376,7 @@ class DatabaseManager:
     def get_config(self) -> Dict[str, str]:
         """Get all configuration values."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
+            cursor = self.cursor()
             cursor.execute("SELECT key, value FROM config")
             config = {row['key']: row['value'] for row in cursor.fetchall()}
             return config
@@ -135,14 +389,12 @@ class DatabaseManager:
     def update_config(self, config: Dict[str, str]) -> None:
         """Update configuration values."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-            for key, value in config.items():
-                cursor.execute(
+            with self.transaction() as cursor:
+                cursor.executemany(
                     "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
-                    (key, str(value))
+                    ((key, str(value)) for key, value in config.items())
                 )
-            self.conn.commit()
+                self._rules_changed(cursor)
             self.logger.debug("Configuration updated")
         except sqlite3.Error as e:
             self.logger.error(f"Error updating configuration: {e}")
@@ -153,8 +405,7 @@ class DatabaseManager:
     def get_file_types(self) -> Dict[str, List[str]]:
         """Get all file types."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
+            cursor = self.cursor()
             cursor.execute("SELECT folder_name, extension FROM file_types ORDER BY folder_name")
 
             file_types = {}
@@ -175,14 +426,14 @@ class DatabaseManager:
     def add_file_type(self, folder_name: str, extension: str) -> bool:
         """Add a new file type."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO file_types (folder_name, extension) VALUES (?, ?)",
-                (folder_name, extension)
-            )
-            self.conn.commit()
-            return cursor.rowcount > 0
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO file_types (folder_name, extension) VALUES (?, ?)",
+                    (folder_name, extension)
+                )
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+                return cursor.rowcount > 0
         except sqlite3.Error as e:
             self.logger.error(f"Error adding file type: {e}")
             return False
@@ -192,14 +443,14 @@ class DatabaseManager:
     def remove_file_type(self, folder_name: str, extension: str) -> bool:
         """Remove a file type."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "DELETE FROM file_types WHERE folder_name = ? AND extension = ?",
-                (folder_name, extension)
-            )
-            self.conn.commit()
-            return cursor.rowcount > 0
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "DELETE FROM file_types WHERE folder_name = ? AND extension = ?",
+                    (folder_name, extension)
+                )
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+                return cursor.rowcount > 0
         except sqlite3.Error as e:
             self.logger.error(f"Error removing file type: {e}")
             return False
@@ -212,14 +463,14 @@ class DatabaseManager:
             return True
 
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "UPDATE file_types SET folder_name = ? WHERE folder_name = ?",
-                (new_name, old_name)
-            )
-            self.conn.commit()
-            return cursor.rowcount > 0
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "UPDATE file_types SET folder_name = ? WHERE folder_name = ?",
+                    (new_name, old_name)
+                )
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+                return cursor.rowcount > 0
         except sqlite3.Error as e:
             self.logger.error(f"Error renaming folder: {e}")
             return False
@@ -229,14 +480,14 @@ class DatabaseManager:
     def delete_folder(self, folder_name: str) -> bool:
         """Delete a folder and all its associated file types."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "DELETE FROM file_types WHERE folder_name = ?",
-                (folder_name,)
-            )
-            self.conn.commit()
-            return cursor.rowcount > 0
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "DELETE FROM file_types WHERE folder_name = ?",
+                    (folder_name,)
+                )
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+                return cursor.rowcount > 0
         except sqlite3.Error as e:
             self.logger.error(f"Error deleting folder: {e}")
             return False
@@ -259,8 +510,7 @@ class DatabaseManager:
     def get_folder_count(self, folder_name: str) -> int:
         """Get the number of extensions in a folder."""
         try:
-            self.connect()
-            cursor = self.conn.cursor()
+            cursor = self.cursor()
             cursor.execute(
                 "SELECT COUNT(*) FROM file_types WHERE folder_name = ?",
                 (folder_name,)
@@ -271,3 +521,335 @@ class DatabaseManager:
             return 0
         finally:
             self.close()
+
+    def add_file_types(self, mappings: Iterable[Tuple[str, str]]) -> int:
+        """Add (folder_name, extension) pairs in one statement batch; returns the number added."""
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO file_types (folder_name, extension) VALUES (?, ?)",
+                    mappings
+                )
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            self.logger.error(f"Error adding file types: {e}")
+            raise
+        finally:
+            self.close()
+
+    def remove_file_types(self, mappings: Iterable[Tuple[str, str]]) -> int:
+        """Remove (folder_name, extension) pairs in one statement batch; returns the number removed."""
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "DELETE FROM file_types WHERE folder_name = ? AND extension = ?",
+                    mappings
+                )
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            self.logger.error(f"Error removing file types: {e}")
+            raise
+        finally:
+            self.close()
+
+    def delete_config(self, keys: Iterable[str]) -> None:
+        """Delete configuration values."""
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany("DELETE FROM config WHERE key = ?", ((key,) for key in keys))
+                if cursor.rowcount > 0:
+                    self._rules_changed(cursor)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error deleting configuration: {e}")
+            raise
+        finally:
+            self.close()
+
+    def get_scan_index(self, rules_hash: str) -> Set[Tuple[int, int, int, int]]:
+        """Get the scan index keys; entries of other rule revisions are dropped."""
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("DELETE FROM scan_index WHERE rules_hash != ?", (rules_hash,))
+                if cursor.rowcount > 0:
+                    self.logger.debug(f"Scan index invalidated ({cursor.rowcount} entries)")
+                cursor.execute("SELECT dev, ino, size, mtime_ns FROM scan_index")
+                return {tuple(row) for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            self.logger.error(f"Error retrieving scan index: {e}")
+            return set()
+        finally:
+            self.close()
+
+    def replace_scan_index(self, rules_hash: str, keys: Iterable[Tuple[int, int, int, int]]) -> None:
+        """Replace the scan index with the given keys in one transaction."""
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("DELETE FROM scan_index")
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO scan_index (dev, ino, size, mtime_ns, rules_hash) VALUES (?, ?, ?, ?, ?)",
+                    ((*key, rules_hash) for key in keys)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating scan index: {e}")
+        finally:
+            self.close()
+
+    def get_hashes(self, algorithm: str,
+                   keys: Iterable[Tuple[int, int, int, int]]) -> Dict[Tuple[int, int, int, int], Tuple[Optional[str], Optional[str]]]:
+        """
+        Looks up cached digests for (dev, ino, size, mtime_ns) keys.
+
+        Keys are looked up in batches of ``HASH_LOOKUP_BATCH`` per query.
+
+        Returns
+        -------
+        Dict
+            key -> (partial digest, full digest) for the keys in the cache
+        """
+        found = {}
+        keys = list(keys)
+        try:
+            cursor = self.cursor()
+            for start in range(0, len(keys), self.HASH_LOOKUP_BATCH):
+                batch = keys[start:start + self.HASH_LOOKUP_BATCH]
+                # OR'ed key terms use the primary key per term (a row-value IN
+                # list was ~50x slower in tests)
+                terms = ' OR '.join(['(dev = ? AND ino = ? AND size = ? AND mtime_ns = ?)'] * len(batch))
+                cursor.execute(
+                    "SELECT dev, ino, size, mtime_ns, partial, full FROM hash_cache "
+                    f"WHERE algorithm = ? AND ({terms})",
+                    [algorithm, *(value for key in batch for value in key)]
+                )
+                for dev, ino, size, mtime_ns, partial, full in cursor.fetchall():
+                    found[(dev, ino, size, mtime_ns)] = (partial, full)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading hash cache: {e}")
+        finally:
+            self.close()
+        return found
+
+    def store_hashes(self, algorithm: str, rows: Iterable[Tuple[int, int, int, int, str, Optional[str], Optional[str]]],
+                     seen_at: int) -> None:
+        """
+        Stores digests in one transaction.
+
+        Rows are (dev, ino, size, mtime_ns, path, partial, full); a digest of
+        None keeps the cached value, so rows without digests only mark a
+        file as seen. Rows of older versions of the same path are dropped.
+        """
+        rows = list(rows)
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "DELETE FROM hash_cache WHERE path = ? AND algorithm = ? "
+                    "AND NOT (dev = ? AND ino = ? AND size = ? AND mtime_ns = ?)",
+                    ((path, algorithm, dev, ino, size, mtime_ns)
+                     for dev, ino, size, mtime_ns, path, _, _ in rows)
+                )
+                cursor.executemany(
+                    "INSERT INTO hash_cache (dev, ino, size, mtime_ns, algorithm, path, partial, full, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (dev, ino, size, mtime_ns, algorithm) DO UPDATE SET "
+                    "path = excluded.path, seen_at = excluded.seen_at, "
+                    "partial = COALESCE(excluded.partial, hash_cache.partial), "
+                    "full = COALESCE(excluded.full, hash_cache.full)",
+                    ((dev, ino, size, mtime_ns, algorithm, path, partial, full, seen_at)
+                     for dev, ino, size, mtime_ns, path, partial, full in rows)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating hash cache: {e}")
+        finally:
+            self.close()
+
+    def prune_hash_cache(self, stale_before: int, now: int) -> int:
+        """
+        Drops cached digests of files that no longer exist or changed.
+
+        Only rows not seen since ``stale_before`` are checked (one stat call
+        each); rows of unchanged files are marked as seen at ``now``. The
+        file is compacted with VACUUM when a large share of it was dropped.
+
+        Returns
+        -------
+        int
+            Number of dropped rows
+        """
+        try:
+            cursor = self.cursor()
+            cursor.execute(
+                "SELECT dev, ino, size, mtime_ns, algorithm, path FROM hash_cache WHERE seen_at < ?",
+                (stale_before,))
+            stale = cursor.fetchall()
+            if not stale:
+                return 0
+            gone, alive = [], []
+            for dev, ino, size, mtime_ns, algorithm, path in stale:
+                try:
+                    st = os.stat(path)
+                    unchanged = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns) == (dev, ino, size, mtime_ns)
+                except OSError:
+                    unchanged = False
+                (alive if unchanged else gone).append((dev, ino, size, mtime_ns, algorithm))
+
+            with self.transaction() as cursor:
+                key = "dev = ? AND ino = ? AND size = ? AND mtime_ns = ? AND algorithm = ?"
+                cursor.executemany(f"DELETE FROM hash_cache WHERE {key}", gone)
+                cursor.executemany(f"UPDATE hash_cache SET seen_at = ? WHERE {key}",
+                                   ((now, *row) for row in alive))
+                cursor.execute("SELECT COUNT(*) FROM hash_cache")
+                remaining = cursor.fetchone()[0]
+            if len(gone) >= self.VACUUM_MIN_ROWS and len(gone) > remaining:
+                self.conn.execute("VACUUM")
+            self.logger.debug(f"Hash cache pruned: {len(gone)} rows dropped, {len(alive)} still valid")
+            return len(gone)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error pruning hash cache: {e}")
+            return 0
+        finally:
+            self.close()
+
+    def start_journal_run(self, run: Dict[str, Any], moves: Iterable[Tuple[int, str, str, str, int]]) -> None:
+        """
+        Records a run and all its planned moves in one transaction.
+
+        ``run`` holds the journal_runs columns; moves are (seq, kind, source,
+        destination, size) and start in state 'pending'.
+        """
+        try:
+            with self.transaction() as cursor:
+                columns = ', '.join(run)
+                cursor.execute(
+                    f"INSERT INTO journal_runs ({columns}) VALUES ({', '.join('?' * len(run))})",
+                    tuple(run.values())
+                )
+                cursor.executemany(
+                    "INSERT INTO journal_moves (run_id, seq, kind, source, destination, size, state) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 'pending')",
+                    ((run['run_id'], seq, kind, source, destination, size)
+                     for seq, kind, source, destination, size in moves)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error writing move journal: {e}")
+            raise
+        finally:
+            self.close()
+
+    def update_journal_moves(self, run_id: str, updates: Iterable[Tuple[str, Optional[str], int]]) -> None:
+        """Applies (state, final path, seq) updates of one run in one transaction."""
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "UPDATE journal_moves SET state = ?, final = COALESCE(?, final) WHERE run_id = ? AND seq = ?",
+                    ((state, final, run_id, seq) for state, final, seq in updates)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating move journal: {e}")
+            raise
+        finally:
+            self.close()
+
+    def add_journal_dirs(self, run_id: str, paths: Iterable[str]) -> None:
+        """Records folders created by a run."""
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany("INSERT OR IGNORE INTO journal_dirs (run_id, path) VALUES (?, ?)",
+                                   ((run_id, path) for path in paths))
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating move journal: {e}")
+            raise
+        finally:
+            self.close()
+
+    def reopen_journal_run(self, run_id: str, state: str, pid: int) -> None:
+        """Reopens a run in process ``pid`` (resumed from its checkpoint)."""
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("UPDATE journal_runs SET state = ?, pid = ?, finished_at = NULL WHERE run_id = ?",
+                               (state, pid, run_id))
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating move journal: {e}")
+            raise
+        finally:
+            self.close()
+
+    def finish_journal_run(self, run_id: str, state: str, finished_at: Optional[str]) -> None:
+        """Sets the state of a run and drops the oldest finished runs."""
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("UPDATE journal_runs SET state = ?, finished_at = ? WHERE run_id = ?",
+                               (state, finished_at, run_id))
+                cursor.execute(
+                    "SELECT run_id FROM journal_runs WHERE finished_at IS NOT NULL "
+                    "ORDER BY started_at DESC LIMIT -1 OFFSET ?", (self.JOURNAL_KEEP_RUNS,))
+                old = [(row[0],) for row in cursor.fetchall()]
+                for table in ('journal_moves', 'journal_dirs', 'journal_runs'):
+                    cursor.executemany(f"DELETE FROM {table} WHERE run_id = ?", old)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error finishing move journal: {e}")
+            raise
+        finally:
+            self.close()
+
+    def get_journal_runs(self, states: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Returns the journal runs (newest first), optionally only those in ``states``."""
+        try:
+            cursor = self.cursor()
+            if states is None:
+                cursor.execute("SELECT * FROM journal_runs ORDER BY started_at DESC")
+            else:
+                states = list(states)
+                cursor.execute(
+                    f"SELECT * FROM journal_runs WHERE state IN ({', '.join('?' * len(states))}) "
+                    "ORDER BY started_at DESC", states)
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading move journal: {e}")
+            return []
+        finally:
+            self.close()
+
+    def get_journal_moves(self, run_id: str, states: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Returns the moves of a run in plan order, optionally only those in ``states``."""
+        try:
+            cursor = self.cursor()
+            query = "SELECT * FROM journal_moves WHERE run_id = ?"
+            params: List[Any] = [run_id]
+            if states is not None:
+                states = list(states)
+                query += f" AND state IN ({', '.join('?' * len(states))})"
+                params.extend(states)
+            cursor.execute(query + " ORDER BY seq", params)
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading move journal: {e}")
+            return []
+        finally:
+            self.close()
+
+    def get_journal_dirs(self, run_id: str) -> List[str]:
+        """Returns the folders created by a run."""
+        try:
+            cursor = self.cursor()
+            cursor.execute("SELECT path FROM journal_dirs WHERE run_id = ?", (run_id,))
+            return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading move journal: {e}")
+            return []
+        finally:
+            self.close()
+
+    def count_journal_moves(self, run_id: str) -> Dict[str, int]:
+        """Returns the number of moves of a run per state."""
+        try:
+            cursor = self.cursor()
+            cursor.execute("SELECT state, COUNT(*) FROM journal_moves WHERE run_id = ? GROUP BY state", (run_id,))
+            return {state: count for state, count in cursor.fetchall()}
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading move journal: {e}")
+            return {}
+        finally:
+            self.close()
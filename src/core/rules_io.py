@@ -0,0 +1,240 @@
+import json
+import os
+import tomllib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from .database import DatabaseManager
+
+# Exported documents look like this (TOML analogously):
+#
+#     {"file_types": {"Images": [".jpg", ".png"]}, "config": {"LANGUAGE": "en"}}
+RULES_FORMATS = ('json', 'toml')
+
+
+class RulesFormatError(ValueError):
+    """Raised when a rules file cannot be read or has an invalid structure."""
+    pass
+
+
+@dataclass
+class RulesDiff:
+    """Changes an import made (or would make) to the rule tables."""
+
+    added: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[Tuple[str, str]] = field(default_factory=list)
+    config_set: Dict[str, Tuple[Optional[str], str]] = field(default_factory=dict)
+    config_removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.config_set or self.config_removed)
+
+    def format(self) -> str:
+        """Returns a human-readable report, one change per line."""
+        lines = [f"+ {folder}: {ext}" for folder, ext in self.added]
+        lines += [f"- {folder}: {ext}" for folder, ext in self.removed]
+        for key, (old, new) in sorted(self.config_set.items()):
+            lines.append(f"~ {key}: {old!r} -> {new!r}" if old is not None else f"+ {key} = {new!r}")
+        lines += [f"- {key}" for key in self.config_removed]
+        lines.append(f"{len(self.added)} extension(s) added, {len(self.removed)} removed, "
+                     f"{len(self.config_set) + len(self.config_removed)} config value(s) changed")
+        return "\n".join(lines)
+
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.strip().lower()
+    if extension and not extension.startswith('.'):
+        extension = '.' + extension
+    return extension
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt not in RULES_FORMATS:
+        raise RulesFormatError(f"Unsupported rules format '{fmt}' (use one of {', '.join(RULES_FORMATS)})")
+    return fmt
+
+
+def parse_rules(data: Dict) -> Tuple[Dict[str, List[str]], Optional[Dict[str, str]]]:
+    """
+    Validates a rules document.
+
+    Parameters
+    ----------
+    data : Dict
+        Parsed JSON/TOML document
+
+    Returns
+    -------
+    Tuple[Dict[str, List[str]], Optional[Dict[str, str]]]
+        Normalized file types and the config values (None if the document has no config section)
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('file_types', {}), dict):
+        raise RulesFormatError("Expected a 'file_types' table mapping folder names to extension lists")
+
+    file_types: Dict[str, List[str]] = {}
+    for folder_name, extensions in data.get('file_types', {}).items():
+        if not isinstance(extensions, list) or not all(isinstance(e, str) for e in extensions):
+            raise RulesFormatError(f"Extensions of '{folder_name}' must be a list of strings")
+        normalized = {_normalize_extension(e) for e in extensions} - {''}
+        file_types[folder_name] = sorted(normalized)
+
+    config = data.get('config')
+    if config is not None:
+        if not isinstance(config, dict):
+            raise RulesFormatError("'config' must be a table of key/value pairs")
+        config = {str(key): str(value) for key, value in config.items()}
+
+    return file_types, config
+
+
+def load_rules(path: str, fmt: Optional[str] = None) -> Tuple[Dict[str, List[str]], Optional[Dict[str, str]]]:
+    """Reads and validates a rules file (format from ``fmt`` or the file suffix)."""
+    fmt = _detect_format(path, fmt)
+    try:
+        if fmt == 'toml':
+            with open(path, 'rb') as f:
+                data = tomllib.load(f)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RulesFormatError(f"Cannot read rules from {path}: {e}") from e
+    return parse_rules(data)
+
+
+def _toml_string(value: str) -> str:
+    # JSON string escapes are a subset of TOML basic string escapes
+    return json.dumps(value, ensure_ascii=False)
+
+
+def dumps_toml(file_types: Dict[str, List[str]], config: Optional[Dict[str, str]] = None) -> str:
+    """Serializes rules as TOML (the standard library can only read TOML)."""
+    lines = []
+    if config is not None:
+        lines.append("[config]")
+        lines += [f"{_toml_string(k)} = {_toml_string(v)}" for k, v in sorted(config.items())]
+        lines.append("")
+    lines.append("[file_types]")
+    for folder_name, extensions in sorted(file_types.items()):
+        values = ", ".join(_toml_string(e) for e in sorted(extensions))
+        lines.append(f"{_toml_string(folder_name)} = [{values}]")
+    return "\n".join(lines) + "\n"
+
+
+def export_rules(path: str, fmt: Optional[str] = None, include_config: bool = True,
+                 db_path: Optional[str] = None) -> int:
+    """
+    Writes the file types (and optionally the config) of the database to a file.
+
+    Parameters
+    ----------
+    path : str
+        Target file; ``.json`` or ``.toml``
+    fmt : Optional[str]
+        Overrides the format derived from the suffix
+    include_config : bool
+        Whether to include the config table
+    db_path : Optional[str]
+        Database file (default database if omitted)
+
+    Returns
+    -------
+    int
+        Number of exported extension mappings
+    """
+    fmt = _detect_format(path, fmt)
+    db_manager = DatabaseManager(db_path)
+    file_types = db_manager.get_file_types()
+    config = db_manager.get_config() if include_config else None
+
+    if fmt == 'toml':
+        text = dumps_toml(file_types, config)
+    else:
+        data = {'file_types': {k: sorted(v) for k, v in sorted(file_types.items())}}
+        if config is not None:
+            data['config'] = dict(sorted(config.items()))
+        text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+    # Write atomically so an interrupted export never leaves a truncated file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+    count = sum(len(v) for v in file_types.values())
+    db_manager.logger.info(f"Exported {count} extension mappings to {path}")
+    return count
+
+
+def diff_rules(current_types: Dict[str, List[str]], current_config: Dict[str, str],
+               file_types: Dict[str, List[str]], config: Optional[Dict[str, str]],
+               merge: bool) -> RulesDiff:
+    """
+    Computes the changes needed to import ``file_types`` and ``config``.
+
+    In merge mode nothing is removed; otherwise the tables are replaced and
+    every mapping missing from the import is removed. Config keys are only
+    touched if the import has a config section.
+    """
+    current: Set[Tuple[str, str]] = {(f, e) for f, exts in current_types.items() for e in exts}
+    wanted: Set[Tuple[str, str]] = {(f, e) for f, exts in file_types.items() for e in exts}
+
+    diff = RulesDiff(added=sorted(wanted - current))
+    if not merge:
+        diff.removed = sorted(current - wanted)
+
+    if config is not None:
+        diff.config_set = {k: (current_config.get(k), v) for k, v in config.items()
+                           if current_config.get(k) != v}
+        if not merge:
+            diff.config_removed = sorted(set(current_config) - set(config))
+    return diff
+
+
+def import_rules(path: str, merge: bool = False, dry_run: bool = False, fmt: Optional[str] = None,
+                 db_path: Optional[str] = None) -> RulesDiff:
+    """
+    Imports rules from a JSON/TOML file in a single transaction.
+
+    Parameters
+    ----------
+    path : str
+        Rules file
+    merge : bool
+        Add to the existing rules instead of replacing them
+    dry_run : bool
+        Only compute the diff, do not write anything
+    fmt : Optional[str]
+        Overrides the format derived from the suffix
+    db_path : Optional[str]
+        Database file (default database if omitted)
+
+    Returns
+    -------
+    RulesDiff
+        The applied (or, with ``dry_run``, pending) changes
+    """
+    file_types, config = load_rules(path, fmt)
+    db_manager = DatabaseManager(db_path)
+    db_manager.initialize_database()
+
+    if dry_run:
+        return diff_rules(db_manager.get_file_types(), db_manager.get_config(),
+                          file_types, config, merge)
+
+    # The diff is computed under the write lock, so it is exactly what gets applied
+    with db_manager.transaction():
+        diff = diff_rules(db_manager.get_file_types(), db_manager.get_config(),
+                          file_types, config, merge)
+        if diff.removed:
+            db_manager.remove_file_types(diff.removed)
+        if diff.added:
+            db_manager.add_file_types(diff.added)
+        if diff.config_removed:
+            db_manager.delete_config(diff.config_removed)
+        if diff.config_set:
+            db_manager.update_config({k: new for k, (_, new) in diff.config_set.items()})
+
+    db_manager.logger.info(f"Imported rules from {path}: {len(diff.added)} added, "
+                           f"{len(diff.removed)} removed, {len(diff.config_set)} config value(s) set")
+    return diff
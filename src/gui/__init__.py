@@ -5,6 +5,12 @@ Dieses Modul enthält alle Komponenten und Funktionen für die
 Darstellung und Interaktion der grafischen Benutzeroberfläche.
 """
 
-from .main_window import FileOrganizerWindow
-
 __all__ = ['FileOrganizerWindow']
+
+
+def __getattr__(name):
+    # Imported on first use so that e.g. gui.config_handler does not load Qt
+    if name == 'FileOrganizerWindow':
+        from .main_window import FileOrganizerWindow
+        return FileOrganizerWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
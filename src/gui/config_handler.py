@@ -1,40 +1,49 @@
 import os
 import logging
+from core.config_cache import ConfigCache
+from core.constants import NAMING_TEMPLATE
 from core.database import DatabaseManager
 from utils.file_types import FILE_TYPES  # Import the default file types
 
 class ConfigHandler:
     """Handles loading and saving configuration using SQLite database."""
 
+    # Set once the database has been initialized and populated in this process
+    _initialized = False
+
     @staticmethod
     def load_config():
         """Load configuration from database."""
+        # Define default config
+        default_config = {
+            'SOURCE_FOLDER': '',
+            'ORGANIZED_FOLDER': '',
+            'UNORGANIZED_FOLDER': '',
+            'DEBUG': 'False',
+            'USE_CREATION_DATE': 'False',
+            'FORCE_DATE': 'False',
+            'DATE_FOLDERS': 'False',
+            'NAMING_TEMPLATE': NAMING_TEMPLATE,
+            'LANGUAGE': 'en'
+        }
+
         try:
             db_manager = DatabaseManager()
 
-            # Initialize database if needed
-            db_manager.initialize_database()
+            if not ConfigHandler._initialized:
+                # Initialize database if needed
+                db_manager.initialize_database()
 
-            # Define default config
-            default_config = {
-                'SOURCE_FOLDER': '',
-                'ORGANIZED_FOLDER': '',
-                'UNORGANIZED_FOLDER': '',
-                'DEBUG': 'False',
-                'USE_CREATION_DATE': 'False',
-                'FORCE_DATE': 'False',
-                'DATE_FOLDERS': 'False',
-                'LANGUAGE': 'en'
-            }
+                # Populate with default values if empty
+                db_manager.populate_default_config(default_config)
 
-            # Populate with default values if empty
-            db_manager.populate_default_config(default_config)
+                # Populate with default file types if empty
+                db_manager.populate_default_file_types(FILE_TYPES)
 
-            # Populate with default file types if empty
-            db_manager.populate_default_file_types(FILE_TYPES)
+                ConfigHandler._initialized = True
 
-            # Get current config
-            return db_manager.get_config()
+            # Get current config (cached until the config table changes)
+            return ConfigCache.get_config()
 
         except Exception as e:
             logging.error(f"Error loading configuration: {e}")
@@ -54,8 +63,7 @@ class ConfigHandler:
     def get_file_types():
         """Get file types from database."""
         try:
-            db_manager = DatabaseManager()
-            return db_manager.get_file_types()
+            return ConfigCache.get_file_types()
         except Exception as e:
             logging.error(f"Error getting file types: {e}")
             return {}
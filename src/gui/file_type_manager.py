@@ -2,6 +2,7 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineE
                               QListWidget, QPushButton, QComboBox, QMessageBox,
                               QInputDialog, QWidget, QSplitter, QFrame)
 from PySide6.QtCore import Qt, Signal
+from core.config_cache import ConfigCache
 from core.database import DatabaseManager
 from gettext import gettext as _
 from core.translation import Translation
@@ -109,7 +110,7 @@ class FileTypeManagerDialog(QDialog):
 
     def load_folders(self):
         """Load folder names from database."""
-        file_types = self.db_manager.get_file_types()
+        file_types = ConfigCache.get_file_types(self.db_manager.db_path)
         self.folder_combo.clear()
 
         # Add folders to combo box
@@ -125,7 +126,7 @@ class FileTypeManagerDialog(QDialog):
         self.extension_list.clear()
 
         if folder_name:
-            file_types = self.db_manager.get_file_types()
+            file_types = ConfigCache.get_file_types(self.db_manager.db_path)
             if folder_name in file_types:
                 for ext in sorted(file_types[folder_name]):
                     self.extension_list.addItem(ext)
@@ -258,7 +259,7 @@ class FileTypeManagerDialog(QDialog):
 
         if ok and new_name and new_name != old_name:
             # Check if the new name already exists
-            file_types = self.db_manager.get_file_types()
+            file_types = ConfigCache.get_file_types(self.db_manager.db_path)
             if new_name in file_types:
                 reply = QMessageBox.question(
                     self,
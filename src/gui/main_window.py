@@ -1,17 +1,19 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                               QCheckBox, QPushButton, QMessageBox, QLabel, QComboBox)
+                               QCheckBox, QPushButton, QMessageBox, QLabel, QComboBox,
+                               QProgressBar)
 from PySide6.QtCore import Qt, Signal
 import os
 import sys
 import logging
-from utils.file_utils import organize_files_by_type
-from utils.file_types import FILE_TYPES
+from utils.file_types import get_file_types
 from utils.logger import update_debug_mode, get_logger
 from core.config import OrganizerConfig
+from core.constants import NAMING_TEMPLATE
 from core.translation import Translation
 from .components import FolderEntryWidget
 from .config_handler import ConfigHandler
 from .file_type_manager import FileTypeManagerDialog
+from .organize_worker import start_worker
 from gettext import gettext as _
 
 
@@ -25,6 +27,8 @@ class FileOrganizerWindow(QMainWindow):
         super().__init__()
         self.logger = logger
         self.default_height = None
+        self.sort_thread = None
+        self.sort_worker = None
 
         # Create central widget and main layout
         central_widget = QWidget()
@@ -52,6 +56,7 @@ class FileOrganizerWindow(QMainWindow):
         self.setup_folder_entries()
         self.setup_checkboxes()
         self.setup_buttons()
+        self.setup_progress()
 
         # Add spacing at the bottom
         self.main_layout.addStretch()
@@ -89,11 +94,12 @@ class FileOrganizerWindow(QMainWindow):
         checkbox_layout = QHBoxLayout(checkbox_container)
 
         self.debug_cb = QCheckBox("Debug Mode")
+        self.profile_cb = QCheckBox("Profile Run")
         self.creation_date_cb = QCheckBox("Use Creation Date")
         self.force_date_cb = QCheckBox("Force Date")
         self.date_folders_cb = QCheckBox("Add Date to Folders")
 
-        for cb in [self.debug_cb, self.creation_date_cb,
+        for cb in [self.debug_cb, self.profile_cb, self.creation_date_cb,
                    self.force_date_cb, self.date_folders_cb]:
             checkbox_layout.addWidget(cb)
 
@@ -131,17 +137,40 @@ class FileOrganizerWindow(QMainWindow):
         button_container = QWidget()
         button_layout = QHBoxLayout(button_container)
 
-        start_button = QPushButton("Start Sorting")
+        self.start_button = QPushButton("Start Sorting")
         file_types_button = QPushButton("Manage File Types")  # Add this button
 
-        start_button.clicked.connect(self.start_sorting)
+        self.start_button.clicked.connect(self.start_sorting)
         file_types_button.clicked.connect(self.open_file_type_manager)  # Add this connection
 
-        button_layout.addWidget(start_button)
+        button_layout.addWidget(self.start_button)
         button_layout.addWidget(file_types_button)  # Add this button
 
         self.main_layout.addWidget(button_container)
 
+    def setup_progress(self):
+        """Setup progress bar with pause/cancel controls (visible while sorting)."""
+        self.progress_container = QWidget()
+        progress_layout = QVBoxLayout(self.progress_container)
+
+        bar_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.pause_button = QPushButton(_("Pause"))
+        self.pause_button.setCheckable(True)
+        self.cancel_button = QPushButton(_("Cancel"))
+        self.pause_button.toggled.connect(self.toggle_pause)
+        self.cancel_button.clicked.connect(self.cancel_sorting)
+        bar_layout.addWidget(self.progress_bar)
+        bar_layout.addWidget(self.pause_button)
+        bar_layout.addWidget(self.cancel_button)
+
+        self.progress_label = QLabel()
+        progress_layout.addLayout(bar_layout)
+        progress_layout.addWidget(self.progress_label)
+
+        self.progress_container.hide()
+        self.main_layout.addWidget(self.progress_container)
+
     def load_config(self):
         """Load configuration from .env file."""
         config = ConfigHandler.load_config()
@@ -183,7 +212,10 @@ class FileOrganizerWindow(QMainWindow):
         self.save_config()
 
     def start_sorting(self):
-        """Start the file organization process."""
+        """Start the file organization process on a worker thread."""
+        if self.sort_thread is not None:
+            return
+
         try:
             # Debug-Modus aktualisieren
             debug_mode = self.debug_cb.isChecked()
@@ -196,31 +228,117 @@ class FileOrganizerWindow(QMainWindow):
                 source_folder=self.folder_entries['SOURCE_FOLDER'].entry.text(),
                 organized_folder=self.folder_entries['ORGANIZED_FOLDER'].entry.text(),
                 unorganized_folder=self.folder_entries['UNORGANIZED_FOLDER'].entry.text(),
-                file_types=FILE_TYPES,
+                file_types=get_file_types(),
                 logger=self.logger,
                 use_creation_date=self.creation_date_cb.isChecked(),
                 force_date=self.force_date_cb.isChecked(),
-                date_folders=self.date_folders_cb.isChecked()
+                date_folders=self.date_folders_cb.isChecked(),
+                naming_template=ConfigHandler.load_config().get('NAMING_TEMPLATE') or NAMING_TEMPLATE,
+                profile=self.profile_cb.isChecked()
             )
 
             # Check if source folder exists
             if not os.path.exists(config.source_folder):
                 error_msg = f"Source folder not found: {config.source_folder}"
                 self.logger.error(error_msg)
-                QMessageBox.warning(self, "Error", _(error_msg))
+                QMessageBox.warning(self, _("Error"), _("Source folder not found: {}").format(config.source_folder))
                 return
 
-            # Start organization process
-            organize_files_by_type(config)
-
-            success_msg = "File organization completed successfully!"
-            self.logger.debug(success_msg)
-            QMessageBox.information(self, "Success", _(success_msg))
+            # Start organization process; the window stays responsive
+            self.sort_thread, self.sort_worker = start_worker(config, self)
+            self.sort_worker.progress.connect(self.update_progress)
+            self.sort_worker.finished.connect(self.sorting_finished)
+            self.sort_worker.failed.connect(self.sorting_failed)
+            self.sort_thread.finished.connect(self.sorting_stopped)
+            self.set_running(True)
 
         except Exception as e:
             error_msg = f"Error during file organization: {str(e)}"
             self.logger.error(error_msg)
-            QMessageBox.critical(self, "Error", _(error_msg))
+            QMessageBox.critical(self, _("Error"), _("Error during file organization: {}").format(str(e)))
+
+    def set_running(self, running: bool):
+        """Switch the controls between idle and sorting state."""
+        self.start_button.setEnabled(not running)
+        for entry in self.folder_entries.values():
+            entry.setEnabled(not running)
+        self.pause_button.setChecked(False)
+        self.pause_button.setEnabled(running)
+        self.cancel_button.setEnabled(running)
+        if running:
+            self.progress_bar.setRange(0, 0)  # Busy indicator until the plan is known
+            self.progress_label.setText("")
+            self.progress_container.show()
+        else:
+            self.progress_container.hide()
+
+    def update_progress(self, progress):
+        """Show a (throttled) progress report of the engine."""
+        if progress.items_total:
+            self.progress_bar.setRange(0, progress.items_total)
+            self.progress_bar.setValue(progress.items_done)
+        text = _("{} of {} items, {:.1f} MB").format(
+            progress.items_done, progress.items_total, progress.bytes_moved / 1e6)
+        if progress.current:
+            text += f" - {os.path.basename(progress.current)}"
+        self.progress_label.setText(text)
+
+    def toggle_pause(self, paused: bool):
+        """Pause or resume the running organization."""
+        if self.sort_worker is None:
+            return
+        self.sort_worker.set_paused(paused)
+        self.pause_button.setText(_("Resume") if paused else _("Pause"))
+
+    def cancel_sorting(self):
+        """Stop the running organization after the current item."""
+        if self.sort_worker is None:
+            return
+        self.sort_worker.cancel()
+        self.cancel_button.setEnabled(False)
+        self.pause_button.setEnabled(False)
+        self.progress_label.setText(_("Cancelling..."))
+
+    def sorting_finished(self, report):
+        """Report the result of a finished run."""
+        if report is None:
+            return
+        if report.profile:
+            QMessageBox.information(self, _("Profile Run"),
+                                    _("Profile written to {}").format(report.profile['summary']))
+        if report.cancelled:
+            self.logger.debug("File organization cancelled")
+            QMessageBox.information(self, _("Cancel"),
+                                    _("File organization cancelled. {} files and {} folders were moved.").format(
+                                        report.files_moved, report.folders_moved))
+        elif report.errors:
+            self.logger.error(f"File organization finished with {report.errors} errors")
+            QMessageBox.warning(self, _("Warning"),
+                                _("File organization finished with {} errors. See the log for details.").format(
+                                    report.errors))
+        else:
+            success_msg = "File organization completed successfully!"
+            self.logger.debug(success_msg)
+            QMessageBox.information(self, _("Success"), _(success_msg))
+
+    def sorting_failed(self, message: str):
+        """Report an aborted run."""
+        error_msg = f"Error during file organization: {message}"
+        self.logger.error(error_msg)
+        QMessageBox.critical(self, _("Error"), _("Error during file organization: {}").format(message))
+
+    def sorting_stopped(self):
+        """Reset the controls once the worker thread has ended."""
+        self.sort_thread = None
+        self.sort_worker = None
+        self.set_running(False)
+
+    def closeEvent(self, event):
+        """Cancel a running organization and wait for the current item."""
+        if self.sort_thread is not None:
+            self.sort_worker.cancel()
+            self.sort_thread.wait()
+        super().closeEvent(event)
 
     def change_language(self):
         """Change application language."""
@@ -271,10 +389,15 @@ class FileOrganizerWindow(QMainWindow):
 
         # Update checkboxes
         self.debug_cb.setText(_("Debug Mode"))
+        self.profile_cb.setText(_("Profile Run"))
         self.creation_date_cb.setText(_("Use Creation Date"))
         self.force_date_cb.setText(_("Force Date"))
         self.date_folders_cb.setText(_("Add Date to Folders"))
 
+        # Update progress controls
+        self.pause_button.setText(_("Resume") if self.pause_button.isChecked() else _("Pause"))
+        self.cancel_button.setText(_("Cancel"))
+
         # Update buttons
         for button in self.findChildren(QPushButton):
             if button.text() == "Save Configuration":
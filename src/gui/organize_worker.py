@@ -0,0 +1,65 @@
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+from core.config import OrganizerConfig
+from utils.file_utils import organize_files_by_type
+from utils.run_control import CancellationToken, RunProgress
+
+
+class OrganizeWorker(QObject):
+    """
+    Runs ``organize_files_by_type`` on a background thread.
+
+    Progress reports come from the engine's worker threads (throttled to
+    ~20 per second by ``ProgressTracker``) and are delivered to the window
+    as queued signals, so the UI thread only redraws.
+    """
+
+    progress = Signal(object)   # RunProgress
+    finished = Signal(object)   # RunReport
+    failed = Signal(str)
+
+    def __init__(self, config: OrganizerConfig):
+        super().__init__()
+        self.token = CancellationToken()
+        config.cancel_token = self.token
+        config.on_progress = self._report
+        self.config = config
+
+    def _report(self, progress: RunProgress) -> None:
+        self.progress.emit(progress)
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            self.finished.emit(organize_files_by_type(self.config))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def set_paused(self, paused: bool) -> None:
+        if paused:
+            self.token.pause()
+        else:
+            self.token.resume()
+
+
+def start_worker(config: OrganizerConfig, parent: QObject) -> tuple:
+    """
+    Moves a new worker to its own QThread and starts it.
+
+    Returns
+    -------
+    tuple
+        (QThread, OrganizeWorker); the thread quits when the worker is done
+    """
+    thread = QThread(parent)
+    worker = OrganizeWorker(config)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.finished.connect(thread.quit)
+    worker.failed.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread, worker
@@ -4,13 +4,10 @@ import logging
 from utils.file_utils import organize_files_by_type
 from utils.logger import configure_logging, get_logger
 from core.config import OrganizerConfig, Config
+from core.constants import NAMING_TEMPLATE
 from core.database import DatabaseManager
 from utils.file_types import get_file_types
-from gui.main_window import FileOrganizerWindow
-from PySide6.QtWidgets import QApplication
 
-# Logger zentral konfigurieren - initial nur ERROR-Level
-configure_logging(debug_mode=False)
 logger = get_logger(__name__)
 
 def resource_path(relative_path):
@@ -55,11 +52,20 @@ def create_config() -> OrganizerConfig:
         logger=logger,
         use_creation_date=use_creation_date,
         force_date=force_date,
-        date_folders=date_folders
+        date_folders=date_folders,
+        naming_template=config_dict.get('NAMING_TEMPLATE') or NAMING_TEMPLATE
     )
 
 def main() -> None:
     """Main entry point of the application."""
+    # Logger zentral konfigurieren - initial nur ERROR-Level (not at import:
+    # the CLI imports create_config from here after setting up --debug)
+    configure_logging(debug_mode=False)
+
+    # Qt is only loaded for the GUI; headless runs use ``python -m cli``
+    from PySide6.QtWidgets import QApplication
+    from gui.main_window import FileOrganizerWindow
+
     # Initialize database
     initialize_database()
 
@@ -67,7 +73,11 @@ def main() -> None:
     app = QApplication(sys.argv)
     window = FileOrganizerWindow(logger)
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+
+    # Checkpoint the WAL and release the pooled connections
+    DatabaseManager.close_all_connections()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
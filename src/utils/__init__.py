@@ -7,9 +7,14 @@ Dateiorganisation zur Verfügung.
 
 from .file_utils import organize_files_by_type, FileOrganizerError
 from .file_types import FILE_TYPES
-from .path_utils import get_destination_folder
-from .filename_utils import FilenameProcessor
+from .path_utils import ExtensionIndex, get_destination_folder
+from .filename_utils import FilenameProcessor, NamingTemplate, NamingTemplateError
 from .date_utils import get_file_date, format_date_prefix
+from .scanner import ScanEntry, scan_directory
+from .planner import MovePlan, PlannedMove, build_plan
+from .executor import ExecutionStats, execute_plan
+from .journal import MoveJournal, recover_interrupted_runs
+from .undo import UndoError, UndoReport, undo_run
 from core.config import OrganizerConfig
 
 __all__ = [
@@ -18,7 +23,22 @@ __all__ = [
     'FileOrganizerError',
     'FILE_TYPES',
     'get_destination_folder',
+    'ExtensionIndex',
     'FilenameProcessor',
+    'NamingTemplate',
+    'NamingTemplateError',
     'get_file_date',
-    'format_date_prefix'
+    'format_date_prefix',
+    'ScanEntry',
+    'scan_directory',
+    'MovePlan',
+    'PlannedMove',
+    'build_plan',
+    'ExecutionStats',
+    'execute_plan',
+    'MoveJournal',
+    'recover_interrupted_runs',
+    'UndoError',
+    'UndoReport',
+    'undo_run'
 ]
@@ -1,11 +1,20 @@
 import os
 from datetime import datetime
+from typing import Union
+from .filename_utils import FilenameProcessor, _format_day
+from .scanner import ScanEntry
 
-def get_file_date(file_path: str, use_creation_date: bool = False) -> datetime:
-    """Gets creation or modification date of file."""
-    timestamp = os.path.getctime(file_path) if use_creation_date else os.path.getmtime(file_path)
+def get_file_date(file_path: Union[str, ScanEntry], use_creation_date: bool = False) -> datetime:
+    """Gets creation or modification date of file.
+
+    Accepts a path or a ScanEntry; a ScanEntry reuses its cached stat data.
+    """
+    if isinstance(file_path, ScanEntry):
+        timestamp = file_path.ctime if use_creation_date else file_path.mtime
+    else:
+        timestamp = os.path.getctime(file_path) if use_creation_date else os.path.getmtime(file_path)
     return datetime.fromtimestamp(timestamp)
 
 def format_date_prefix(date: datetime) -> str:
-    """Formats date as YYYY-MM-DD-."""
-    return date.strftime("%Y-%m-%d-")
\ No newline at end of file
+    """Formats date as YYYY-MM-DD- (memoized per day, shared with the naming templates)."""
+    return _format_day(FilenameProcessor.DATE_FORMAT + "-", date.toordinal())
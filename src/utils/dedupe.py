@@ -0,0 +1,361 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .file_operations import rename_file, resolve_collision
+from .hash_cache import HashCache
+from .run_report import PhaseTimer
+from .scanner import ScanEntry, scan_tree
+from .transfer import BUFFER_SIZE, TEMP_SUFFIX
+from core.config import OrganizerConfig
+
+# Bytes hashed at the start and at the end of a file in the partial stage
+PARTIAL_SIZE = 64 * 1024
+# Files at least this large are hashed through mmap (no copy into a read buffer)
+MMAP_THRESHOLD = 16 * 1024 * 1024
+HASH_ALGORITHM = 'blake2b'
+# Subfolder of the unorganized folder for the 'move' action
+DUPLICATES_FOLDER = 'duplicates'
+# Suffix of the temporary hardlink before it replaces the duplicate
+LINK_SUFFIX = '.fo-link'
+
+
+class DedupeAction:
+    """What happens to the duplicates of a group (the oldest file is kept)."""
+    SKIP = 'skip'          # Only report
+    HARDLINK = 'hardlink'  # Replace by a hardlink to the kept file
+    MOVE = 'move'          # Move to <unorganized>/duplicates
+
+    ALL = (SKIP, HARDLINK, MOVE)
+
+
+@dataclass
+class DedupeReport:
+    """
+    Result of ``find_duplicates``/``dedupe_tree``.
+
+    ``bytes_read`` against ``bytes_total`` shows how much of the tree had
+    to be read; ``groups`` lists the duplicate groups, kept file first.
+    """
+
+    folder: str
+    action: str = DedupeAction.SKIP
+    files: int = 0
+    bytes_total: int = 0
+    size_candidates: int = 0
+    partial_hashed: int = 0
+    full_hashed: int = 0
+    cache_hits: int = 0
+    bytes_read: int = 0
+    duplicates: int = 0
+    bytes_duplicate: int = 0
+    handled: int = 0
+    errors: int = 0
+    cancelled: bool = False
+    phases: Dict[str, float] = field(default_factory=dict)
+    groups: List[List[str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Returns the report as a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def partial_digest(path: str, size: int, algorithm: str = HASH_ALGORITHM) -> Tuple[str, int]:
+    """
+    Hashes the first and last ``PARTIAL_SIZE`` bytes of a file.
+
+    For files up to ``2 * PARTIAL_SIZE`` this is the hash of the whole
+    content (see ``is_complete``).
+
+    Returns
+    -------
+    Tuple[str, int]
+        (hex digest, bytes read)
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb', buffering=0) as f:
+        if is_complete(size):
+            data = f.read()
+            digest.update(data)
+            return digest.hexdigest(), len(data)
+        head = f.read(PARTIAL_SIZE)
+        f.seek(-PARTIAL_SIZE, os.SEEK_END)
+        tail = f.read(PARTIAL_SIZE)
+    digest.update(head)
+    digest.update(tail)
+    return digest.hexdigest(), len(head) + len(tail)
+
+
+def is_complete(size: int) -> bool:
+    """True if the partial digest of a file of ``size`` bytes covers all of it."""
+    return size <= 2 * PARTIAL_SIZE
+
+
+def full_digest(path: str, algorithm: str = HASH_ALGORITHM) -> Tuple[str, int]:
+    """
+    Streaming hash of a whole file; large files are hashed through mmap.
+
+    hashlib releases the GIL for large updates, so several files can be
+    hashed in parallel on a thread pool.
+
+    Returns
+    -------
+    Tuple[str, int]
+        (hex digest, bytes read)
+    """
+    digest = hashlib.new(algorithm)
+    read_total = 0
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                digest.update(mapped)
+            return digest.hexdigest(), size
+
+        buffer = bytearray(BUFFER_SIZE)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+            read_total += read
+    return digest.hexdigest(), read_total
+
+
+def _hash_groups(groups: Iterable[List[ScanEntry]], hasher: Callable[[ScanEntry], Tuple[str, int]],
+                 workers: int, report: DedupeReport) -> List[List[ScanEntry]]:
+    """Splits each group by ``hasher`` (on a thread pool); returns groups with 2+ files."""
+    entries = [entry for group in groups for entry in group]
+
+    def job(entry: ScanEntry) -> Optional[Tuple[str, int]]:
+        try:
+            return hasher(entry)
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='hasher') as pool:
+        results = list(pool.map(job, entries))
+
+    buckets: Dict[Tuple[int, str], List[ScanEntry]] = defaultdict(list)
+    for entry, result in zip(entries, results):
+        if result is None:
+            report.errors += 1  # Vanished or unreadable: never treated as duplicate
+            continue
+        digest, read = result
+        report.bytes_read += read
+        buckets[(entry.size, digest)].append(entry)
+    return [group for group in buckets.values() if len(group) > 1]
+
+
+def _cached(kind: str, compute: Callable[[ScanEntry], Tuple[str, int]],
+            cache: Optional[HashCache]) -> Callable[[ScanEntry], Tuple[str, int]]:
+    """Wraps a hasher so that cached digests are used and new ones are remembered."""
+    if cache is None:
+        return compute
+
+    def hasher(entry: ScanEntry) -> Tuple[str, int]:
+        digest = cache.get(entry, kind)
+        if digest:
+            return digest, 0
+        digest, read = compute(entry)
+        cache.put(entry, kind, digest)
+        if kind == 'partial' and is_complete(entry.size):
+            cache.put(entry, 'full', digest)
+        return digest, read
+    return hasher
+
+
+def find_duplicates(folder: str, workers: int = 4, min_size: int = 1, token=None,
+                    report: Optional[DedupeReport] = None,
+                    cache: Optional[HashCache] = None) -> Tuple[List[List[ScanEntry]], DedupeReport]:
+    """
+    Finds files with identical content below ``folder``.
+
+    Candidates are narrowed down in stages, each only for the survivors of
+    the previous one:
+
+    1. size (from the directory scan, no reads)
+    2. hash of the first and last ``PARTIAL_SIZE`` bytes
+    3. full streaming hash
+
+    Hardlinks of the same inode count as one file. Most files of a real
+    tree are ruled out by size or partial hash, so only a small fraction of
+    the bytes is read.
+
+    Parameters
+    ----------
+    folder : str
+        Folder to search (recursive)
+    workers : int
+        Threads for the hashing stages
+    min_size : int
+        Smaller files are ignored (empty files are always ignored)
+    token : Optional[CancellationToken]
+        Checked between the stages
+    cache : Optional[HashCache]
+        Digest cache (must use ``HASH_ALGORITHM``); unchanged files are
+        not read again. The caller saves it.
+
+    Returns
+    -------
+    Tuple[List[List[ScanEntry]], DedupeReport]
+        Duplicate groups (oldest file first) and the report
+    """
+    report = report or DedupeReport(folder)
+    timer = PhaseTimer()
+
+    by_size: Dict[int, Dict[Tuple[int, int], ScanEntry]] = defaultdict(dict)
+    for entry in scan_tree(folder):
+        if entry.name.endswith((TEMP_SUFFIX, LINK_SUFFIX)):
+            continue
+        report.files += 1
+        report.bytes_total += entry.size
+        if entry.size >= max(min_size, 1):
+            by_size[entry.size].setdefault((entry.dev, entry.ino), entry)
+    groups = [list(inodes.values()) for inodes in by_size.values() if len(inodes) > 1]
+    report.size_candidates = sum(len(group) for group in groups)
+    if cache is not None:
+        cache.prefetch(entry for group in groups for entry in group)
+    timer.lap('scan')
+
+    if groups and not (token and token.cancelled):
+        report.partial_hashed = report.size_candidates
+        hasher = _cached('partial', lambda e: partial_digest(e.path, e.size), cache)
+        groups = _hash_groups(groups, hasher, workers, report)
+        timer.lap('partial_hash')
+
+    if groups and not (token and token.cancelled):
+        complete = [group for group in groups if is_complete(group[0].size)]
+        remaining = [group for group in groups if not is_complete(group[0].size)]
+        report.full_hashed = sum(len(group) for group in remaining)
+        hasher = _cached('full', lambda e: full_digest(e.path), cache)
+        groups = complete + _hash_groups(remaining, hasher, workers, report)
+        timer.lap('full_hash')
+
+    report.cancelled = bool(token and token.cancelled)
+    report.cache_hits = cache.hits if cache is not None else 0
+    groups = [sorted(group, key=lambda e: (e.mtime_ns, len(e.path), e.path)) for group in groups]
+    groups.sort(key=lambda group: group[0].path)
+    report.duplicates = sum(len(group) - 1 for group in groups)
+    report.bytes_duplicate = sum(group[0].size * (len(group) - 1) for group in groups)
+    report.groups = [[entry.path for entry in group] for group in groups]
+    report.phases = {phase: round(seconds, 6) for phase, seconds in timer.phases.items()}
+    report.phases['total'] = round(timer.total, 6)
+    return groups, report
+
+
+def _unchanged(entry: ScanEntry) -> bool:
+    try:
+        st = os.stat(entry.path)
+    except OSError:
+        return False
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns) == (entry.dev, entry.ino, entry.size, entry.mtime_ns)
+
+
+def hardlink_duplicate(keep: ScanEntry, duplicate: ScanEntry) -> None:
+    """
+    Replaces ``duplicate`` by a hardlink to ``keep``.
+
+    The link is created under a temporary name and renamed over the
+    duplicate, so the path never disappears.
+
+    Raises
+    ------
+    OSError
+        If the files are on different devices or linking fails
+    """
+    temp_path = duplicate.path + LINK_SUFFIX
+    os.link(keep.path, temp_path)
+    try:
+        os.replace(temp_path, duplicate.path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def dedupe_tree(config: OrganizerConfig, action: str = DedupeAction.SKIP,
+                min_size: int = 1, folder: Optional[str] = None, use_cache: bool = True) -> DedupeReport:
+    """
+    Finds duplicates in the organized folder and handles them.
+
+    The oldest file of each group (by modification time) is kept. Files
+    that changed since they were hashed are left alone.
+
+    Parameters
+    ----------
+    config : OrganizerConfig
+        Configuration object (folders, workers, logger, cancel token)
+    action : str
+        One of ``DedupeAction.ALL``
+    min_size : int
+        Smaller files are ignored
+    folder : Optional[str]
+        Folder to search instead of ``config.organized_folder``
+    use_cache : bool
+        Reuse and store digests in the database's hash cache
+
+    Returns
+    -------
+    DedupeReport
+        Statistics and duplicate groups; failed items are logged and counted
+    """
+    if action not in DedupeAction.ALL:
+        raise ValueError(f"Unknown dedupe action '{action}' (allowed: {', '.join(DedupeAction.ALL)})")
+    folder = folder or config.organized_folder
+    logger = config.logger
+    token = config.cancel_token
+    cache = None
+    if use_cache:
+        try:
+            cache = HashCache.open(config, HASH_ALGORITHM)
+        except sqlite3.Error as e:
+            logger.error(f"Hash cache not available: {e}")
+    groups, report = find_duplicates(folder, config.workers, min_size, token,
+                                     DedupeReport(folder, action), cache)
+    if cache is not None:
+        cache.save()
+    logger.info("Duplicates: %d files in %d groups, %d of %d bytes read",
+                report.duplicates, len(groups), report.bytes_read, report.bytes_total)
+    if action == DedupeAction.SKIP:
+        return report
+
+    start = time.perf_counter()
+    target_folder = os.path.join(config.unorganized_folder, DUPLICATES_FOLDER)
+    if action == DedupeAction.MOVE and groups:
+        os.makedirs(target_folder, exist_ok=True)
+
+    for group in groups:
+        keep = group[0]
+        for duplicate in group[1:]:
+            if token and not token.checkpoint():
+                report.cancelled = True
+                break
+            if not _unchanged(duplicate) or not _unchanged(keep):
+                logger.info("Skipping %s: changed since it was hashed", duplicate.path)
+                continue
+            if action == DedupeAction.HARDLINK:
+                try:
+                    hardlink_duplicate(keep, duplicate)
+                    report.handled += 1
+                except OSError as e:
+                    logger.error(f"Error linking {duplicate.path} to {keep.path}: {e}")
+                    report.errors += 1
+            else:
+                destination = resolve_collision(os.path.join(target_folder, duplicate.name))
+                if rename_file(duplicate.path, destination, logger):
+                    report.handled += 1
+                else:
+                    report.errors += 1
+        if report.cancelled:
+            break
+
+    report.phases[action] = round(time.perf_counter() - start, 6)
+    return report
@@ -0,0 +1,89 @@
+import os
+import logging
+import threading
+from typing import Dict, Iterable, List, Set
+
+
+class DirectoryCache:
+    """
+    Remembers which destination folders exist during one run.
+
+    All folders needed by a plan are created in one batch up front; after
+    that ``ensure`` is a set lookup. A folder is only checked on disk again
+    after ``invalidate`` was called because a move reported ENOENT.
+
+    A folder that cannot be created (a file with its name, missing
+    permissions) is logged once; ``ensure`` then raises its error for every
+    move into it, without touching the disk, and all other folders of the
+    plan are still created.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._known: Set[str] = set()
+        self._lock = threading.Lock()
+        self._failed: Dict[str, OSError] = {}
+        self.created: List[str] = []
+        self.mkdir_calls = 0
+        self.checks_saved = 0
+
+    def prepare(self, folders: Iterable[str]) -> None:
+        """Creates all given folders (and their parents) in one batch (errors are logged)."""
+        for folder in sorted(set(folders)):
+            try:
+                self.ensure(folder)
+            except OSError as e:
+                self.logger.error("Cannot create destination folder %s: %s", folder, e)
+
+    def ensure(self, folder: str) -> None:
+        """
+        Makes sure a folder exists; free if it is already known.
+
+        Raises
+        ------
+        OSError
+            If the folder cannot be created (also for later calls)
+        """
+        with self._lock:
+            if folder in self._known:
+                self.checks_saved += 1
+                return
+            error = self._failed.get(folder)
+            if error is not None:
+                raise OSError(error.errno, error.strerror, error.filename)
+            try:
+                self._create(folder)
+            except OSError as e:
+                self._failed[folder] = e
+                raise
+            self._known.add(folder)
+
+    def invalidate(self, folder: str) -> None:
+        """Forgets a folder so that the next ``ensure`` checks the disk."""
+        with self._lock:
+            self._known.discard(folder)
+            self._failed.pop(folder, None)
+
+    def _create(self, folder: str) -> None:
+        """Creates a folder, walking up only for missing parents."""
+        try:
+            self.mkdir_calls += 1
+            os.mkdir(folder)
+        except FileExistsError:
+            if not os.path.isdir(folder):
+                raise
+            return
+        except FileNotFoundError:
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                raise
+            if parent not in self._known:
+                self._create(parent)
+                self._known.add(parent)
+            self.mkdir_calls += 1
+            try:
+                os.mkdir(folder)
+            except FileExistsError:
+                return
+        self.created.append(folder)
+        self.logger.info("Created destination folder: %s", folder)
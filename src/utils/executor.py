@@ -0,0 +1,330 @@
+import os
+import re
+import time
+import logging
+from array import array
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from .directory_cache import DirectoryCache
+from .journal import MoveJournal, RunState
+from .file_operations import is_same_device, rename_file, resolve_collision
+from .transfer import ProgressCallback, log_progress, transfer_path
+from .planner import MovePlan, MoveKind, PlannedMove
+from .run_control import CancellationToken, ProgressTracker
+from core.config import OrganizerConfig
+
+# Collision suffixes added by resolve_collision ("name-1", "name-1-2", ...)
+_COLLISION_SUFFIX = re.compile(r'(?:-\d+)+$')
+
+
+@dataclass
+class ExecutionStats:
+    """Aggregated result of executing a plan."""
+    files_moved: int = 0
+    folders_moved: int = 0
+    bytes_moved: int = 0
+    errors: int = 0
+    collisions: int = 0
+    mkdir_calls: int = 0
+    dir_checks_saved: int = 0
+    elapsed: float = 0.0
+    mkdir_elapsed: float = 0.0
+    cancelled: bool = False
+    run_id: Optional[str] = None  # Journal run (see utils.journal)
+    latencies: array = field(default_factory=lambda: array('d'), repr=False)  # Seconds per attempted item
+    categories: Dict[str, List[int]] = field(default_factory=dict)  # Folder name -> [files, bytes]
+
+    @property
+    def counts(self) -> Tuple[int, int]:
+        """(files_moved, folders_moved) as expected by ``log_results``."""
+        return self.files_moved, self.folders_moved
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_moved / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_moved / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def merge(self, other: "ExecutionStats") -> None:
+        """Adds the counters of another (partial) result."""
+        self.files_moved += other.files_moved
+        self.folders_moved += other.folders_moved
+        self.bytes_moved += other.bytes_moved
+        self.errors += other.errors
+        self.collisions += other.collisions
+        self.cancelled = self.cancelled or other.cancelled
+        self.latencies.extend(other.latencies)
+        for name, (files, size) in other.categories.items():
+            totals = self.categories.setdefault(name, [0, 0])
+            totals[0] += files
+            totals[1] += size
+
+
+@dataclass
+class RunContext:
+    """Per-run state shared by all moves of a run."""
+    logger: logging.Logger
+    same_device: Dict[str, bool]
+    verify: bool = False
+    progress: Optional[ProgressCallback] = None
+    directories: Optional[DirectoryCache] = None
+    token: Optional[CancellationToken] = None
+    tracker: Optional[ProgressTracker] = None
+    journal: Optional[MoveJournal] = None
+    organized_prefix: str = ''  # Organized folder with trailing separator (report categories)
+
+    @classmethod
+    def for_config(cls, config: OrganizerConfig) -> "RunContext":
+        """Creates the context for a run; checks devices once."""
+        return cls(
+            logger=config.logger,
+            same_device=detect_same_device(config),
+            verify=config.verify_copies,
+            progress=log_progress(config.logger),
+            directories=DirectoryCache(config.logger),
+            token=config.cancel_token,
+            organized_prefix=os.path.join(config.organized_folder, ''),
+        )
+
+
+def execute_move(move: PlannedMove, context: RunContext) -> Optional[str]:
+    """
+    Applies a single planned move.
+
+    Parameters
+    ----------
+    move : PlannedMove
+        Move to apply
+    context : RunContext
+        Per-run state (device check, directory cache, verification)
+
+    Returns
+    -------
+    Optional[str]
+        Final destination path (differs from the planned one after a name
+        collision), or None if the item was not moved (errors are logged)
+    """
+    logger = context.logger
+    destination_path = resolve_collision(move.destination)
+    destination_folder, new_name = os.path.split(destination_path)
+    if logger.isEnabledFor(logging.INFO):
+        name = os.path.basename(move.source)
+        if move.kind == MoveKind.FILE:
+            logger.info("Moving file: %s -> %s as %s", name, destination_folder, new_name)
+        else:
+            logger.info("Moving folder: %s -> %s", name, destination_folder)
+
+    if context.directories:
+        context.directories.ensure(destination_folder)
+    if context.same_device[move.kind]:
+        # Picks the next free name itself if the destination was taken meanwhile
+        return rename_file(move.source, destination_path, logger,
+                           context.verify, context.directories)
+    moved = transfer_path(move.source, destination_path, logger,
+                          context.verify, context.progress, context.directories)
+    return destination_path if moved else None
+
+
+def detect_same_device(config: OrganizerConfig) -> Dict[str, bool]:
+    """
+    Checks once per run which destination roots share the source device.
+
+    Returns
+    -------
+    Dict[str, bool]
+        Mapping of MoveKind to "rename is possible"
+    """
+    return {
+        MoveKind.FILE: is_same_device(config.source_folder, config.organized_folder),
+        MoveKind.FOLDER: is_same_device(config.source_folder, config.unorganized_folder),
+    }
+
+
+def group_by_destination(plan: MovePlan) -> List[List[PlannedMove]]:
+    """
+    Groups the moves of a plan by destination directory.
+
+    Moves within a group keep their plan order; groups are independent of
+    each other and may run concurrently.
+    """
+    groups: Dict[str, List[PlannedMove]] = OrderedDict()
+    for move in plan:
+        groups.setdefault(os.path.dirname(move.destination), []).append(move)
+    return list(groups.values())
+
+
+def group_by_name(plan: MovePlan, buckets: int) -> List[List[PlannedMove]]:
+    """
+    Spreads the moves of a plan over up to ``buckets`` groups by name.
+
+    For plans whose destinations are known to be distinct paths (e.g. an
+    undo, where every item goes back to its own original path) most moves
+    may run concurrently even within one directory. Only names that
+    ``resolve_collision`` could turn into each other (same folder and
+    extension, same stem without ``-N`` suffixes) share a group, so two
+    threads never race for the same free name.
+    """
+    groups: List[List[PlannedMove]] = [[] for _ in range(max(buckets, 1))]
+    for move in plan:
+        folder, name = os.path.split(move.destination)
+        stem, ext = os.path.splitext(name)
+        family = (folder, _COLLISION_SUFFIX.sub('', stem).lower(), ext.lower())
+        groups[hash(family) % len(groups)].append(move)
+    return [group for group in groups if group]
+
+
+def category_of(destination: str, organized_prefix: str) -> str:
+    """
+    Returns the category folder of a destination path for the run report.
+
+    That is the first folder below the organized folder; naming templates
+    with ``/`` may add subfolders (year, month) below it. Destinations
+    outside the organized folder count under their parent folder's name.
+    """
+    if organized_prefix and destination.startswith(organized_prefix):
+        return destination[len(organized_prefix):].split(os.sep, 1)[0]
+    return os.path.basename(os.path.dirname(destination))
+
+
+def _execute_group(moves: List[PlannedMove], context: RunContext) -> ExecutionStats:
+    """Applies the moves of one destination directory in order."""
+    logger = context.logger
+    stats = ExecutionStats()
+    for move in moves:
+        if context.token and not context.token.checkpoint():
+            stats.cancelled = True
+            break
+        started = time.perf_counter()
+        try:
+            destination_path = execute_move(move, context)
+        except Exception as e:
+            logger.error("Error processing %s %s: %s", move.kind, move.source, e)
+            destination_path = None
+        stats.latencies.append(time.perf_counter() - started)
+        if context.journal:
+            context.journal.record(move, destination_path)
+
+        if context.tracker:
+            context.tracker.update(move.source, move.kind == MoveKind.FILE, move.size,
+                                   destination_path is not None)
+        if destination_path is None:
+            stats.errors += 1
+            continue
+        if destination_path != move.destination:
+            stats.collisions += 1
+        if move.kind == MoveKind.FILE:
+            stats.files_moved += 1
+            stats.bytes_moved += move.size
+            totals = stats.categories.setdefault(category_of(move.destination, context.organized_prefix), [0, 0])
+            totals[0] += 1
+            totals[1] += move.size
+        else:
+            stats.folders_moved += 1
+    return stats
+
+
+def execute_plan(plan: MovePlan, config: OrganizerConfig, journal: Optional[MoveJournal] = None,
+                 grouping: Optional[Callable[[MovePlan], List[List[PlannedMove]]]] = None) -> ExecutionStats:
+    """
+    Applies all moves of a plan.
+
+    Moves are grouped by destination directory. With ``config.workers``
+    greater than one the groups run on a thread pool, which keeps
+    latency-bound targets (network shares) busy; moves into the same
+    directory always run in plan order on one thread.
+
+    Whether source and destination roots share a device is checked once;
+    if they do, every move is a single ``os.rename``, otherwise items are
+    copied with ``utils.transfer`` (zero-copy where the OS supports it) and
+    the source is deleted afterwards. Existing destinations are never
+    overwritten (see ``resolve_collision``).
+
+    Parameters
+    ----------
+    plan : MovePlan
+        Plan built by ``utils.planner.build_plan``
+    config : OrganizerConfig
+        Configuration object
+    journal : Optional[MoveJournal]
+        Journal to record the moves in; by default (``config.journal``) a
+        new run is journaled, see ``utils.journal``
+    grouping : Optional[Callable]
+        Splits the plan into groups that may run concurrently (default:
+        ``group_by_destination``)
+
+    ``config.cancel_token`` is checked before every move and
+    ``config.on_progress`` receives throttled progress reports.
+
+    Returns
+    -------
+    ExecutionStats
+        Aggregated counters; failed items are logged and counted, never raised
+    """
+    stats = ExecutionStats()
+    if config.cancel_token and config.cancel_token.cancelled:
+        stats.cancelled = True
+        return stats
+
+    start = time.perf_counter()
+    groups = (grouping or group_by_destination)(plan)
+    context = RunContext.for_config(config)
+    if journal is None and config.journal and plan:
+        # Written before anything is touched, so a crash leaves a complete record
+        journal = MoveJournal.start(config, plan)
+    context.journal = journal
+    if config.on_progress:
+        context.tracker = ProgressTracker(config.on_progress, len(plan), plan.total_bytes)
+
+    try:
+        # Create every destination folder of the plan in one batch; a folder that
+        # cannot be created only fails the moves into it
+        context.directories.prepare(os.path.dirname(move.destination) for move in plan)
+        if journal:
+            journal.add_dirs(context.directories.created)
+        stats.mkdir_elapsed = time.perf_counter() - start
+
+        if config.workers <= 1 or len(groups) <= 1:
+            for group in groups:
+                stats.merge(_execute_group(group, context))
+        else:
+            # Start with the largest groups so they do not end up as the tail
+            groups.sort(key=len, reverse=True)
+            workers = min(config.workers, len(groups))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mover') as pool:
+                running = {pool.submit(_execute_group, group, context) for group in groups}
+                while running:
+                    # Mover threads only buffer journal entries; this thread commits them
+                    done, running = wait(running, timeout=journal.interval if journal else None,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stats.merge(future.result())
+                    if journal:
+                        journal.flush_due()
+    except BaseException:
+        if journal:
+            journal.finish(RunState.INTERRUPTED, context.directories.created)
+        raise
+    if journal:
+        journal.finish(RunState.CANCELLED if stats.cancelled else RunState.DONE, context.directories.created)
+        config.logger.info("Run journaled as %s", journal.run_id)
+        stats.run_id = journal.run_id
+
+    if context.tracker:
+        context.tracker.finish()
+    if stats.cancelled:
+        config.logger.info("Run cancelled; remaining items were left in place")
+
+    stats.elapsed = time.perf_counter() - start
+    stats.mkdir_calls = context.directories.mkdir_calls
+    stats.dir_checks_saved = context.directories.checks_saved
+    config.logger.info(
+        f"Destination folders: {stats.mkdir_calls} mkdir calls, "
+        f"{stats.dir_checks_saved} existence checks saved")
+    config.logger.info(
+        f"Throughput: {stats.files_per_second:.1f} files/s, "
+        f"{stats.mb_per_second:.2f} MB/s ({stats.elapsed:.2f}s)")
+    return stats
@@ -1,17 +1,109 @@
 import os
+import errno
 import shutil
 import logging
 from typing import Optional
+from .directory_cache import DirectoryCache
+from .transfer import rename_noreplace, transfer_path
+
+
+def rename_file(source_path: str, destination_path: str, logger: logging.Logger,
+                verify: bool = False, directories: Optional[DirectoryCache] = None) -> Optional[str]:
+    """
+    Moves a file or folder with a single rename (same device only).
+
+    The destination folder is expected to exist (see ``DirectoryCache``);
+    it is only checked and created when the rename reports ENOENT. An
+    existing destination is never replaced (see ``rename_noreplace``): if
+    the name was taken since it was chosen, the next free name from
+    ``resolve_collision`` is used. If the rename crosses a device boundary
+    after all (e.g. a mount point below the destination root) it falls back
+    to the cross-device ``transfer_path``.
+
+    Returns
+    -------
+    Optional[str]
+        Final destination path, or None if the item was not moved (errors
+        are logged)
+    """
+    folder_created = False
+    try:
+        while True:
+            try:
+                rename_noreplace(source_path, destination_path)
+                return destination_path
+            except FileExistsError:
+                destination_path = resolve_collision(destination_path)
+            except FileNotFoundError:
+                if folder_created or not os.path.lexists(source_path):
+                    raise
+                destination_folder = os.path.dirname(destination_path)
+                if directories:
+                    directories.invalidate(destination_folder)
+                    directories.ensure(destination_folder)
+                else:
+                    os.makedirs(destination_folder, exist_ok=True)
+                    logger.info("Created destination folder: %s", destination_folder)
+                folder_created = True
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            # The kernel reports EXDEV before EEXIST; transfer_path never replaces
+            destination_path = resolve_collision(destination_path)
+            if transfer_path(source_path, destination_path, logger, verify, directories=directories):
+                return destination_path
+            return None
+        logger.error("Error moving file %s: %s", source_path, e)
+        return None
+
+
+def resolve_collision(destination_path: str) -> str:
+    """
+    Returns a destination path that does not exist yet.
+
+    Existing files or folders are never overwritten; instead a counter is
+    appended to the name (``name-1.ext``, ``name-2.ext``, ...).
+    """
+    if not os.path.lexists(destination_path):
+        return destination_path
+
+    folder, name = os.path.split(destination_path)
+    stem, ext = os.path.splitext(name)
+    counter = 1
+    while True:
+        candidate = os.path.join(folder, f"{stem}-{counter}{ext}")
+        if not os.path.lexists(candidate):
+            return candidate
+        counter += 1
+
+
+def is_same_device(source_folder: str, destination_folder: str) -> bool:
+    """
+    Checks whether two folders live on the same device.
+
+    The destination may not exist yet, so its nearest existing parent is
+    used instead.
+    """
+    try:
+        path = os.path.abspath(destination_folder)
+        while not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+        return os.stat(source_folder).st_dev == os.stat(path).st_dev
+    except OSError:
+        return False
+
 
 def move_file(source_path: str, destination_path: str, logger: logging.Logger) -> bool:
     """Moves a single file to destination."""
     try:
         if not os.path.exists(os.path.dirname(destination_path)):
-            os.makedirs(os.path.dirname(destination_path))
-            logger.info(f"Created destination folder: {os.path.dirname(destination_path)}")
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            logger.info("Created destination folder: %s", os.path.dirname(destination_path))
         
         shutil.move(source_path, destination_path)
         return True
     except Exception as e:
-        logger.error(f"Error moving file {source_path}: {str(e)}")
+        logger.error("Error moving file %s: %s", source_path, e)
         return False
\ No newline at end of file
@@ -1,3 +1,7 @@
+import hashlib
+import json
+from typing import Dict, List
+from core.config_cache import ConfigCache
 from core.database import DatabaseManager
 
 # Define default file types
@@ -32,17 +36,35 @@ FILE_TYPES = {
     'bin-files': ['.bin'],
 }
 
+# Folder priority for extensions listed in several folders (e.g. '.iso' in
+# 'archives' and 'disk-images'): earlier folders win. Folders that are not
+# listed (e.g. created in the File Type Manager) follow alphabetically.
+CATEGORY_PRIORITY = tuple(FILE_TYPES)
+
+def rules_fingerprint(file_types: Dict[str, List[str]]) -> str:
+    """Stable hash of a file_types mapping (independent of dict/list order)."""
+    normalized = {folder: sorted(ext.lower() for ext in extensions)
+                  for folder, extensions in file_types.items()}
+    payload = json.dumps([normalized, CATEGORY_PRIORITY], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+_database_ready = False
+
+
 def get_file_types():
     """Get file types from database or default if database access fails."""
+    global _database_ready
     try:
-        db_manager = DatabaseManager()
-        db_manager.initialize_database()
+        if not _database_ready:
+            db_manager = DatabaseManager()
+            db_manager.initialize_database()
 
-        # Populate default file types if database is empty
-        db_manager.populate_default_file_types(FILE_TYPES)
+            # Populate default file types if database is empty
+            db_manager.populate_default_file_types(FILE_TYPES)
+            _database_ready = True
 
-        # Return file types from database
-        return db_manager.get_file_types()
+        # Served from memory until the tables change
+        return ConfigCache.get_file_types()
     except Exception as e:
         # Fallback to default file types
         return FILE_TYPES
@@ -1,12 +1,17 @@
 import os
 import shutil
 import logging
+import contextlib
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
-from .file_operations import move_file
-from .date_utils import get_file_date, format_date_prefix
-from .path_utils import get_destination_folder
-from .filename_utils import FilenameProcessor
+from typing import Dict, Iterable, List, Tuple, Optional
+from .executor import ExecutionStats, RunContext, execute_move, execute_plan
+from .journal import MoveJournal, load_checkpoint, recover_interrupted_runs
+from .planner import MovePlan, build_plan, plan_file, plan_folder, should_skip_item
+from .scan_index import ScanIndex
+from .path_utils import get_extension_index
+from .profiling import RunProfiler
+from .run_report import PhaseTimer, RunReport
+from .scanner import ScanEntry, scan_directory, split_stable
 from core.config import OrganizerConfig
 
 
@@ -59,72 +64,221 @@ def is_valid_date_prefix(filename: str) -> Tuple[bool, Optional[datetime]]:
         return False, None
 
 
-def organize_files_by_type(config: OrganizerConfig) -> None:
-    """Main organization function with high-level logic."""
+def organize_files_by_type(config: OrganizerConfig) -> Optional[RunReport]:
+    """
+    Main organization function with high-level logic.
+
+    The run report is also written as JSON to ``config.report_output`` (a
+    timestamped file in ``logs/reports`` by default). With ``config.profile``
+    the run is wrapped in a ``RunProfiler``; its ``.pstats`` file and text
+    summary are written to ``logs/`` and listed in ``report.profile``.
+
+    With ``config.journal`` runs that were interrupted (crash, kill) are
+    recovered first according to ``config.journal_recovery``; see
+    ``utils.journal``.
+
+    Returns
+    -------
+    Optional[RunReport]
+        Report of the run (None for a dry run)
+    """
     if not os.path.exists(config.source_folder):
         raise SourceFolderNotFoundError(
             f"Source folder not found: {config.source_folder}")
 
     try:
-        results = process_directory(config)
-        log_results(config.logger, results)
+        recovered = recover(config) if config.journal and not config.dry_run else []
+        profiler = RunProfiler() if config.profile else None
+        with profiler or contextlib.nullcontext():
+            if config.dry_run:
+                plan = build_plan(config)
+            else:
+                report = run_directory(config)
+        profile = write_profile(profiler, config.logger) if profiler else {}
+
+        if config.dry_run:
+            export_plan(plan, config)
+            return None
+
+        report.profile = profile
+        report.recovered = recovered
+        log_results(config.logger, report.counts)
+        try:
+            path = report.write_json(config.report_output)
+            config.logger.info("Run report written to %s", path)
+        except OSError as e:
+            config.logger.error(f"Error writing run report: {e}")
+        return report
     except Exception as e:
         config.logger.error(f"Error during organization: {e}")
         raise FileOrganizerError(f"File organization failed: {e}")
 
 
-def process_directory(config: OrganizerConfig) -> Tuple[int, int]:
-    """Processes all files in directory."""
-    files_moved = 0
-    folders_moved = 0
+def recover(config: OrganizerConfig) -> List[Dict]:
+    """Recovers interrupted runs before a new one starts (errors are logged)."""
+    try:
+        return recover_interrupted_runs(config)
+    except Exception as e:
+        config.logger.error(f"Error recovering interrupted runs: {e}")
+        return []
 
-    for item_name in os.listdir(config.source_folder):
-        if should_skip_item(item_name, config):
-            continue
 
-        item_path = os.path.join(config.source_folder, item_name)
+def write_profile(profiler: RunProfiler, logger: logging.Logger) -> Dict:
+    """Writes the profile of a run to ``logs/``; returns its summary (empty on error)."""
+    try:
+        paths = profiler.write()
+    except OSError as e:
+        logger.error(f"Error writing run profile: {e}")
+        return {}
+    logger.info("Run profile written to %s", paths[1])
+    return profiler.to_dict(paths)
 
-        if os.path.isfile(item_path):
-            files_moved += process_file(item_path, item_name, config)
-        elif os.path.isdir(item_path):
-            folders_moved += process_folder(item_path, item_name, config)
 
-    return files_moved, folders_moved
+def process_directory(config: OrganizerConfig) -> Tuple[int, int]:
+    """Processes all files in directory (plan first, then execute)."""
+    return run_directory(config).counts
+
 
+def run_directory(config: OrganizerConfig) -> RunReport:
+    """
+    Like ``process_directory`` but returns the full run report.
 
-def process_file(item_path: str, item_name: str, config: OrganizerConfig) -> int:
-    """Process a single file."""
+    With ``config.resume`` an unfinished run with the same rules and folders
+    (see ``utils.journal.load_checkpoint``) is continued from its journal
+    instead of scanning the source folder; new items are picked up by the
+    next run.
+    """
+    started_at = datetime.now()
+    timer = PhaseTimer()
+    checkpoint = resume_checkpoint(config) if config.journal and config.resume else None
+    if checkpoint:
+        plan, journal = checkpoint
+        timer.lap('resume')
+        stats = execute_plan(plan, config, journal=journal)
+        timer.lap('execute')
+        report = RunReport.from_run(config.source_folder, started_at, split_execute(timer, stats), stats, {})
+        report.resumed = True
+        return report
+
+    entries = scan_directory(config.source_folder)
+    scan_index = ScanIndex.open(config) if config.incremental else None
+    if scan_index:
+        entries = scan_index.filter(entries)
+    entries = list(entries)
+    timer.lap('scan')
+
+    entries, deferred = hold_back_unstable(entries, config)
+    if config.stability_interval > 0:
+        timer.lap('settle')
+    plan = build_plan(config, entries)
+
+    if scan_index:
+        scan_index.save(plan)
+        config.logger.info(f"Incremental scan: {scan_index.skipped} unchanged entries skipped")
+    timer.lap('plan')
+
+    stats = execute_plan(plan, config)
+    timer.lap('execute')
+    phases = split_execute(timer, stats)
+
+    skipped = {
+        'unmatched': len(plan.unmatched),
+        'unchanged': scan_index.skipped if scan_index else 0,
+        'deferred': len(deferred),
+    }
+    return RunReport.from_run(config.source_folder, started_at, phases, stats, skipped)
+
+
+def resume_checkpoint(config: OrganizerConfig) -> Optional[Tuple[MovePlan, MoveJournal]]:
+    """Loads the checkpoint of an unfinished run (errors are logged, None then)."""
     try:
-        # Get file date
-        file_date = get_file_date(item_path, config.use_creation_date)
+        return load_checkpoint(config)
+    except Exception as e:
+        config.logger.error(f"Error loading run checkpoint: {e}")
+        return None
+
+
+def split_execute(timer: PhaseTimer, stats: ExecutionStats) -> Dict[str, float]:
+    """Returns the phases of ``timer`` with 'execute' split into 'mkdir' and 'move'."""
+    phases = timer.phases
+    execute = phases.pop('execute')
+    phases['mkdir'] = stats.mkdir_elapsed
+    phases['move'] = max(execute - stats.mkdir_elapsed, 0.0)
+    phases['total'] = timer.total
+    return phases
+
+
+def hold_back_unstable(entries: Iterable[ScanEntry],
+                       config: OrganizerConfig) -> Tuple[List[ScanEntry], List[ScanEntry]]:
+    """
+    Holds back entries that are still being written.
 
-        # Check if filename already has a valid date prefix
-        has_valid_date, existing_date = FilenameProcessor.parse_date_prefix(
-            item_name)
+    Only entries that would be moved (folders and files with a matching
+    extension) are checked, with one shared ``config.stability_interval``
+    wait for the whole batch.
 
-        if has_valid_date and not config.force_date:
-            # Keep original name if date is valid and force_date is False
-            new_filename = item_name
+    Returns
+    -------
+    Tuple[List[ScanEntry], List[ScanEntry]]
+        (entries to plan, entries deferred to the next run or batch)
+    """
+    if config.stability_interval <= 0:
+        return list(entries), []
+
+    index = get_extension_index(config.file_types)
+    candidates, others = [], []
+    for entry in entries:
+        if entry.is_dir or (entry.is_file and index.match(entry.name)[0]):
+            candidates.append(entry)
         else:
-            # Create new filename with date prefix
-            new_filename = FilenameProcessor.create_dated_filename(
-                item_name, file_date)
+            others.append(entry)
 
-        # Get file extension and determine destination
-        file_extension = os.path.splitext(item_name)[1].lower()
-        destination_folder = get_destination_folder(
-            file_extension, config.organized_folder, config.file_types)
+    stable, changing = split_stable(candidates, config.stability_interval)
+    if changing:
+        config.logger.info(f"{len(changing)} items are still changing and were deferred")
+    return others + stable, changing
 
-        if destination_folder:
-            if not os.path.exists(destination_folder):
-                os.makedirs(destination_folder)
 
-            destination_path = os.path.join(destination_folder, new_filename)
-            config.logger.info(
-                f"Moving file: {item_name} -> {destination_folder} as {new_filename}")
+def process_paths(paths: List[str], config: OrganizerConfig,
+                  deferred: Optional[List[str]] = None) -> Tuple[int, int]:
+    """
+    Processes only the given items of the source folder (e.g. from watch mode).
+
+    Parameters
+    ----------
+    paths : List[str]
+        Files or folders directly inside the source folder
+    config : OrganizerConfig
+        Configuration object
+    deferred : Optional[List[str]]
+        Receives the paths that were still changing and were not moved
 
-            if move_file(item_path, destination_path, config.logger):
-                return 1  # Successfully moved
+    Returns
+    -------
+    Tuple[int, int]
+        (files_moved, folders_moved)
+    """
+    entries = []
+    for path in paths:
+        try:
+            entries.append(ScanEntry.from_path(path))
+        except OSError:
+            continue  # Removed again before the batch was processed
+
+    entries, changing = hold_back_unstable(entries, config)
+    if deferred is not None:
+        deferred.extend(entry.path for entry in changing)
+    plan = build_plan(config, entries)
+    return execute_plan(plan, config).counts
+
+
+def process_file(item_path: str, item_name: str, config: OrganizerConfig,
+                 entry: Optional[ScanEntry] = None) -> int:
+    """Process a single file (reuses the stat data of ``entry`` if given)."""
+    try:
+        move = plan_file(entry or ScanEntry.from_path(item_path), config)
+        if move and execute_move(move, RunContext.for_config(config)):
+            return 1  # Successfully moved
 
         return 0  # Not moved (no matching destination folder)
 
@@ -133,25 +287,12 @@ def process_file(item_path: str, item_name: str, config: OrganizerConfig) -> int
         return 0  # Error case
 
 
-def process_folder(item_path: str, item_name: str, config: OrganizerConfig) -> int:
-    """Process a single folder."""
+def process_folder(item_path: str, item_name: str, config: OrganizerConfig,
+                   entry: Optional[ScanEntry] = None) -> int:
+    """Process a single folder (reuses the stat data of ``entry`` if given)."""
     try:
-        if config.date_folders:
-            # Get folder date and create new name with date prefix
-            folder_date = get_file_date(item_path, config.use_creation_date)
-            new_foldername = FilenameProcessor.create_dated_filename(
-                item_name, folder_date)
-            destination_path = os.path.join(
-                config.unorganized_folder, new_foldername)
-        else:
-            # Use original folder name
-            destination_path = os.path.join(
-                config.unorganized_folder, item_name)
-
-        config.logger.info(
-            f"Moving folder: {item_name} -> {config.unorganized_folder}")
-
-        if move_file(item_path, destination_path, config.logger):
+        move = plan_folder(entry or ScanEntry.from_path(item_path), config)
+        if execute_move(move, RunContext.for_config(config)):
             return 1  # Successfully moved
         return 0  # Not moved
 
@@ -160,27 +301,23 @@ def process_folder(item_path: str, item_name: str, config: OrganizerConfig) -> i
         return 0  # Error case
 
 
-def should_skip_item(item_name: str, config: OrganizerConfig) -> bool:
+def export_plan(plan: MovePlan, config: OrganizerConfig) -> None:
     """
-    Determines if an item should be skipped during processing.
+    Outputs a plan without touching the disk (dry-run).
 
     Parameters
     ----------
-    item_name : str
-        Name of the file or folder to check
+    plan : MovePlan
+        Plan to output
     config : OrganizerConfig
-        Configuration object containing paths
-
-    Returns
-    -------
-    bool
-        True if item should be skipped, False otherwise
+        Configuration object; ``plan_output`` selects the JSON file,
+        otherwise the plan is printed to stdout
     """
-    # Skip the organized and unorganized folders
-    organized_base = os.path.basename(config.organized_folder)
-    unorganized_base = os.path.basename(config.unorganized_folder)
-
-    return item_name in [organized_base, unorganized_base]
+    if config.plan_output:
+        plan.write_json(config.plan_output)
+        config.logger.info(f"Dry run: plan with {len(plan)} moves written to {config.plan_output}")
+    else:
+        print(plan.to_json())
 
 
 def log_results(logger: logging.Logger, results: Tuple[int, int]) -> None:
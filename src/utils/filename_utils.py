@@ -1,85 +1,222 @@
+import os
 import re
+import string
 from datetime import datetime
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple
+from core.constants import NAMING_TEMPLATE
+
+# Precompiled sanitizing patterns
+_INVALID_CHARS = re.compile(r'[<>:"/\\|?*]')
+_HYPHEN_RUNS = re.compile(r'-{2,}')
+# strftime directives that only depend on the day (such formats are memoized per day)
+_DIRECTIVE = re.compile(r'%[-#]?(.)')
+_DAY_DIRECTIVES = frozenset('aAbBCdDeFgGhjmuUVwWxyY%')
+
+
+class NamingTemplateError(ValueError):
+    """Raised for invalid naming templates."""
+    pass
+
+
+@lru_cache(maxsize=4096)
+def _format_day(fmt: str, ordinal: int) -> str:
+    return datetime.fromordinal(ordinal).strftime(fmt)
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(prefix: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(prefix, FilenameProcessor.DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def _date_formatter(fmt: str) -> Callable[[datetime], str]:
+    """Returns a formatter for ``fmt``; day-only formats are memoized per day."""
+    if all(d in _DAY_DIRECTIVES for d in _DIRECTIVE.findall(fmt)):
+        return lambda date: _format_day(fmt, date.toordinal())
+    return lambda date: date.strftime(fmt)
+
+
+class NamingTemplate:
+    """
+    File naming template, compiled once into a list of literal and field parts.
+
+    Fields:
+
+    - ``{date:FORMAT}``: file date formatted with strftime (default ``%Y-%m-%d``)
+    - ``{name}``: sanitized name without an existing date prefix
+    - ``{stem}`` / ``{ext}``: ``{name}`` split into stem and extension
+
+    ``/`` in the template creates subfolders below the category folder,
+    e.g. ``{date:%Y}/{date:%m}/{name}``. Use ``NamingTemplate.compile`` to
+    share compiled templates.
+    """
+
+    FIELDS = ('date', 'name', 'stem', 'ext')
+
+    def __init__(self, template: str):
+        self.template = template
+        # (literal, date formatter, field, format spec) per part
+        self._parts: List[Tuple[str, Optional[Callable[[datetime], str]], Optional[str], str]] = []
+        try:
+            parsed = list(string.Formatter().parse(template))
+        except ValueError as e:
+            raise NamingTemplateError(f"Invalid naming template '{template}': {e}")
+
+        for literal, field, spec, conversion in parsed:
+            if field is None:
+                self._parts.append((literal, None, None, ''))
+                continue
+            if field not in self.FIELDS or conversion:
+                raise NamingTemplateError(
+                    f"Invalid field '{{{field}}}' in naming template '{template}' "
+                    f"(allowed: {', '.join(self.FIELDS)})")
+            if field == 'date':
+                self._parts.append((literal, _date_formatter(spec or '%Y-%m-%d'), None, ''))
+            else:
+                self._parts.append((literal, None, field, spec))
+
+        fields = {field for _, _, field, _ in self._parts}
+        self._split = bool(fields & {'stem', 'ext'})
+        if not fields & {'name', 'stem'}:
+            raise NamingTemplateError(f"Naming template '{template}' needs {{name}} or {{stem}}")
+        segments = re.split(r'[/\\]', template)
+        if template.startswith(('/', '\\')) or '..' in segments or '' in segments:
+            raise NamingTemplateError(f"Naming template '{template}' must be a relative path")
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def compile(template: str) -> "NamingTemplate":
+        """Returns the compiled template (cached)."""
+        return NamingTemplate(template)
+
+    def render(self, filename: str, date: datetime) -> str:
+        """
+        Builds the new name of a file.
+
+        Parameters
+        ----------
+        filename : str
+            Original filename (sanitized before it is inserted)
+        date : datetime
+            File date
+
+        Returns
+        -------
+        str
+            New relative path (a plain filename unless the template has ``/``)
+        """
+        name = FilenameProcessor.sanitize_filename(filename)
+        if name[:4].isdigit() and FilenameProcessor.parse_date_prefix(name)[0]:
+            name = name[11:]
+        values = {'name': name}
+        if self._split:
+            values['stem'], values['ext'] = os.path.splitext(name)
+
+        result = []
+        for literal, date_format, field, spec in self._parts:
+            result.append(literal)
+            if date_format is not None:
+                result.append(date_format(date))
+            elif field is not None:
+                result.append(format(values[field], spec) if spec else values[field])
+        return ''.join(result)
+
+    def render_many(self, items: Iterable[Tuple[str, datetime]]) -> List[str]:
+        """``render`` for a batch of (filename, date) pairs."""
+        render = self.render
+        return [render(filename, date) for filename, date in items]
+
 
 class FilenameProcessor:
     """Handles all filename-related operations following best practices."""
-    
+
     DATE_FORMAT = "%Y-%m-%d"
     DATE_SEPARATOR = "-"
     INVALID_CHARS_PATTERN = r'[<>:"/\\|?*]'
-    
+
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """
         Sanitizes a filename by removing/replacing invalid characters.
-        
+
         Parameters
         ----------
         filename : str
             Original filename
-            
+
         Returns
         -------
         str
             Sanitized filename
         """
-        # Remove invalid characters
-        clean_name = re.sub(FilenameProcessor.INVALID_CHARS_PATTERN, '', filename)
+        # Remove invalid characters (most names have none)
+        clean_name = filename
+        if _INVALID_CHARS.search(clean_name):
+            clean_name = _INVALID_CHARS.sub('', clean_name)
         # Replace spaces and underscores with hyphens
         clean_name = clean_name.replace(' ', '-').replace('_', '-')
         # Remove multiple consecutive hyphens
-        clean_name = re.sub(r'-+', '-', clean_name)
+        if '--' in clean_name:
+            clean_name = _HYPHEN_RUNS.sub('-', clean_name)
         # Remove leading/trailing hyphens
-        clean_name = clean_name.strip('-')
-        return clean_name
+        return clean_name.strip('-')
 
     @staticmethod
     def parse_date_prefix(filename: str) -> Tuple[bool, Optional[datetime]]:
         """
         Checks if filename starts with a valid date prefix.
-        
+
         Parameters
         ----------
         filename : str
             Filename to check
-            
+
         Returns
         -------
         Tuple[bool, Optional[datetime]]
             (has_valid_date, datetime_object if valid)
         """
-        try:
-            date_part = filename[:10]
-            date_obj = datetime.strptime(date_part, FilenameProcessor.DATE_FORMAT)
-            has_separator = filename[10] == FilenameProcessor.DATE_SEPARATOR
-            return has_separator, date_obj
-        except (ValueError, IndexError):
+        # Cheap rejection before the (slow, but memoized per day) strptime call
+        if len(filename) < 11 or not filename[:4].isdigit():
+            return False, None
+        date_obj = _parse_day(filename[:10])
+        if date_obj is None:
             return False, None
+        return filename[10] == FilenameProcessor.DATE_SEPARATOR, date_obj
 
     @staticmethod
-    def create_dated_filename(original_filename: str, file_date: datetime) -> str:
+    def create_dated_filename(original_filename: str, file_date: datetime,
+                              template: str = NAMING_TEMPLATE) -> str:
         """
         Creates a filename with date prefix.
-        
+
         Parameters
         ----------
         original_filename : str
             Original filename
         file_date : datetime
             Date to use as prefix
-            
+        template : str
+            Naming template (see ``NamingTemplate``); the default gives
+            ``YYYY-MM-DD-name``
+
         Returns
         -------
         str
             New filename with date prefix
         """
-        date_prefix = file_date.strftime(f"{FilenameProcessor.DATE_FORMAT}-")
-        clean_name = FilenameProcessor.sanitize_filename(original_filename)
-        
-        # Remove existing date prefix if present
-        has_date, _ = FilenameProcessor.parse_date_prefix(clean_name)
-        if has_date:
-            clean_name = clean_name[11:]
-            
-        return f"{date_prefix}{clean_name}"
\ No newline at end of file
+        return NamingTemplate.compile(template).render(original_filename, file_date)
+
+    @staticmethod
+    def create_dated_filenames(items: Iterable[Tuple[str, datetime]],
+                               template: str = NAMING_TEMPLATE) -> List[str]:
+        """
+        ``create_dated_filename`` for a batch of (filename, date) pairs.
+
+        The template is compiled once and date prefixes are formatted once
+        per day, so large batches mostly cost the sanitizing.
+        """
+        return NamingTemplate.compile(template).render_many(items)
@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from .scanner import ScanEntry
+from core.config import OrganizerConfig
+from core.database import DatabaseManager
+
+HashKey = Tuple[int, int, int, int]
+
+# Cached digests not seen for this long are re-checked (and dropped if the file is gone)
+HASH_CACHE_MAX_AGE = 7 * 86400
+
+
+class HashCache:
+    """
+    Run-scoped view of the ``hash_cache`` table.
+
+    Digests are keyed by (dev, inode, size, mtime_ns), so a cached digest
+    is only used while the file is unchanged. ``prefetch`` loads the rows
+    for a batch of candidates, ``get``/``put`` work in memory (safe from
+    hashing threads) and ``save`` writes everything in one transaction at
+    the end of the run. Files without an inode number are never cached.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, algorithm: str):
+        self.db_manager = db_manager
+        self.algorithm = algorithm
+        self._known: Dict[HashKey, Tuple[Optional[str], Optional[str]]] = {}
+        self._seen: Dict[HashKey, str] = {}
+        self._new: Dict[HashKey, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    @classmethod
+    def open(cls, config: OrganizerConfig, algorithm: str) -> "HashCache":
+        """Opens the cache in the database of ``config``."""
+        db_manager = DatabaseManager(config.db_path)
+        db_manager.initialize_database()
+        return cls(db_manager, algorithm)
+
+    @staticmethod
+    def key(entry: ScanEntry) -> HashKey:
+        return entry.dev, entry.ino, entry.size, entry.mtime_ns
+
+    def prefetch(self, entries: Iterable[ScanEntry]) -> None:
+        """Loads the cached digests of ``entries`` with batched lookups."""
+        keys = [self.key(entry) for entry in entries if entry.ino]
+        missing = [key for key in keys if key not in self._known]
+        self._known.update(self.db_manager.get_hashes(self.algorithm, missing))
+
+    def get(self, entry: ScanEntry, kind: str) -> Optional[str]:
+        """
+        Returns the cached 'partial' or 'full' digest of ``entry`` (None if unknown).
+
+        Only prefetched entries are found; there is no database query per file.
+        """
+        if not entry.ino:
+            return None
+        key = self.key(entry)
+        with self._lock:
+            new = self._new.get(key)
+            if new and kind in new:
+                return new[kind]
+            cached = self._known.get(key)
+            digest = cached and cached[0 if kind == 'partial' else 1]
+            if digest:
+                self._seen[key] = entry.path
+                self.hits += 1
+            return digest
+
+    def put(self, entry: ScanEntry, kind: str, digest: str) -> None:
+        """Remembers a computed digest; written by ``save``."""
+        if entry.ino:
+            key = self.key(entry)
+            with self._lock:
+                self._new.setdefault(key, {})[kind] = digest
+                self._seen[key] = entry.path
+
+    def save(self, prune: bool = True) -> None:
+        """
+        Writes new digests and marks used ones as seen (one transaction).
+
+        With ``prune`` rows not seen for ``HASH_CACHE_MAX_AGE`` are checked
+        and dropped if their file no longer exists or changed.
+        """
+        now = int(time.time())
+        with self._lock:
+            rows = [(*key, path, self._new.get(key, {}).get('partial'), self._new.get(key, {}).get('full'))
+                    for key, path in self._seen.items()]
+            self._new.clear()
+            self._seen.clear()
+        if rows:
+            self.db_manager.store_hashes(self.algorithm, rows, now)
+        if prune:
+            self.db_manager.prune_hash_cache(now - HASH_CACHE_MAX_AGE, now)
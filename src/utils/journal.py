@@ -0,0 +1,371 @@
+import os
+import json
+import socket
+import hashlib
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from .file_types import rules_fingerprint
+from .planner import MoveKind, MovePlan, PlannedMove
+from core.config import OrganizerConfig
+from core.database import DatabaseManager
+
+# Buffered state changes are committed after this many moves ...
+JOURNAL_BATCH = 500
+# ... or after this many seconds, whichever comes first
+JOURNAL_INTERVAL = 0.25
+
+
+class RunState:
+    """States of a journaled run."""
+    RUNNING = 'running'
+    DONE = 'done'
+    CANCELLED = 'cancelled'
+    INTERRUPTED = 'interrupted'  # Stopped by an exception; recovered on the next start
+    RECOVERED = 'recovered'  # Interrupted run rolled forward
+    ROLLED_BACK = 'rolled_back'  # Interrupted run rolled back
+    UNDONE = 'undone'  # Reversed with utils.undo
+    STALE = 'stale'  # Interrupted, but the rules or folders changed since; not resumed
+
+
+class MoveState:
+    """States of a journaled move."""
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+    REVERTED = 'reverted'
+
+
+class RecoveryMode:
+    """What to do with runs that were interrupted (``OrganizerConfig.journal_recovery``)."""
+    FORWARD = 'forward'  # Finish the pending moves
+    BACK = 'back'  # Move completed items back to their source
+    ALL = (FORWARD, BACK)
+
+
+def plan_fingerprint(config: OrganizerConfig) -> str:
+    """
+    Hash of everything a plan depends on: rules, folders and naming options.
+
+    A journaled plan is only resumed while the fingerprint is unchanged.
+    """
+    payload = json.dumps([
+        rules_fingerprint(config.file_types),
+        config.source_folder, config.organized_folder, config.unorganized_folder,
+        config.naming_template, config.use_creation_date, config.force_date, config.date_folders,
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def new_run_id() -> str:
+    """Returns a sortable, readable run id (timestamp plus random suffix)."""
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+class MoveJournal:
+    """
+    Write-ahead journal of the moves of one run.
+
+    ``start`` records every planned move as 'pending' in one transaction
+    before the first item is touched. ``record`` is called from the mover
+    threads after each move and only buffers the outcome. The thread that
+    created the journal (the one running ``execute_plan``) commits the
+    buffer with ``flush_due`` in batches of ``batch_size`` or every
+    ``interval`` seconds, so the journal costs a few transactions per run
+    instead of one per file, and mover threads never open a database
+    connection of their own. If the process dies, at most the last batch is
+    missing; ``recover_interrupted_runs`` reconciles it with the disk.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, run_id: str, seqs: Dict[str, int],
+                 batch_size: int = JOURNAL_BATCH, interval: float = JOURNAL_INTERVAL):
+        self.db_manager = db_manager
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.interval = interval
+        self._seq = seqs  # Source path -> position in the journaled plan
+        self._dirs = 0
+        self._pending: List[Tuple[str, Optional[str], int]] = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._owner = threading.get_ident()
+
+    @classmethod
+    def start(cls, config: OrganizerConfig, plan: MovePlan, undo_of: Optional[str] = None,
+              **kwargs) -> "MoveJournal":
+        """
+        Opens the journal in the database of ``config`` and records ``plan``.
+
+        ``undo_of`` is the run that this run reverses (see ``utils.undo``).
+        """
+        db_manager = DatabaseManager(config.db_path)
+        db_manager.initialize_database()
+        journal = cls(db_manager, new_run_id(), {move.source: seq for seq, move in enumerate(plan)}, **kwargs)
+        run = {
+            'run_id': journal.run_id,
+            'state': RunState.RUNNING,
+            'started_at': datetime.now().isoformat(timespec='milliseconds'),
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'source_folder': config.source_folder,
+            'organized_folder': config.organized_folder,
+            'unorganized_folder': config.unorganized_folder,
+            'fingerprint': plan_fingerprint(config),
+            'undo_of': undo_of,
+        }
+        db_manager.start_journal_run(run, (
+            (seq, move.kind, move.source, move.destination, move.size)
+            for seq, move in enumerate(plan)))
+        return journal
+
+    @classmethod
+    def resume(cls, db_manager: DatabaseManager, run_id: str, moves: Iterable[Dict], **kwargs) -> "MoveJournal":
+        """Reopens the journal of an existing run for the given journaled moves."""
+        return cls(db_manager, run_id, {move['source']: move['seq'] for move in moves}, **kwargs)
+
+    def add_dirs(self, created_dirs: List[str]) -> None:
+        """Records the folders created so far (each folder is written once)."""
+        with self._lock:
+            new, self._dirs = created_dirs[self._dirs:], len(created_dirs)
+        if new:
+            self.db_manager.add_journal_dirs(self.run_id, new)
+
+    def record(self, move: PlannedMove, final: Optional[str]) -> None:
+        """
+        Buffers the outcome of a move (``final`` is None if it failed).
+
+        Called on the owner thread (sequential runs), a due batch is
+        committed right away; other threads leave that to ``flush_due``.
+        """
+        state = MoveState.DONE if final is not None else MoveState.FAILED
+        with self._lock:
+            self._pending.append((state, final, self._seq[move.source]))
+        if threading.get_ident() == self._owner:
+            self.flush_due()
+
+    def flush_due(self) -> None:
+        """Commits the buffer if a batch is full or the interval has passed."""
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._flushed_at >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commits all buffered state changes."""
+        with self._lock:
+            updates, self._pending = self._pending, []
+        self._flushed_at = time.monotonic()
+        if updates:
+            try:
+                self.db_manager.update_journal_moves(self.run_id, updates)
+            except sqlite3.Error:
+                pass  # Logged; recovery reconciles unrecorded moves with the disk
+
+    def finish(self, state: str, created_dirs: Iterable[str] = ()) -> None:
+        """Commits buffered changes and closes the run with ``state``."""
+        self.flush()
+        self.add_dirs(list(created_dirs))
+        finished_at = datetime.now().isoformat(timespec='milliseconds')
+        if state == RunState.INTERRUPTED:
+            finished_at = None  # Still open for recovery
+        self.db_manager.finish_journal_run(self.run_id, state, finished_at)
+
+
+def _is_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, but belongs to someone else
+    return True
+
+
+def find_interrupted_runs(db_manager: DatabaseManager) -> List[Dict]:
+    """
+    Returns runs that ended without being closed.
+
+    A run counts as interrupted if it was stopped by an exception or if it
+    is still marked as running but its process on this host is gone. Runs
+    of other hosts (shared database) are left alone.
+    """
+    host = socket.gethostname()
+    runs = []
+    for run in db_manager.get_journal_runs([RunState.RUNNING, RunState.INTERRUPTED]):
+        if run['host'] != host:
+            continue
+        if run['state'] == RunState.RUNNING and (run['pid'] == os.getpid() or _is_alive(run['pid'])):
+            continue
+        runs.append(run)
+    return runs
+
+
+def _collision_candidates(destination: str) -> Iterable[str]:
+    """Yields ``destination`` and its ``resolve_collision`` variants that exist."""
+    if not os.path.lexists(destination):
+        return
+    yield destination
+    folder, name = os.path.split(destination)
+    stem, ext = os.path.splitext(name)
+    counter = 1
+    while True:
+        candidate = os.path.join(folder, f"{stem}-{counter}{ext}")
+        if not os.path.lexists(candidate):
+            return
+        yield candidate
+        counter += 1
+
+
+def locate_moved(move: Dict) -> Optional[str]:
+    """
+    Finds where a pending move whose source is gone ended up.
+
+    The final name is only journaled after the move, so the planned
+    destination and its collision variants are checked; for files the
+    newest variant with the journaled size wins.
+    """
+    if move['final']:
+        return move['final'] if os.path.lexists(move['final']) else None
+    found = None
+    for candidate in _collision_candidates(move['destination']):
+        if move['kind'] == MoveKind.FOLDER or os.path.getsize(candidate) == move['size']:
+            found = candidate
+    return found
+
+
+def reconcile_run(db_manager: DatabaseManager, run_id: str) -> List[Dict]:
+    """
+    Brings the journal of an interrupted run in line with the disk.
+
+    Pending moves whose source is gone but whose destination exists were
+    done before the last batch was committed and are marked done. Returns
+    the moves that are still pending (source still in place).
+    """
+    updates, pending = [], []
+    for move in db_manager.get_journal_moves(run_id, [MoveState.PENDING]):
+        if os.path.lexists(move['source']):
+            pending.append(move)
+            continue
+        final = locate_moved(move)
+        updates.append((MoveState.DONE if final else MoveState.FAILED, final, move['seq']))
+    if updates:
+        db_manager.update_journal_moves(run_id, updates)
+    return pending
+
+
+def config_for_run(config: OrganizerConfig, run: Dict) -> OrganizerConfig:
+    """Returns ``config`` with the folders of a journaled run (no cancel token or progress)."""
+    return replace(config, source_folder=run['source_folder'], organized_folder=run['organized_folder'],
+                   unorganized_folder=run['unorganized_folder'], cancel_token=None, on_progress=None)
+
+
+def recover_interrupted_runs(config: OrganizerConfig) -> List[Dict]:
+    """
+    Detects interrupted runs and rolls them forward or back.
+
+    With ``config.journal_recovery`` 'back' every completed move is reversed
+    (see ``utils.undo``). With 'forward' the moves that were still pending
+    are finished, but only if the run was planned with the current rules,
+    folders and naming options (``plan_fingerprint``); otherwise the run is
+    marked stale and its pending items are planned again by the next scan.
+    With ``config.resume`` a matching run is left as a checkpoint for the
+    coming run (see ``load_checkpoint``) instead of being finished here.
+    Failures are logged; a run that cannot be recovered stays interrupted
+    and is retried on the next start.
+
+    Returns
+    -------
+    List[Dict]
+        One summary per handled run (run_id, mode, moved, errors)
+    """
+    from .executor import execute_plan
+    from .undo import reverse_run
+
+    db_manager = DatabaseManager(config.db_path)
+    db_manager.initialize_database()
+    fingerprint = plan_fingerprint(config)
+    results = []
+    for run in find_interrupted_runs(db_manager):
+        run_id = run['run_id']
+        mode, moved, errors = config.journal_recovery, 0, 0
+        try:
+            if mode == RecoveryMode.BACK:
+                reconcile_run(db_manager, run_id)
+                report = reverse_run(db_manager, run, config, RunState.ROLLED_BACK)
+                moved, errors = report.files_restored + report.folders_restored, report.errors
+            elif run['fingerprint'] != fingerprint:
+                reconcile_run(db_manager, run_id)
+                mode = RunState.STALE
+                db_manager.finish_journal_run(run_id, RunState.STALE, datetime.now().isoformat(timespec='milliseconds'))
+            elif config.resume:
+                mode = 'checkpoint'
+                if run['state'] != RunState.INTERRUPTED:
+                    db_manager.finish_journal_run(run_id, RunState.INTERRUPTED, None)
+            else:
+                pending = reconcile_run(db_manager, run_id)
+                plan = MovePlan(run['source_folder'], tuple(
+                    PlannedMove(move['source'], move['destination'], move['kind'], move['size'], 'recovered')
+                    for move in pending))
+                # Reuses the run's journal; execute_plan closes it, the state is set below
+                journal = MoveJournal.resume(db_manager, run_id, pending)
+                stats = execute_plan(plan, config_for_run(config, run), journal=journal)
+                moved, errors = stats.files_moved + stats.folders_moved, stats.errors
+                db_manager.finish_journal_run(run_id, RunState.RECOVERED,
+                                              datetime.now().isoformat(timespec='milliseconds'))
+        except Exception as e:
+            config.logger.error(f"Error recovering interrupted run {run_id}: {e}")
+            continue
+        if mode == RunState.STALE:
+            config.logger.info("Interrupted run %s was planned with other rules or folders; not resumed", run_id)
+        elif mode == 'checkpoint':
+            config.logger.info("Interrupted run %s will be resumed from its checkpoint", run_id)
+        else:
+            config.logger.info("Interrupted run %s %s: %d items moved, %d errors", run_id,
+                               'rolled back' if mode == RecoveryMode.BACK else 'rolled forward', moved, errors)
+        results.append({'run_id': run_id, 'mode': mode, 'moved': moved, 'errors': errors})
+    return results
+
+
+def load_checkpoint(config: OrganizerConfig) -> Optional[Tuple[MovePlan, MoveJournal]]:
+    """
+    Returns the rest of an unfinished run that can be resumed.
+
+    A checkpoint is the newest interrupted run or, if it is the most recent
+    run of all, a cancelled one; its plan fingerprint must match ``config``.
+    The journal is reconciled with the disk and the run is reopened, so the
+    returned plan holds only the moves whose source is still in place and
+    ``execute_plan`` continues the same journal run. Nothing is scanned or
+    planned again.
+
+    Returns
+    -------
+    Optional[Tuple[MovePlan, MoveJournal]]
+        (remaining plan, journal of the run), or None if there is nothing to resume
+    """
+    db_manager = DatabaseManager(config.db_path)
+    db_manager.initialize_database()
+    host, fingerprint = socket.gethostname(), plan_fingerprint(config)
+    runs = [run for run in db_manager.get_journal_runs() if run['host'] == host]
+    candidates = [run for run in runs if run['state'] == RunState.INTERRUPTED]
+    if runs and runs[0]['state'] == RunState.CANCELLED:
+        candidates.insert(0, runs[0])
+    for run in candidates:
+        if run['fingerprint'] != fingerprint:
+            continue
+        pending = reconcile_run(db_manager, run['run_id'])
+        if not pending:
+            if run['state'] == RunState.INTERRUPTED:
+                db_manager.finish_journal_run(run['run_id'], RunState.RECOVERED,
+                                              datetime.now().isoformat(timespec='milliseconds'))
+            continue
+        db_manager.reopen_journal_run(run['run_id'], RunState.RUNNING, os.getpid())
+        plan = MovePlan(run['source_folder'], tuple(
+            PlannedMove(move['source'], move['destination'], move['kind'], move['size'], 'resumed')
+            for move in pending))
+        config.logger.info("Resuming run %s: %d of its moves are left", run['run_id'], len(pending))
+        return plan, MoveJournal.resume(db_manager, run['run_id'], pending)
+    return None
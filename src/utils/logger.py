@@ -1,43 +1,155 @@
+import atexit
+import gzip
 import logging
+import logging.handlers
 import os
+import queue
+import shutil
 import sys
+import threading
+from typing import List, Optional
 from .log_filter import ErrorOrDebugFilter
 
 # Global debug mode for the entire application
 _debug_mode = False
 
-def configure_logging(debug_mode=False):
-    """Konfiguriert das zentrale Logging für die gesamte Anwendung."""
-    global _debug_mode
+# Rotate the log file at this size and keep this many gzip-compressed backups
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Default folder of the log file (also used for run profiles)
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logs")
+
+# Background writer of the current configuration
+_listener: Optional[logging.handlers.QueueListener] = None
+_handlers: List[logging.Handler] = []
+
+
+class CompressingRotator:
+    """
+    Rotator for ``RotatingFileHandler`` that gzips rotated files on a
+    background thread.
+
+    The rollover itself is a rename; the compression runs afterwards. Use
+    it with ``CompressingFileHandler``, which waits for the pending
+    compression before the backups are shifted, so a backup is never
+    renamed while it is still being written.
+    """
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def namer(name: str) -> str:
+        return name + '.gz'
+
+    def __call__(self, source: str, dest: str) -> None:
+        self.wait()
+        pending = dest[:-len('.gz')] if dest.endswith('.gz') else dest + '.tmp'
+        os.replace(source, pending)
+        self._thread = threading.Thread(target=self._compress, args=(pending, dest),
+                                        name='log-compress', daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @staticmethod
+    def _compress(pending: str, dest: str) -> None:
+        try:
+            with open(pending, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.remove(pending)
+        except OSError:
+            # Keep the uncompressed file rather than losing log lines
+            pass
+
+
+class CompressingFileHandler(logging.handlers.RotatingFileHandler):
+    """``RotatingFileHandler`` that keeps gzip-compressed backups (see ``CompressingRotator``)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rotator = CompressingRotator()
+        self.namer = CompressingRotator.namer
+
+    def doRollover(self) -> None:
+        # The base class shifts name.N.gz -> name.N+1.gz before it rotates
+        # the current file; the previous compression must be done by then
+        self.rotator.wait()
+        super().doRollover()
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in _handlers:
+        rotator = getattr(handler, 'rotator', None)
+        if isinstance(rotator, CompressingRotator):
+            rotator.wait()
+        handler.close()
+    _handlers.clear()
+
+
+atexit.register(_stop_listener)
+
+
+def configure_logging(debug_mode=False, log_file: Optional[str] = None):
+    """
+    Konfiguriert das zentrale Logging für die gesamte Anwendung.
+
+    Records are put on a queue and written by a ``QueueListener`` thread, so
+    the code that logs never waits for the disk. The level of the root
+    logger follows the debug mode: without debug mode ``logger.info`` and
+    ``logger.debug`` return before a record is created, so use %-style
+    arguments (``logger.info("Moved %s", name)``) on hot paths.
+    """
+    global _debug_mode, _listener
     _debug_mode = debug_mode
 
     # Create default logs folder
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logs")
-    log_file = os.path.join(log_dir, 'file_organizer.log')
-    os.makedirs(log_dir, exist_ok=True)
+    if log_file is None:
+        log_file = os.path.join(LOG_DIR, 'file_organizer.log')
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
     # Configure root logger
     root_logger = logging.getLogger()
 
-    # Remove all existing handlers
+    # Remove all existing handlers and stop the previous writer
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_listener()
+
+    # Records below ERROR are only created in debug mode
+    root_logger.setLevel(logging.DEBUG if debug_mode else logging.ERROR)
 
-    # Set log level (always DEBUG, but the filter decides)
-    root_logger.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s | %(levelname)s | %(message)s')
 
-    # Add file handler with filter
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+    # Rotating file handler with filter
+    file_handler = CompressingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    file_handler.setFormatter(formatter)
     file_handler.addFilter(ErrorOrDebugFilter(debug_mode))
-    root_logger.addHandler(file_handler)
+    _handlers.append(file_handler)
 
     # Console handler for debug mode only
     if debug_mode:
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+        console_handler.setFormatter(formatter)
         console_handler.addFilter(ErrorOrDebugFilter(debug_mode))
-        root_logger.addHandler(console_handler)
+        _handlers.append(console_handler)
+
+    # The queue handler merges message and arguments (records that passed the
+    # level check only), so arguments changed after the call are not logged;
+    # formatting with the timestamp and writing happen on the listener thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *_handlers, respect_handler_level=True)
+    _listener.start()
 
     # Info for debugging
     if debug_mode:
@@ -50,15 +162,18 @@ def update_debug_mode(debug_mode):
     global _debug_mode
     _debug_mode = debug_mode
 
-    # Update filter for all existing handlers
     root_logger = logging.getLogger()
-    for handler in root_logger.handlers:
+    root_logger.setLevel(logging.DEBUG if debug_mode else logging.ERROR)
+
+    # Update filter for all existing handlers (including those of the background writer)
+    for handler in root_logger.handlers + _handlers:
         # Remove all existing filters
         for f in handler.filters[:]:
             if isinstance(f, ErrorOrDebugFilter):
                 handler.removeFilter(f)
         # Add new filter
-        handler.addFilter(ErrorOrDebugFilter(debug_mode))
+        if not isinstance(handler, logging.handlers.QueueHandler):
+            handler.addFilter(ErrorOrDebugFilter(debug_mode))
 
     # Info for debugging
     if debug_mode:
@@ -66,6 +181,13 @@ def update_debug_mode(debug_mode):
     else:
         logging.debug("Logging aktualisiert: Nur ERROR-Level")
 
+def flush_logging():
+    """Waits until all queued records are written (e.g. before reading the log file)."""
+    if _listener is not None:
+        # Restarting the listener drains the queue without dropping handlers
+        _listener.stop()
+        _listener.start()
+
 def get_logger(name):
     """Gibt einen Logger zurück, der korrekt konfiguriert ist."""
     return logging.getLogger(name)
@@ -1,5 +1,122 @@
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+from .logger import get_logger
+from core.database import DatabaseManager
+
+
+class ExtensionIndex:
+    """
+    Precompiled extension -> folder lookup built once from ``file_types``.
+
+    Lookups are dictionary hits instead of a scan over all categories.
+    Multi-part suffixes such as ``.tar.gz`` are supported by trying the
+    longest configured suffix first. If an extension is listed in several
+    folders, the folder that comes first in ``priority`` wins (folders not
+    listed there follow in alphabetical order); every such conflict is
+    recorded in ``conflicts`` and logged when the index is built.
+    """
+
+    def __init__(self, file_types: Dict[str, List[str]],
+                 priority: Optional[Sequence[str]] = None):
+        rank = {folder: i for i, folder in enumerate(priority or ())}
+        ordered = sorted(file_types, key=lambda folder: (rank.get(folder, len(rank)), folder))
+
+        self._folders: Dict[str, str] = {}
+        candidates: Dict[str, List[str]] = {}
+        for folder_name in ordered:
+            for extension in file_types[folder_name]:
+                extension = self.normalize(extension)
+                if not extension:
+                    continue
+                candidates.setdefault(extension, []).append(folder_name)
+                self._folders.setdefault(extension, folder_name)
+
+        self.conflicts: List[Tuple[str, List[str], str]] = [
+            (extension, folders, folders[0])
+            for extension, folders in sorted(candidates.items()) if len(folders) > 1
+        ]
+        self._max_parts = max((ext.count('.') for ext in self._folders), default=0)
+
+        logger = get_logger(__name__)
+        for extension, folders, winner in self.conflicts:
+            logger.warning(f"Extension {extension} is listed in {', '.join(folders)}; using {winner}")
+
+    @staticmethod
+    def normalize(extension: str) -> str:
+        """Lower-cases an extension and ensures the leading dot."""
+        extension = extension.strip().lower()
+        if extension and not extension.startswith('.'):
+            extension = '.' + extension
+        return extension
+
+    def __len__(self) -> int:
+        return len(self._folders)
+
+    def folder_for_extension(self, file_extension: str) -> Optional[str]:
+        """Returns the folder name for an extension (e.g. ``.jpg``)."""
+        return self._folders.get(file_extension.lower())
+
+    def match(self, filename: str) -> Tuple[Optional[str], str]:
+        """
+        Finds the folder for a filename by longest matching suffix.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the file (not a path)
+
+        Returns
+        -------
+        Tuple[Optional[str], str]
+            (folder name or None, matched extension; the plain
+            ``os.path.splitext`` extension if nothing matched)
+        """
+        lower = filename.lower()
+        # Leading dots mark hidden files, not extensions (like os.path.splitext)
+        start = len(lower) - len(lower.lstrip('.'))
+        dots = []
+        end = len(lower)
+        while len(dots) < self._max_parts:
+            end = lower.rfind('.', start, end)
+            if end == -1:
+                break
+            dots.append(end)
+
+        for pos in reversed(dots):
+            folder_name = self._folders.get(lower[pos:])
+            if folder_name:
+                return folder_name, lower[pos:]
+        return None, lower[dots[0]:] if dots else ''
+
+
+# (mapping, its cheap revision key, rules_fingerprint, index) of the last call
+_index_cache: Tuple[Optional[Dict[str, List[str]]], Optional[Tuple[int, int, int]],
+                    Optional[str], Optional[ExtensionIndex]] = (None, None, None, None)
+
+
+def get_extension_index(file_types: Dict[str, List[str]]) -> ExtensionIndex:
+    """
+    Returns the ExtensionIndex for a ``file_types`` mapping.
+
+    The index of the most recently used rules is cached. A call with the
+    same mapping object is a cheap check of ``DatabaseManager.revision``
+    (rules changed in the database) and of the number of folders and
+    extensions (mapping edited in place); only if one of them changed, or
+    for another mapping object, is the ``rules_fingerprint`` computed, and
+    the index is rebuilt only if the fingerprint differs.
+    """
+    global _index_cache
+    revision = (DatabaseManager.revision, len(file_types), sum(map(len, file_types.values())))
+    cached_types, cached_revision, cached_fingerprint, cached_index = _index_cache
+    if cached_types is file_types and cached_revision == revision:
+        return cached_index
+
+    from .file_types import CATEGORY_PRIORITY, rules_fingerprint
+    fingerprint = rules_fingerprint(file_types)
+    index = cached_index if fingerprint == cached_fingerprint else ExtensionIndex(file_types, CATEGORY_PRIORITY)
+    _index_cache = (file_types, revision, fingerprint, index)
+    return index
+
 
 def get_destination_folder(file_extension: str, organized_folder: str, file_types: Dict[str, List[str]]) -> Optional[str]:
     """
@@ -19,7 +136,7 @@ def get_destination_folder(file_extension: str, organized_folder: str, file_type
     Optional[str]
         Path to destination folder or None if no match found
     """
-    for folder_name, extensions in file_types.items():
-        if file_extension.lower() in extensions:
-            return os.path.join(organized_folder, folder_name)
+    folder_name = get_extension_index(file_types).folder_for_extension(file_extension)
+    if folder_name:
+        return os.path.join(organized_folder, folder_name)
     return None
\ No newline at end of file
@@ -0,0 +1,215 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .date_utils import get_file_date
+from .filename_utils import FilenameProcessor
+from .path_utils import ExtensionIndex, get_extension_index
+from .scanner import ScanEntry, scan_directory
+from core.config import OrganizerConfig
+
+
+class MoveKind:
+    """Kinds of planned moves."""
+    FILE = 'file'
+    FOLDER = 'folder'
+
+
+class PlannedMove(NamedTuple):
+    """A single move decided by the planner."""
+    source: str
+    destination: str
+    kind: str
+    size: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class MovePlan:
+    """
+    Immutable result of the planning phase.
+
+    The plan only describes what should happen; nothing is touched on disk
+    until it is handed to ``utils.executor.execute_plan``.
+    """
+
+    source_folder: str
+    moves: Tuple[PlannedMove, ...] = ()
+    unmatched: Tuple[ScanEntry, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __iter__(self):
+        return iter(self.moves)
+
+    @property
+    def files(self) -> Tuple[PlannedMove, ...]:
+        """Planned file moves."""
+        return tuple(m for m in self.moves if m.kind == MoveKind.FILE)
+
+    @property
+    def folders(self) -> Tuple[PlannedMove, ...]:
+        """Planned folder moves."""
+        return tuple(m for m in self.moves if m.kind == MoveKind.FOLDER)
+
+    @property
+    def total_bytes(self) -> int:
+        """Sum of the sizes of all planned file moves."""
+        return sum(m.size for m in self.moves)
+
+    def to_dict(self) -> Dict:
+        """Returns the plan as a JSON-serializable dictionary."""
+        return {
+            'source_folder': self.source_folder,
+            'summary': {
+                'files': len(self.files),
+                'folders': len(self.folders),
+                'bytes': self.total_bytes,
+                'unmatched': len(self.unmatched),
+            },
+            'moves': [m._asdict() for m in self.moves],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Returns the plan as a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def write_json(self, path: str) -> None:
+        """Writes the plan as JSON to ``path``."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+
+def should_skip_item(item_name: str, config: OrganizerConfig) -> bool:
+    """
+    Determines if an item should be skipped during processing.
+
+    Parameters
+    ----------
+    item_name : str
+        Name of the file or folder to check
+    config : OrganizerConfig
+        Configuration object containing paths
+
+    Returns
+    -------
+    bool
+        True if item should be skipped, False otherwise
+    """
+    # Skip the organized and unorganized folders
+    organized_base = os.path.basename(config.organized_folder)
+    unorganized_base = os.path.basename(config.unorganized_folder)
+
+    return item_name in [organized_base, unorganized_base]
+
+
+def plan_file(entry: ScanEntry, config: OrganizerConfig,
+              index: Optional[ExtensionIndex] = None) -> Optional[PlannedMove]:
+    """
+    Plans the move of a single file.
+
+    Parameters
+    ----------
+    entry : ScanEntry
+        Scanned file
+    config : OrganizerConfig
+        Configuration object
+    index : Optional[ExtensionIndex]
+        Prebuilt extension index for ``config.file_types``
+
+    Returns
+    -------
+    Optional[PlannedMove]
+        The planned move or None if no category matches the extension
+    """
+    if index is None:
+        index = get_extension_index(config.file_types)
+    folder_name, file_extension = index.match(entry.name)
+    if not folder_name:
+        return None
+    destination_folder = os.path.join(config.organized_folder, folder_name)
+
+    # Keep original name if date is valid and force_date is False
+    has_valid_date, _ = FilenameProcessor.parse_date_prefix(entry.name)
+    if has_valid_date and not config.force_date:
+        new_filename = entry.name
+        reason = f"extension {file_extension}"
+    else:
+        file_date = get_file_date(entry, config.use_creation_date)
+        new_filename = FilenameProcessor.create_dated_filename(entry.name, file_date,
+                                                               config.naming_template)
+        reason = f"extension {file_extension}, date prefix added"
+
+    return PlannedMove(entry.path, os.path.join(destination_folder, new_filename),
+                       MoveKind.FILE, entry.size, reason)
+
+
+def plan_folder(entry: ScanEntry, config: OrganizerConfig) -> PlannedMove:
+    """
+    Plans the move of a single folder to the unorganized folder.
+
+    Parameters
+    ----------
+    entry : ScanEntry
+        Scanned folder
+    config : OrganizerConfig
+        Configuration object
+
+    Returns
+    -------
+    PlannedMove
+        The planned move
+    """
+    if config.date_folders:
+        folder_date = get_file_date(entry, config.use_creation_date)
+        new_foldername = FilenameProcessor.create_dated_filename(entry.name, folder_date,
+                                                                 config.naming_template)
+        reason = "folder, date prefix added"
+    else:
+        new_foldername = entry.name
+        reason = "folder"
+
+    return PlannedMove(entry.path, os.path.join(config.unorganized_folder, new_foldername),
+                       MoveKind.FOLDER, 0, reason)
+
+
+def build_plan(config: OrganizerConfig,
+               entries: Optional[Iterable[ScanEntry]] = None) -> MovePlan:
+    """
+    Builds the move plan for the source folder.
+
+    Parameters
+    ----------
+    config : OrganizerConfig
+        Configuration object
+    entries : Optional[Iterable[ScanEntry]]
+        Pre-scanned entries; the source folder is scanned if omitted
+
+    Returns
+    -------
+    MovePlan
+        Immutable plan of all moves
+    """
+    if entries is None:
+        entries = scan_directory(config.source_folder)
+
+    index = get_extension_index(config.file_types)
+    skip_names = {os.path.basename(config.organized_folder),
+                  os.path.basename(config.unorganized_folder)}
+    moves: List[PlannedMove] = []
+    unmatched: List[ScanEntry] = []
+
+    for entry in entries:
+        if entry.name in skip_names:
+            continue
+        if entry.is_file:
+            move = plan_file(entry, config, index)
+            if move is None:
+                unmatched.append(entry)
+                continue
+            moves.append(move)
+        elif entry.is_dir:
+            moves.append(plan_folder(entry, config))
+
+    return MovePlan(config.source_folder, tuple(moves), tuple(unmatched))
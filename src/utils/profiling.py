@@ -0,0 +1,201 @@
+import cProfile
+import io
+import os
+import pstats
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from . import transfer
+from .logger import LOG_DIR
+
+# Number of functions and allocation sites in the text summary
+PROFILE_TOP = 30
+
+# Before 3.12 cProfile only sees the thread that enabled it; since 3.12 it
+# uses sys.monitoring, covers all threads and only one profiler may be active
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+# Counted filesystem calls: kind -> (module, attribute) pairs that are wrapped
+FS_CALLS = {
+    'stat': [(os, 'stat'), (os, 'lstat')],
+    'scandir': [(os, 'scandir')],
+    'mkdir': [(os, 'mkdir')],
+    'rename': [(os, 'rename'), (os, 'replace')],
+    'copy': [(transfer, 'copy_file_data'), (shutil, 'copyfile')],
+    'remove': [(os, 'remove'), (os, 'unlink'), (os, 'rmdir')],
+}
+
+
+class FsCallCounter:
+    """
+    Counts filesystem calls by kind while active (context manager).
+
+    The functions listed in ``FS_CALLS`` are replaced by counting wrappers
+    and restored on exit, so calls from every thread (including the move
+    workers) are counted. Calls to ``os.path.exists``/``isdir`` count as
+    ``stat``; ``DirEntry.stat()`` results of a scan are not counted.
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._originals: List[Tuple[object, str, Callable]] = []
+
+    def _wrap(self, kind: str, func: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            with self._lock:
+                self.counts[kind] += 1
+            return func(*args, **kwargs)
+        counted.__wrapped__ = func
+        return counted
+
+    def __enter__(self) -> "FsCallCounter":
+        for kind, targets in FS_CALLS.items():
+            for module, name in targets:
+                original = getattr(module, name)
+                self._originals.append((module, name, original))
+                setattr(module, name, self._wrap(kind, original))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        while self._originals:
+            module, name, original = self._originals.pop()
+            setattr(module, name, original)
+
+
+class RunProfiler:
+    """
+    Profiles a run with cProfile, tracemalloc and ``FsCallCounter``.
+
+    Before Python 3.12 cProfile only sees the thread that enabled it, so
+    every thread started while the profiler is active (the move workers of
+    ``execute_plan``) gets its own profile; ``write`` merges them into one
+    ``.pstats`` file. From 3.12 on the main profile already covers all
+    threads and a second one cannot be enabled, so only that one is used.
+    tracemalloc slows allocations down considerably, so profiled runs are
+    for diagnosis, not for timing comparisons.
+
+    Example
+    -------
+    >>> with RunProfiler() as profiler:
+    ...     report = run_directory(config)
+    >>> pstats_path, summary_path = profiler.write()
+    """
+
+    def __init__(self, top: int = PROFILE_TOP, output_dir: Optional[str] = None):
+        self.top = top
+        self.output_dir = output_dir or LOG_DIR
+        self.elapsed = 0.0
+        self.peak_memory = 0
+        self.fs_calls = FsCallCounter()
+        self._profile = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._started_tracemalloc = False
+        self._before: Optional[tracemalloc.Snapshot] = None
+        self._after: Optional[tracemalloc.Snapshot] = None
+        self._start = 0.0
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        # Installed via threading.setprofile: runs once at the start of each new thread
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return  # Another profiler is active; never let it stop the thread
+        self._thread_profiles.append(profile)
+
+    def __enter__(self) -> "RunProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._before = tracemalloc.take_snapshot()
+        self.fs_calls.__enter__()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self._profile_thread)
+        self._start = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self._start
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)
+        self.fs_calls.__exit__(*exc)
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        self._after = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def stats(self, stream: Optional[io.TextIOBase] = None) -> pstats.Stats:
+        """Returns the merged statistics of all profiled threads."""
+        stats = pstats.Stats(self._profile, stream=stream)
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        return stats
+
+    def summary(self) -> str:
+        """Returns the top-N text summary (timings, fs calls, memory, hot spots)."""
+        out = io.StringIO()
+        threads = f"{1 + len(self._thread_profiles)} threads" if PER_THREAD_PROFILES else "all threads"
+        out.write(f"Elapsed: {self.elapsed:.3f}s ({threads} profiled)\n")
+        out.write("\nFilesystem calls:\n")
+        for kind in FS_CALLS:
+            out.write(f"  {kind:<8} {self.fs_calls.counts[kind]:>10}\n")
+
+        out.write(f"\nPeak traced memory: {self.peak_memory / 1e6:.1f} MB\n")
+        if self._before is not None and self._after is not None:
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                       tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                       tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")]
+            diff = self._after.filter_traces(filters).compare_to(
+                self._before.filter_traces(filters), 'lineno')
+            out.write(f"\nTop {self.top} allocation sites (growth during the run):\n")
+            for stat in diff[:self.top]:
+                out.write(f"  {stat}\n")
+
+        for sort in ('cumulative', 'tottime'):
+            out.write(f"\nTop {self.top} functions by {sort} time:\n")
+            self.stats(out).sort_stats(sort).print_stats(self.top)
+        return out.getvalue()
+
+    def write(self, name: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Writes the ``.pstats`` file and the text summary to ``output_dir``.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            File name without extension; defaults to a timestamped name
+
+        Returns
+        -------
+        Tuple[str, str]
+            Paths of the ``.pstats`` file and of the summary
+        """
+        if name is None:
+            name = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        os.makedirs(self.output_dir, exist_ok=True)
+        pstats_path = os.path.join(self.output_dir, f"{name}.pstats")
+        summary_path = os.path.join(self.output_dir, f"{name}.txt")
+        self.stats().dump_stats(pstats_path)
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+        return pstats_path, summary_path
+
+    def to_dict(self, paths: Tuple[str, str]) -> Dict:
+        """Short result for the run report."""
+        return {
+            'pstats': paths[0],
+            'summary': paths[1],
+            'elapsed': round(self.elapsed, 6),
+            'peak_memory': self.peak_memory,
+            'fs_calls': {kind: self.fs_calls.counts[kind] for kind in FS_CALLS},
+        }
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+
+class CancellationToken:
+    """
+    Cooperative cancel/pause switch for a run.
+
+    The executor calls ``checkpoint`` before every move, so a run stops or
+    pauses between items; an item that is already being moved (e.g. a large
+    cross-device copy) is always finished first.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+
+    def cancel(self) -> None:
+        """Stops the run at the next checkpoint (also ends a pause)."""
+        self._cancelled.set()
+        self._resumed.set()
+
+    def pause(self) -> None:
+        """Blocks the run at the next checkpoint until ``resume`` or ``cancel``."""
+        if not self._cancelled.is_set():
+            self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    def checkpoint(self) -> bool:
+        """Waits while paused; returns False once the run is cancelled."""
+        self._resumed.wait()
+        return not self._cancelled.is_set()
+
+
+class RunProgress(NamedTuple):
+    """Snapshot of a running execution."""
+    files_moved: int
+    folders_moved: int
+    bytes_moved: int
+    errors: int
+    items_done: int
+    items_total: int
+    bytes_total: int
+    current: str
+
+
+RunProgressCallback = Callable[[RunProgress], None]
+
+
+class ProgressTracker:
+    """
+    Collects per-item results from all worker threads and reports them
+    through ``callback`` at most once per ``interval`` seconds.
+
+    Moves finish far faster than a UI can redraw, so intermediate states are
+    coalesced; ``finish`` always reports the final state.
+    """
+
+    def __init__(self, callback: RunProgressCallback, items_total: int, bytes_total: int,
+                 interval: float = 0.05):
+        self.callback = callback
+        self.interval = interval
+        self.items_total = items_total
+        self.bytes_total = bytes_total
+        self._lock = threading.Lock()
+        self._files = self._folders = self._bytes = self._errors = 0
+        self._last_emit = 0.0
+
+    def update(self, current: str, is_file: bool, size: int, moved: bool) -> None:
+        """Records one finished item."""
+        with self._lock:
+            if not moved:
+                self._errors += 1
+            elif is_file:
+                self._files += 1
+                self._bytes += size
+            else:
+                self._folders += 1
+
+            now = time.monotonic()
+            if now - self._last_emit < self.interval:
+                return
+            self._last_emit = now
+            progress = self._snapshot(current)
+        self.callback(progress)
+
+    def finish(self) -> None:
+        """Reports the final state."""
+        with self._lock:
+            progress = self._snapshot('')
+        self.callback(progress)
+
+    def _snapshot(self, current: str) -> RunProgress:
+        done = self._files + self._folders + self._errors
+        return RunProgress(self._files, self._folders, self._bytes, self._errors,
+                           done, self.items_total, self.bytes_total, current)
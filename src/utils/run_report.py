@@ -0,0 +1,131 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from .executor import ExecutionStats
+
+# Default folder for run reports (next to the log file)
+REPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                          "logs", "reports")
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+class PhaseTimer:
+    """Measures consecutive phases of a run with ``perf_counter``."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """Ends ``phase`` (time since the previous lap)."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+
+
+@dataclass
+class RunReport:
+    """
+    Structured result of one run, returned by ``organize_files_by_type``
+    and written as JSON for capacity planning and regression tracking.
+
+    Times are in seconds, latencies in milliseconds.
+    """
+
+    source_folder: str
+    started_at: str
+    phases: Dict[str, float] = field(default_factory=dict)
+    files_moved: int = 0
+    folders_moved: int = 0
+    bytes_moved: int = 0
+    files_per_second: float = 0.0
+    bytes_per_second: float = 0.0
+    categories: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    skipped: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    collisions: int = 0
+    cancelled: bool = False
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    profile: Dict = field(default_factory=dict)  # Output of a profiled run (see utils.profiling)
+    run_id: Optional[str] = None  # Journal run of the moves (see utils.journal)
+    recovered: List[Dict] = field(default_factory=list)  # Interrupted runs recovered before this one
+    resumed: bool = False  # Continued run_id from its checkpoint instead of scanning
+
+    @property
+    def counts(self) -> Tuple[int, int]:
+        """(files_moved, folders_moved) as expected by ``log_results``."""
+        return self.files_moved, self.folders_moved
+
+    @classmethod
+    def from_run(cls, source_folder: str, started_at: datetime, phases: Dict[str, float],
+                 stats: ExecutionStats, skipped: Dict[str, int]) -> "RunReport":
+        """Builds the report from the phase timings and execution statistics."""
+        move_time = phases.get('move', 0.0)
+        latencies: List[float] = sorted(stats.latencies)
+        return cls(
+            source_folder=source_folder,
+            started_at=started_at.isoformat(timespec='seconds'),
+            phases={name: round(seconds, 6) for name, seconds in phases.items()},
+            files_moved=stats.files_moved,
+            folders_moved=stats.folders_moved,
+            bytes_moved=stats.bytes_moved,
+            files_per_second=round(stats.files_moved / move_time, 1) if move_time > 0 else 0.0,
+            bytes_per_second=round(stats.bytes_moved / move_time, 1) if move_time > 0 else 0.0,
+            categories={name: {'files': files, 'bytes': size}
+                        for name, (files, size) in sorted(stats.categories.items())},
+            skipped=skipped,
+            errors=stats.errors,
+            collisions=stats.collisions,
+            cancelled=stats.cancelled,
+            run_id=stats.run_id,
+            latency_ms={
+                'p50': round(percentile(latencies, 50) * 1000, 3),
+                'p95': round(percentile(latencies, 95) * 1000, 3),
+                'p99': round(percentile(latencies, 99) * 1000, 3),
+                'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+        )
+
+    def to_dict(self) -> Dict:
+        """Returns the report as a JSON-serializable dictionary."""
+        return asdict(self)
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Returns the report as a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def write_json(self, path: Optional[str] = None) -> str:
+        """
+        Writes the report as JSON.
+
+        Parameters
+        ----------
+        path : Optional[str]
+            Target file; defaults to a timestamped file in ``REPORT_DIR``
+
+        Returns
+        -------
+        str
+            Path of the written file
+        """
+        if path is None:
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+            path = os.path.join(REPORT_DIR, f"run-{stamp}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+        return path
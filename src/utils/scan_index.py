@@ -0,0 +1,64 @@
+from typing import Iterable, Iterator, Set, Tuple
+from .file_types import rules_fingerprint
+from .path_utils import ExtensionIndex, get_extension_index
+from .planner import MovePlan
+from .scanner import ScanEntry
+from core.config import OrganizerConfig
+from core.database import DatabaseManager
+
+ScanKey = Tuple[int, int, int, int]
+
+
+class ScanIndex:
+    """
+    Incremental scan index backed by the ``scan_index`` table.
+
+    Remembers the entries a run left in the source folder because no rule
+    matched them, keyed by (dev, inode, size, mtime_ns). The next run skips
+    those entries with a set lookup as long as they are unchanged. The key
+    does not cover the name, and a rename keeps all of its values, so a
+    known entry is only skipped if its current name still matches no rule
+    (``report`` renamed to ``report.pdf`` is planned). The index belongs to
+    one ``file_types`` revision and is dropped when the rules change.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, rules_hash: str, index: ExtensionIndex):
+        self.db_manager = db_manager
+        self.rules_hash = rules_hash
+        self.index = index
+        self._known: Set[ScanKey] = db_manager.get_scan_index(rules_hash)
+        self._still_unmatched: Set[ScanKey] = set()
+        self.skipped = 0
+
+    @classmethod
+    def open(cls, config: OrganizerConfig) -> "ScanIndex":
+        """Loads the index for the rules of ``config``."""
+        db_manager = DatabaseManager(config.db_path)
+        db_manager.initialize_database()
+        return cls(db_manager, rules_fingerprint(config.file_types),
+                   get_extension_index(config.file_types))
+
+    @staticmethod
+    def key(entry: ScanEntry) -> ScanKey:
+        return entry.dev, entry.ino, entry.size, entry.mtime_ns
+
+    def filter(self, entries: Iterable[ScanEntry]) -> Iterator[ScanEntry]:
+        """Yields only entries that are new or changed since the last run."""
+        known = self._known
+        match = self.index.match
+        for entry in entries:
+            # Without an inode number (e.g. some network file systems) the
+            # key is not unique enough to skip safely
+            if entry.is_file and entry.ino:
+                key = (entry.dev, entry.ino, entry.size, entry.mtime_ns)
+                if key in known and not match(entry.name)[0]:
+                    self._still_unmatched.add(key)
+                    self.skipped += 1
+                    continue
+            yield entry
+
+    def save(self, plan: MovePlan) -> None:
+        """Stores the skipped and newly unmatched entries of this run."""
+        keys = set(self._still_unmatched)
+        keys.update(self.key(entry) for entry in plan.unmatched if entry.ino)
+        self.db_manager.replace_scan_index(self.rules_hash, keys)
@@ -0,0 +1,149 @@
+import os
+import time
+from stat import S_ISDIR, S_ISREG
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+
+class ScanEntry(NamedTuple):
+    """
+    A directory entry with the stat data needed by the organizer.
+
+    All values are taken once from ``os.scandir`` so that later steps
+    (filtering, date prefixes, destination lookup) never stat the entry again.
+    A NamedTuple keeps construction cheap for scans of 100k+ entries.
+    """
+
+    name: str
+    path: str
+    is_file: bool
+    is_dir: bool
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+    dev: int = 0
+    ino: int = 0
+
+    @property
+    def mtime(self) -> float:
+        """Modification time in seconds."""
+        return self.mtime_ns / 1e9
+
+    @property
+    def ctime(self) -> float:
+        """Creation (Windows) or metadata change (POSIX) time in seconds."""
+        return self.ctime_ns / 1e9
+
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry, follow_symlinks: bool = True) -> "ScanEntry":
+        """
+        Creates a ScanEntry from an ``os.DirEntry``.
+
+        ``DirEntry.stat`` is cached by the entry itself and on Windows it is
+        filled by the directory listing, so this costs at most one stat call.
+        Symlinks are followed by default, matching
+        ``os.path.isfile``/``os.path.isdir``; with ``follow_symlinks=False``
+        a link is neither a file nor a folder.
+        """
+        st = entry.stat(follow_symlinks=follow_symlinks)
+        mode = st.st_mode
+        return cls(entry.name, entry.path, S_ISREG(mode), S_ISDIR(mode),
+                   st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_dev, st.st_ino)
+
+    @classmethod
+    def from_path(cls, path: str) -> "ScanEntry":
+        """Creates a ScanEntry for a single path with one stat call."""
+        st = os.stat(path)
+        mode = st.st_mode
+        return cls(os.path.basename(path), path, S_ISREG(mode), S_ISDIR(mode),
+                   st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_dev, st.st_ino)
+
+
+def scan_directory(folder: str) -> Iterator[ScanEntry]:
+    """
+    Yields the entries of a folder (non-recursive) with their stat data.
+
+    Parameters
+    ----------
+    folder : str
+        Folder to scan
+
+    Returns
+    -------
+    Iterator[ScanEntry]
+        One entry per file or folder. Entries that cannot be stat'ed
+        (vanished temp files, broken symlinks) are skipped.
+    """
+    with os.scandir(folder) as it:
+        for entry in it:
+            try:
+                scan_entry = ScanEntry.from_dir_entry(entry)
+            except OSError:
+                continue
+            yield scan_entry
+
+
+def scan_tree(folder: str) -> Iterator[ScanEntry]:
+    """
+    Yields the files below a folder (recursive) with their stat data.
+
+    Symlinks are skipped, both to files and to folders: the walk never
+    leaves ``folder``, so callers that replace or move the files found
+    (deduplication) cannot touch anything outside of it. Folders that
+    cannot be listed are skipped.
+    """
+    pending = [folder]
+    while pending:
+        current = pending.pop()
+        entries = []
+        try:
+            with os.scandir(current) as it:
+                for dir_entry in it:
+                    try:
+                        entries.append(ScanEntry.from_dir_entry(dir_entry, follow_symlinks=False))
+                    except OSError:
+                        continue  # Vanished meanwhile
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir:
+                pending.append(entry.path)
+            elif entry.is_file:
+                yield entry
+
+
+def split_stable(entries: Iterable[ScanEntry], interval: float) -> Tuple[List[ScanEntry], List[ScanEntry]]:
+    """
+    Separates entries that are still being written from settled ones.
+
+    Waits ``interval`` seconds once for the whole batch, then stats every
+    entry again. Entries whose size or mtime changed are still in flight
+    (downloads, copies); entries that vanished are dropped.
+
+    Parameters
+    ----------
+    entries : Iterable[ScanEntry]
+        Freshly scanned entries
+    interval : float
+        Stability window in seconds; 0 disables the check
+
+    Returns
+    -------
+    Tuple[List[ScanEntry], List[ScanEntry]]
+        (stable entries, entries still changing)
+    """
+    entries = list(entries)
+    if interval <= 0 or not entries:
+        return entries, []
+
+    time.sleep(interval)
+    stable, changing = [], []
+    for entry in entries:
+        try:
+            st = os.stat(entry.path)
+        except OSError:
+            continue
+        if st.st_size == entry.size and st.st_mtime_ns == entry.mtime_ns:
+            stable.append(entry)
+        else:
+            changing.append(entry)
+    return stable, changing
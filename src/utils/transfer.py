@@ -0,0 +1,327 @@
+import os
+import sys
+import errno
+import shutil
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+from .directory_cache import DirectoryCache
+
+# Bytes per copy_file_range/sendfile call; large chunks keep syscall count low
+CHUNK_SIZE = 64 * 1024 * 1024
+# Buffer size for the userspace fallback and for checksums
+BUFFER_SIZE = 1024 * 1024
+# Suffix of the temporary file while a transfer is in flight
+TEMP_SUFFIX = '.fo-partial'
+
+# Callback (path, bytes_done, bytes_total)
+ProgressCallback = Callable[[str, int, int], None]
+
+# errno values that mean "this zero-copy method is not available here"
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                    errno.ENOTSUP, errno.ENOTSOCK, errno.EPERM}
+
+# renameat2(2) flag and "relative to the working directory" fd (Linux)
+RENAME_NOREPLACE = 1
+_AT_FDCWD = -100
+# Errors of os.link that mean "no hard links here", not "cannot move"
+_NO_LINK_ERRNOS = {errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EMLINK}
+
+
+def _load_renameat2() -> Optional[Callable[..., int]]:
+    """Returns libc's renameat2 (Linux, glibc 2.28+), or None if missing."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        func = libc.renameat2
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    func.restype = ctypes.c_int
+    return func
+
+
+_renameat2 = _load_renameat2()
+
+
+def rename_noreplace(source_path: str, destination_path: str) -> None:
+    """
+    Renames a file or folder without ever replacing an existing destination.
+
+    Uses ``renameat2(RENAME_NOREPLACE)`` where the kernel and file system
+    support it. Otherwise files and symlinks are hard-linked to the new name
+    and unlinked from the old one (``link`` fails on an existing name);
+    folders and file systems without hard links fall back to a check before
+    ``os.rename``, which leaves a small race window.
+
+    Raises
+    ------
+    FileExistsError
+        If ``destination_path`` already exists
+    OSError
+        For all other errors of the rename (e.g. EXDEV, ENOENT)
+    """
+    if _renameat2 is not None:
+        if _renameat2(_AT_FDCWD, os.fsencode(source_path), _AT_FDCWD,
+                      os.fsencode(destination_path), RENAME_NOREPLACE) == 0:
+            return
+        err = ctypes.get_errno()
+        if err not in (errno.ENOSYS, errno.EINVAL):
+            raise OSError(err, os.strerror(err), source_path, None, destination_path)
+
+    if os.path.islink(source_path) or not os.path.isdir(source_path):
+        try:
+            os.link(source_path, destination_path, follow_symlinks=False)
+        except OSError as e:
+            if e.errno not in _NO_LINK_ERRNOS:
+                raise
+        else:
+            os.unlink(source_path)
+            return
+
+    if os.path.lexists(destination_path):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination_path)
+    os.rename(source_path, destination_path)
+
+
+def _copy_range(src_fd: int, dst_fd: int, position: List[int], total: int,
+                path: str, progress: Optional[ProgressCallback]) -> None:
+    """Copies with os.copy_file_range (in-kernel, may reflink)."""
+    while position[0] < total:
+        offset = position[0]
+        sent = os.copy_file_range(src_fd, dst_fd, min(CHUNK_SIZE, total - offset), offset, offset)
+        if sent == 0:
+            break
+        position[0] = offset + sent
+        if progress:
+            progress(path, position[0], total)
+
+
+def _copy_sendfile(src_fd: int, dst_fd: int, position: List[int], total: int,
+                   path: str, progress: Optional[ProgressCallback]) -> None:
+    """Copies with os.sendfile (in-kernel)."""
+    os.lseek(dst_fd, position[0], os.SEEK_SET)
+    while position[0] < total:
+        offset = position[0]
+        sent = os.sendfile(dst_fd, src_fd, offset, min(CHUNK_SIZE, total - offset))
+        if sent == 0:
+            break
+        position[0] = offset + sent
+        if progress:
+            progress(path, position[0], total)
+
+
+def _copy_userspace(src_fd: int, dst_fd: int, position: List[int], total: int,
+                    path: str, progress: Optional[ProgressCallback]) -> None:
+    """Copies through a reused userspace buffer."""
+    os.lseek(src_fd, position[0], os.SEEK_SET)
+    os.lseek(dst_fd, position[0], os.SEEK_SET)
+    with open(src_fd, 'rb', buffering=0, closefd=False) as src, \
+            open(dst_fd, 'wb', buffering=0, closefd=False) as dst:
+        buffer = bytearray(BUFFER_SIZE)
+        view = memoryview(buffer)
+        reported = position[0]
+        while True:
+            read = src.readinto(buffer)
+            if not read:
+                break
+            dst.write(view[:read])
+            position[0] += read
+            if progress and (position[0] - reported >= CHUNK_SIZE or position[0] >= total):
+                progress(path, position[0], total)
+                reported = position[0]
+
+
+def copy_file_data(source_path: str, destination_path: str,
+                   progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Copies the content of a file using the fastest available method.
+
+    Tries ``os.copy_file_range`` first, then ``os.sendfile`` and finally a
+    plain buffered copy. A method that fails midway hands over at the
+    current offset, so no data is copied twice.
+
+    Parameters
+    ----------
+    source_path : str
+        File to copy
+    destination_path : str
+        Target file (created or truncated)
+    progress : Optional[ProgressCallback]
+        Called with (source_path, bytes_done, bytes_total) after each chunk
+
+    Returns
+    -------
+    int
+        Number of bytes copied
+    """
+    with open(source_path, 'rb') as src, open(destination_path, 'wb') as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        total = os.fstat(src_fd).st_size
+        position = [0]
+
+        methods = []
+        if hasattr(os, 'copy_file_range'):
+            methods.append(_copy_range)
+        if hasattr(os, 'sendfile'):
+            methods.append(_copy_sendfile)
+
+        for method in methods:
+            try:
+                method(src_fd, dst_fd, position, total, source_path, progress)
+                break
+            except OSError as e:
+                if e.errno not in _FALLBACK_ERRNOS:
+                    raise
+        # Finishes after a failed method and covers files that grew meanwhile
+        _copy_userspace(src_fd, dst_fd, position, total, source_path, progress)
+        os.ftruncate(dst_fd, position[0])
+        return position[0]
+
+
+def file_digest(path: str, algorithm: str = 'sha256') -> str:
+    """Computes a streaming checksum of a file."""
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def digests_match(first_path: str, second_path: str) -> bool:
+    """
+    Compares the checksums of two files.
+
+    Both files are hashed concurrently; hashlib releases the GIL while
+    hashing, so this takes about as long as hashing one file.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(file_digest, first_path)
+        second = pool.submit(file_digest, second_path)
+        return first.result() == second.result()
+
+
+def copy_file(source_path: str, destination_path: str, verify: bool = False,
+              progress: Optional[ProgressCallback] = None) -> str:
+    """
+    Copies a file with metadata through a temporary name.
+
+    The file only appears under ``destination_path`` once it is complete
+    (and verified if requested), so an interrupted copy never looks like a
+    finished one. The final rename never replaces an existing file (see
+    ``rename_noreplace``).
+
+    Raises
+    ------
+    FileExistsError
+        If ``destination_path`` exists (the copy is discarded)
+    OSError
+        If copying fails or the checksums do not match
+    """
+    temp_path = destination_path + TEMP_SUFFIX
+    try:
+        copy_file_data(source_path, temp_path, progress)
+        shutil.copystat(source_path, temp_path)
+        if verify and not digests_match(source_path, temp_path):
+            raise OSError(errno.EIO, f"Checksum mismatch after copying {source_path}")
+        rename_noreplace(temp_path, destination_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return destination_path
+
+
+def transfer_path(source_path: str, destination_path: str, logger: logging.Logger,
+                  verify: bool = False, progress: Optional[ProgressCallback] = None,
+                  directories: Optional[DirectoryCache] = None) -> bool:
+    """
+    Moves a file or folder across devices (copy, optionally verify, delete).
+
+    The source is only removed after the complete copy succeeded. An
+    existing destination is never replaced or removed: the transfer fails
+    with an error instead, and only a folder created by this call is
+    cleaned up after a failed copy.
+
+    Parameters
+    ----------
+    source_path : str
+        File or folder to move
+    destination_path : str
+        Target path (must not exist)
+    logger : logging.Logger
+        Logger instance to use
+    verify : bool
+        Compare checksums of source and copy before deleting the source
+    progress : Optional[ProgressCallback]
+        Per-file progress callback
+    directories : Optional[DirectoryCache]
+        Run-wide folder cache; if given, the destination folder was already
+        ensured by the caller and is not checked again
+
+    Returns
+    -------
+    bool
+        True if moved, False otherwise (errors are logged)
+    """
+    def copy_function(src: str, dst: str) -> str:
+        return copy_file(src, dst, verify, progress)
+
+    try:
+        if os.path.lexists(destination_path):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination_path)
+        if directories is None:
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+        if os.path.isdir(source_path) and not os.path.islink(source_path):
+            # Fails if the name was taken meanwhile; from here on the folder is ours
+            os.mkdir(destination_path)
+            try:
+                shutil.copytree(source_path, destination_path, symlinks=True,
+                                copy_function=copy_function, dirs_exist_ok=True)
+            except BaseException:
+                shutil.rmtree(destination_path, ignore_errors=True)
+                raise
+            shutil.rmtree(source_path)
+        elif os.path.islink(source_path):
+            os.symlink(os.readlink(source_path), destination_path)
+            os.unlink(source_path)
+        else:
+            copy_function(source_path, destination_path)
+            os.unlink(source_path)
+        return True
+    except Exception as e:
+        logger.error("Error moving file %s: %s", source_path, e)
+        return False
+
+
+def log_progress(logger: logging.Logger, step: int = 10) -> ProgressCallback:
+    """
+    Creates a progress callback that logs every ``step`` percent per file.
+
+    Small files that are copied in a single chunk are not logged.
+    """
+    last_reported = {}
+
+    def report(path: str, done: int, total: int) -> None:
+        if total <= CHUNK_SIZE:
+            return
+        percent = done * 100 // total
+        if percent >= last_reported.get(path, -step) + step or done >= total:
+            last_reported[path] = percent
+            logger.info("Copying %s: %d%% (%.0f/%.0f MB)",
+                        os.path.basename(path), percent, done / 1e6, total / 1e6)
+            if done >= total:
+                last_reported.pop(path, None)
+
+    return report
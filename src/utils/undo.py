@@ -0,0 +1,172 @@
+import os
+import time
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import partial
+from typing import Dict, Iterable, List, Optional
+from .executor import execute_plan, group_by_name
+from .file_utils import FileOrganizerError
+from .journal import MoveJournal, MoveState, RunState, config_for_run, find_interrupted_runs
+from .planner import MovePlan, PlannedMove
+from core.config import OrganizerConfig
+from core.database import DatabaseManager
+
+# Runs whose moves can be reversed
+UNDOABLE_STATES = (RunState.DONE, RunState.CANCELLED, RunState.RECOVERED)
+# Groups per worker; items go back to distinct paths, so groups can be small
+UNDO_GROUPS_PER_WORKER = 8
+
+
+class UndoError(FileOrganizerError):
+    """Raised when a run cannot be undone."""
+    pass
+
+
+@dataclass
+class UndoReport:
+    """Result of undoing a run."""
+    run_id: str
+    undo_run_id: Optional[str] = None  # The undo is journaled like any other run
+    files_restored: int = 0
+    folders_restored: int = 0
+    bytes_restored: int = 0
+    errors: int = 0
+    collisions: int = 0  # Original name was taken; restored with a counter suffix
+    dirs_removed: int = 0
+    cancelled: bool = False
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict:
+        """Returns the report as a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def list_runs(config: OrganizerConfig) -> List[Dict]:
+    """Returns the journaled runs (newest first) with their move counts per state."""
+    db_manager = DatabaseManager(config.db_path)
+    db_manager.initialize_database()
+    runs = db_manager.get_journal_runs()
+    for run in runs:
+        run['moves'] = db_manager.count_journal_moves(run['run_id'])
+    return runs
+
+
+def undo_run(config: OrganizerConfig, run_id: Optional[str] = None) -> UndoReport:
+    """
+    Moves the items of a journaled run back to where they came from.
+
+    Parameters
+    ----------
+    config : OrganizerConfig
+        Configuration object; ``workers``, ``cancel_token`` and
+        ``on_progress`` are used, folders are taken from the journal
+    run_id : Optional[str]
+        Run to undo (default: the most recent run that can be undone; if
+        that is a partial undo, the run it did not fully reverse is retried)
+
+    Returns
+    -------
+    UndoReport
+        Counters of the undo; failed items are logged and counted
+
+    Raises
+    ------
+    UndoError
+        If the run does not exist or is not finished or already undone
+    """
+    db_manager = DatabaseManager(config.db_path)
+    db_manager.initialize_database()
+    if run_id is None:
+        runs = db_manager.get_journal_runs(UNDOABLE_STATES)
+        if not runs:
+            raise UndoError("No run to undo")
+        run = runs[0]
+        # Retry a partial undo instead of reversing the undo itself
+        run = next((r for r in runs if run['undo_of'] and r['run_id'] == run['undo_of']), run)
+    else:
+        run = next((r for r in db_manager.get_journal_runs() if r['run_id'] == run_id), None)
+        if run is None:
+            raise UndoError(f"Unknown run: {run_id}")
+        if run['state'] not in UNDOABLE_STATES:
+            interrupted = any(r['run_id'] == run_id for r in find_interrupted_runs(db_manager))
+            raise UndoError(f"Run {run_id} cannot be undone (state: {run['state']}"
+                            f"{', recovered on the next run' if interrupted else ''})")
+    return reverse_run(db_manager, run, config, RunState.UNDONE)
+
+
+def reverse_run(db_manager: DatabaseManager, run: Dict, config: OrganizerConfig, state: str) -> UndoReport:
+    """
+    Reverses all completed moves of ``run`` and closes it with ``state``.
+
+    Every item goes back to its journaled source path, which restores the
+    original name (date prefixes added or replaced by the run are gone
+    again). The reverse moves form a plan of their own that runs through
+    ``execute_plan``: renames on the same device, copies otherwise, never
+    overwriting an existing item. The plan is grouped by name instead of by
+    folder (see ``group_by_name``), so the moves back into the one source
+    folder still run on all workers. Folders created by the run are removed
+    afterwards if they are empty.
+
+    The run is only closed with ``state`` if every move was reversed. After
+    errors or a cancel it keeps its state, and its restored moves are marked
+    reverted, so the next undo retries just the remaining ones.
+    """
+    started = time.perf_counter()
+    run_id = run['run_id']
+    moves = db_manager.get_journal_moves(run_id, [MoveState.DONE])
+    report = UndoReport(run_id)
+
+    if moves:
+        plan = MovePlan(run['source_folder'], tuple(
+            PlannedMove(move['final'] or move['destination'], move['source'], move['kind'], move['size'], 'undo')
+            for move in moves))
+        run_config = config_for_run(config, run)
+        run_config.cancel_token, run_config.on_progress = config.cancel_token, config.on_progress
+        journal = MoveJournal.start(run_config, plan, undo_of=run_id)
+        report.undo_run_id = journal.run_id
+        buckets = max(config.workers, 1) * UNDO_GROUPS_PER_WORKER
+        stats = execute_plan(plan, run_config, journal=journal, grouping=partial(group_by_name, buckets=buckets))
+
+        # The undo journal has the same order as ``moves``
+        restored = db_manager.get_journal_moves(journal.run_id, [MoveState.DONE])
+        db_manager.update_journal_moves(
+            run_id, ((MoveState.REVERTED, None, moves[row['seq']]['seq']) for row in restored))
+        report.files_restored, report.folders_restored = stats.counts
+        report.bytes_restored = stats.bytes_moved
+        report.errors, report.collisions, report.cancelled = stats.errors, stats.collisions, stats.cancelled
+
+    report.dirs_removed = remove_empty_dirs(db_manager.get_journal_dirs(run_id), config.logger)
+    if report.errors:
+        config.logger.error("Run %s partially undone: %d items could not be restored; undo it again to retry",
+                            run_id, report.errors)
+    elif not report.cancelled:
+        db_manager.finish_journal_run(run_id, state, run['finished_at'] or datetime.now().isoformat(timespec='milliseconds'))
+    report.elapsed = time.perf_counter() - started
+    config.logger.info("Run %s undone: %d files and %d folders restored, %d errors, %d folders removed (%.2fs)",
+                       run_id, report.files_restored, report.folders_restored, report.errors,
+                       report.dirs_removed, report.elapsed)
+    return report
+
+
+def remove_empty_dirs(folders: Iterable[str], logger: logging.Logger) -> int:
+    """
+    Removes the given folders if they are empty, deepest first.
+
+    Folders that still contain something (e.g. items added after the run)
+    or that are already gone are left alone.
+
+    Returns
+    -------
+    int
+        Number of folders removed
+    """
+    removed = 0
+    for folder in sorted(folders, key=lambda path: path.count(os.sep), reverse=True):
+        try:
+            os.rmdir(folder)
+        except OSError:
+            continue
+        removed += 1
+        logger.info("Removed empty folder: %s", folder)
+    return removed
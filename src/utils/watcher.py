@@ -0,0 +1,212 @@
+import os
+import sys
+import stat
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+from .file_utils import (FileOrganizerError, SourceFolderNotFoundError, log_results,
+                         process_directory, process_paths, recover)
+from .planner import should_skip_item
+from core.config import OrganizerConfig
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class WatchError(FileOrganizerError):
+    """Raised when watch mode cannot be started."""
+    pass
+
+
+class InotifyWatcher:
+    """Minimal inotify binding (ctypes) for a single, non-recursive folder."""
+
+    def __init__(self, folder: str):
+        if not sys.platform.startswith('linux'):
+            raise WatchError("Watch mode requires Linux (inotify)")
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise WatchError(f"inotify_init1 failed: {os.strerror(err)}")
+
+        self.wd = libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+        if self.wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise WatchError(f"Cannot watch {folder}: {os.strerror(err)}")
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> "InotifyWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def read_events(self, timeout: Optional[float]) -> List[Tuple[int, str]]:
+        """
+        Waits up to ``timeout`` seconds and returns the pending events.
+
+        Returns
+        -------
+        List[Tuple[int, str]]
+            (mask, name) per event; name is empty for events on the folder itself
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            events.append((mask, name))
+        return events
+
+
+def watch_directory(config: OrganizerConfig, debounce: float = 0.3, max_delay: float = 2.0,
+                    stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Organizes new items in the source folder as they arrive (Linux only).
+
+    Files are picked up once they are closed after writing or moved into the
+    folder; folders when they are created or moved in. Created files are
+    queued as well (hard links and symlinks never see a close_write): with
+    ``config.stability_interval`` the stability check holds back files that
+    are still written, without it only links are queued on creation and
+    other new files wait for close_write. Events are coalesced
+    until the folder has been quiet for ``debounce`` seconds (at most
+    ``max_delay`` after the first event) and each batch is planned and
+    executed as one run. Items that are still changing (see
+    ``config.stability_interval``) are carried over to the next batch. The
+    loop blocks in ``select`` while idle. A batch that fails is logged and
+    its items are retried after ``max_delay`` seconds; the loop keeps
+    running.
+
+    Parameters
+    ----------
+    config : OrganizerConfig
+        Configuration object
+    debounce : float
+        Quiet period that closes a batch, in seconds
+    max_delay : float
+        Upper bound for holding back a batch during continuous activity
+    stop_event : Optional[threading.Event]
+        Stops the loop when set (checked at least once per second)
+    """
+    if not os.path.isdir(config.source_folder):
+        raise SourceFolderNotFoundError(
+            f"Source folder not found: {config.source_folder}")
+
+    stop_event = stop_event or threading.Event()
+    config.logger.info(f"Watching {config.source_folder}")
+
+    with InotifyWatcher(config.source_folder) as watcher:
+        if config.journal:
+            recover(config)
+        # Items that arrived before the watch was set up
+        run_batch(config, process_directory, config)
+
+        pending: Set[str] = set()
+        batch_started = 0.0
+        while not stop_event.is_set():
+            timeout = debounce if pending else 1.0
+            events = watcher.read_events(timeout)
+
+            rescan = False
+            for mask, name in events:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    config.logger.error(f"Source folder {config.source_folder} was removed or moved")
+                    return
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                if not name or should_skip_item(name, config):
+                    continue
+                if mask & IN_CREATE and not mask & IN_ISDIR and not queue_created(name, config):
+                    continue  # Still written; wait for close_write
+                if not pending:
+                    batch_started = time.monotonic()
+                pending.add(name)
+
+            if rescan:
+                config.logger.info("Event queue overflow, rescanning source folder")
+                pending.clear()
+                run_batch(config, process_directory, config)
+                continue
+
+            quiet = not events
+            if pending and (quiet or time.monotonic() - batch_started >= max_delay):
+                paths = [os.path.join(config.source_folder, name) for name in sorted(pending)]
+                pending.clear()
+                deferred: List[str] = []
+                if not run_batch(config, process_paths, paths, config, deferred):
+                    # Retry the whole batch later instead of ending the watch
+                    pending.update(os.path.basename(path) for path in paths)
+                    batch_started = time.monotonic()
+                    stop_event.wait(max_delay)
+                    continue
+                # Items still being written are retried with the next batch
+                if deferred:
+                    pending.update(os.path.basename(path) for path in deferred)
+                    batch_started = time.monotonic()
+
+
+def queue_created(name: str, config: OrganizerConfig) -> bool:
+    """
+    Tells whether a file reported by IN_CREATE is queued right away.
+
+    With a stability interval the batch's stability check decides.
+    Otherwise only links are queued, since they never see a close_write:
+    symlinks and hard links to an existing file (link count above one).
+    """
+    if config.stability_interval > 0:
+        return True
+    try:
+        st = os.lstat(os.path.join(config.source_folder, name))
+    except OSError:
+        return False  # Already gone again
+    return stat.S_ISLNK(st.st_mode) or st.st_nlink > 1
+
+
+def run_batch(config: OrganizerConfig, run: Callable[..., Tuple[int, int]], *args) -> bool:
+    """Runs one batch and logs its results; errors are logged, False then."""
+    try:
+        log_results(config.logger, run(*args))
+        return True
+    except Exception as e:
+        config.logger.error(f"Error processing watch batch: {e}")
+        return False